@@ -1,37 +1,66 @@
 """Content API endpoints (lessons, conditions, versions)."""
 
-from fastapi import APIRouter, Depends
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.db.database import get_async_db
+from app.db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError
+from app.schemas.pagination import PageResponse
+from app.schemas.content import ConditionResponse, ContentVersionResponse, LessonCreate, LessonResponse
+from app.services.content_service import AsyncContentService
 
 router = APIRouter(prefix="/content", tags=["content"])
 
 
-@router.get("/lessons")
-async def list_lessons():
-    """List all lessons."""
-    pass
+@router.get("/lessons", response_model=PageResponse[LessonResponse])
+async def list_lessons(cursor: Optional[str] = None,
+                       limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), include_total: bool = False,
+                       db: AsyncSession = Depends(get_async_db)):
+    """List lessons, one keyset page at a time."""
+    try:
+        return await AsyncContentService.get_lessons(db, cursor=cursor, limit=limit, include_total=include_total)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/lessons/{lesson_id}")
-async def get_lesson(lesson_id: int):
+@router.post("/lessons", response_model=LessonResponse, status_code=201)
+async def create_lesson(lesson_data: LessonCreate, db: AsyncSession = Depends(get_async_db)):
+    """Create a new lesson."""
+    return await AsyncContentService.create_lesson(db, lesson_data)
+
+
+@router.get("/lessons/{lesson_id}", response_model=LessonResponse)
+async def get_lesson(lesson_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get lesson by ID."""
-    pass
+    lesson = await AsyncContentService.get_lesson(db, lesson_id)
+    if not lesson:
+        raise HTTPException(status_code=404, detail="Lesson not found")
+    return lesson
 
 
-@router.get("/conditions")
-async def list_conditions():
+@router.get("/conditions", response_model=List[ConditionResponse])
+async def list_conditions(db: AsyncSession = Depends(get_async_db)):
     """List all conditions."""
-    pass
+    return await AsyncContentService.get_conditions(db)
 
 
-@router.get("/conditions/{condition_id}")
-async def get_condition(condition_id: int):
+@router.get("/conditions/{condition_id}", response_model=ConditionResponse)
+async def get_condition(condition_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get condition by ID."""
-    pass
-
+    condition = await AsyncContentService.get_condition(db, condition_id)
+    if not condition:
+        raise HTTPException(status_code=404, detail="Condition not found")
+    return condition
 
-@router.get("/versions")
-async def list_versions():
-    """List all content versions."""
-    pass
 
+@router.get("/versions", response_model=PageResponse[ContentVersionResponse])
+async def list_versions(lesson_id: Optional[int] = None, cursor: Optional[str] = None,
+                        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), include_total: bool = False,
+                        db: AsyncSession = Depends(get_async_db)):
+    """List content versions, one keyset page at a time."""
+    try:
+        return await AsyncContentService.get_versions(
+            db, lesson_id=lesson_id, cursor=cursor, limit=limit, include_total=include_total
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
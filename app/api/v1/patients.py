@@ -1,37 +1,54 @@
 """Patient API endpoints."""
 
-from fastapi import APIRouter, Depends
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.db.database import get_async_db
+from app.db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError
+from app.schemas.pagination import PageResponse
+from app.schemas.patient import PatientCreate, PatientResponse, PatientUpdate
+from app.services.patient_service import AsyncPatientService
 
 router = APIRouter(prefix="/patients", tags=["patients"])
 
 
-@router.get("/")
-async def list_patients():
-    """List all patients."""
-    pass
+@router.get("/", response_model=PageResponse[PatientResponse])
+async def list_patients(cursor: Optional[str] = None,
+                        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), include_total: bool = False,
+                        db: AsyncSession = Depends(get_async_db)):
+    """List patients, one keyset page at a time."""
+    try:
+        return await AsyncPatientService.get_patients(db, cursor=cursor, limit=limit, include_total=include_total)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/{patient_id}")
-async def get_patient(patient_id: int):
+@router.get("/{patient_id}", response_model=PatientResponse)
+async def get_patient(patient_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get patient by ID."""
-    pass
+    patient = await AsyncPatientService.get_patient(db, patient_id)
+    if not patient:
+        raise HTTPException(status_code=404, detail="Patient not found")
+    return patient
 
 
-@router.post("/")
-async def create_patient():
+@router.post("/", response_model=PatientResponse, status_code=201)
+async def create_patient(patient_data: PatientCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new patient."""
-    pass
+    return await AsyncPatientService.create_patient(db, patient_data)
 
 
-@router.put("/{patient_id}")
-async def update_patient(patient_id: int):
+@router.put("/{patient_id}", response_model=PatientResponse)
+async def update_patient(patient_id: int, patient_data: PatientUpdate, db: AsyncSession = Depends(get_async_db)):
     """Update patient."""
-    pass
+    patient = await AsyncPatientService.update_patient(db, patient_id, patient_data)
+    if not patient:
+        raise HTTPException(status_code=404, detail="Patient not found")
+    return patient
 
 
-@router.delete("/{patient_id}")
-async def delete_patient(patient_id: int):
+@router.delete("/{patient_id}", status_code=204)
+async def delete_patient(patient_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete patient."""
-    pass
-
+    if not await AsyncPatientService.delete_patient(db, patient_id):
+        raise HTTPException(status_code=404, detail="Patient not found")
@@ -1,31 +1,44 @@
 """Conversation sessions API endpoints."""
 
-from fastapi import APIRouter, Depends
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from app.db.database import get_async_db
+from app.db.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError
+from app.schemas.pagination import PageResponse
+from app.schemas.session import SessionCreate, SessionResponse
+from app.services.session_service import AsyncSessionService
 
 router = APIRouter(prefix="/sessions", tags=["sessions"])
 
 
-@router.get("/")
-async def list_sessions():
-    """List all conversation sessions."""
-    pass
+@router.get("/", response_model=PageResponse[SessionResponse])
+async def list_sessions(cursor: Optional[str] = None,
+                        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE), include_total: bool = False,
+                        db: AsyncSession = Depends(get_async_db)):
+    """List conversation sessions, one keyset page at a time."""
+    try:
+        return await AsyncSessionService.get_sessions(db, cursor=cursor, limit=limit, include_total=include_total)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/{session_id}")
-async def get_session(session_id: int):
+@router.get("/{session_id}", response_model=SessionResponse)
+async def get_session(session_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get session by ID."""
-    pass
+    session = await AsyncSessionService.get_session(db, session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return session
 
 
-@router.post("/")
-async def create_session():
+@router.post("/", response_model=SessionResponse, status_code=201)
+async def create_session(session_data: SessionCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new conversation session."""
-    pass
+    return await AsyncSessionService.create_session(db, session_data)
 
 
-@router.get("/patient/{patient_id}")
-async def get_patient_sessions(patient_id: int):
+@router.get("/patient/{patient_id}", response_model=List[SessionResponse])
+async def get_patient_sessions(patient_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get all sessions for a patient."""
-    pass
-
+    return await AsyncSessionService.get_patient_sessions(db, patient_id)
@@ -1,7 +1,7 @@
 """Environment configuration and settings."""
 
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, List, Optional
 
 
 class Settings(BaseSettings):
@@ -14,6 +14,12 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 10  # Per engine, so per worker process; sync and async engines each get one
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_RECYCLE: int = 1800  # Seconds; keep below the server/proxy idle timeout
+    DB_POOL_TIMEOUT: int = 30  # Seconds to wait for a free connection before failing
+    DB_POOL_PRE_PING: bool = False  # Extra round-trip per checkout; pool recycle usually suffices
+    DB_STATEMENT_TIMEOUT_MS: int = 30000  # PostgreSQL statement_timeout; 0 disables
     
     # Security
     SECRET_KEY: str
@@ -24,10 +30,64 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: Optional[str] = None
     TWILIO_ACCOUNT_SID: Optional[str] = None
     TWILIO_AUTH_TOKEN: Optional[str] = None
+    TWILIO_PHONE_NUMBER: Optional[str] = None
+    APP_URL: Optional[str] = None
     
     # External Services
     REDIS_URL: Optional[str] = None
     
+    # Conversation
+    CONVERSATION_HISTORY_WINDOW: int = 3  # Recent turns included in LLM prompts
+    CONVERSATION_SNAPSHOT_TTL_SECONDS: int = 7 * 86400  # Idle conversations are rebuilt from the DB after this
+    CONVERSATION_STORE_MAX_ENTRIES: int = 100000  # In-process store only; Redis relies on TTL
+    
+    # Media storage and TTS cache
+    MEDIA_STORAGE_DIR: str = "data/media"
+    TTS_CACHE_MAX_BYTES: int = 2 * 1024 ** 3
+    TTS_PREWARM_LANGUAGES: List[str] = ["en", "tw", "ga", "ewe"]  # Patient languages whose fixed prompts are pre-rendered
+    
+    # LLM response cache for lesson-delivery prompts
+    LLM_CACHE_TTL_SECONDS: int = 86400
+    LLM_CACHE_MAX_ENTRIES: int = 10000
+    
+    # AI response audit log writer
+    AI_LOG_QUEUE_SIZE: int = 10000
+    AI_LOG_BATCH_SIZE: int = 200
+    AI_LOG_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AI_LOG_DEAD_LETTER_PATH: str = "data/ai_log_dead_letter.jsonl"  # Batches that failed every write attempt
+    AI_LOG_DEAD_LETTER_RETRY_SECONDS: float = 60.0
+    
+    # Outbound dialing
+    DIALER_MAX_CONCURRENCY: int = 50
+    DIALER_BATCH_SIZE: int = 500
+    DIALER_CARRIER_RATE_LIMITS: Dict[str, float] = {  # Calls per second
+        "mtn": 20.0,
+        "vodafone": 10.0,
+        "airteltigo": 10.0,
+        "other": 5.0,
+    }
+    
+    # Retention
+    AUDIO_RETENTION_DAYS: int = 30  # Turn audio (recordings and per-turn TTS)
+    TRANSCRIPT_RETENTION_DAYS: int = 90  # ASR transcripts on conversation turns
+    RETENTION_CHUNK_SIZE: int = 5000  # Turns per UPDATE
+    RETENTION_DELETE_WORKERS: int = 8  # Parallel storage deletes
+    CONVERSATION_TURN_RETENTION_MONTHS: int = 24  # Whole monthly turn partitions older than this are retired
+    AI_RESPONSE_LOG_RETENTION_MONTHS: int = 12  # Whole monthly AI log partitions older than this are retired
+    PARTITION_DETACH_ONLY: bool = False  # Detach retired partitions (e.g. for archiving) instead of dropping them
+    PARTITION_MONTHS_AHEAD: int = 3  # Future monthly partitions kept created ahead of time
+    
+    # Safety lexicons
+    SAFETY_LEXICON_PATH: Optional[str] = None  # None uses the lexicons shipped in app/data
+    SAFETY_LEXICON_RELOAD_SECONDS: float = 30.0  # How often workers check the file for a new version
+    
+    # Hospital sync
+    HOSPITAL_SYNC_DIR: str = "data/hospital_sync"  # <dir>/<hospital code>/<filename>.csv
+    HOSPITAL_SYNC_WORKERS: int = 4
+    
+    # Content delivery
+    CONTENT_CATCHUP_MINUTES: int = 60  # Missed delivery minutes caught up after a skipped or late tick
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -0,0 +1,19 @@
+"""Optional Redis client."""
+
+from typing import Optional
+from app.core.config import settings
+
+_client = None
+
+
+def get_redis():
+    """Get a shared Redis client, or None when REDIS_URL is unset or redis is not installed."""
+    global _client
+    if _client is None and settings.REDIS_URL:
+        try:
+            import redis
+        except ImportError:
+            print("REDIS_URL is set but the redis package is not installed; using in-process storage")
+            return None
+        _client = redis.Redis.from_url(settings.REDIS_URL)
+    return _client
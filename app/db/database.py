@@ -1,21 +1,103 @@
 """SQLAlchemy engine and session management."""
 
+from typing import Any, Dict
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.pool_metrics import (
+    InstrumentedAsyncAdaptedQueuePool,
+    InstrumentedQueuePool,
+    PoolMetrics,
+    TrackedSession,
+    instrument_engine,
+    session_leaks,
+)
+
+# Driver used by the async engine for each sync backend
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto the matching asyncio driver."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if parsed.get_driver_name() in ("asyncpg", "aiosqlite") or backend not in ASYNC_DRIVERS:
+        return url
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def get_pool_options(url: str) -> dict:
+    """Pool sizing from settings (SQLite uses its own single-connection pools)."""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+
+def get_connect_args(url: str) -> dict:
+    """Driver connect arguments that apply the statement timeout on PostgreSQL."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "postgresql" or not settings.DB_STATEMENT_TIMEOUT_MS:
+        return {}
+    if parsed.get_driver_name() == "asyncpg":
+        return {"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}}
+    return {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+
+
+def _engine_options(url: str, poolclass) -> dict:
+    options = get_pool_options(url)
+    if options:
+        options["poolclass"] = poolclass
+    return {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "echo": settings.DEBUG,
+        "connect_args": get_connect_args(url),
+        **options,
+    }
+
 
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
-    echo=settings.DEBUG
+    **_engine_options(settings.DATABASE_URL, InstrumentedQueuePool)
+)
+
+ASYNC_DATABASE_URL = get_async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    **_engine_options(ASYNC_DATABASE_URL, InstrumentedAsyncAdaptedQueuePool)
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+pool_metrics = instrument_engine(engine, PoolMetrics())
+async_pool_metrics = instrument_engine(async_engine.sync_engine, PoolMetrics())
+
+TrackedSession.track_origin = settings.DEBUG
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=TrackedSession)
+
+# expire_on_commit=False: attributes can't be lazily refreshed after commit in async code
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
 
+def get_pool_status() -> Dict[str, Any]:
+    """Get pool usage for both engines plus the count of sessions leaked without close()."""
+    return {
+        "sync": pool_metrics.snapshot(),
+        "async": async_pool_metrics.snapshot(),
+        "unclosed_sessions": session_leaks.unclosed,
+    }
+
+
 def get_db():
     """Dependency for getting database session."""
     db = SessionLocal()
@@ -24,3 +106,8 @@ def get_db():
     finally:
         db.close()
 
+
+async def get_async_db():
+    """Dependency for getting an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,6 +1,6 @@
 """Content models (lessons, conditions, versions)."""
 
-from sqlalchemy import Column, String, Integer, Text, ForeignKey, JSON, Boolean, DateTime, Enum
+from sqlalchemy import Column, String, Integer, Text, ForeignKey, JSON, Boolean, DateTime, Enum, Index
 from sqlalchemy.orm import relationship
 import enum
 from app.db.base import BaseModel
@@ -31,6 +31,10 @@ class Lesson(BaseModel):
     """Lesson model."""
     
     __tablename__ = "lessons"
+    __table_args__ = (
+        # Serves keyset pagination in ContentService.get_lessons
+        Index("ix_lessons_created_at_id", "created_at", "id"),
+    )
     
     condition_id = Column(Integer, ForeignKey("conditions.id"), nullable=False)
     title = Column(String, nullable=False)
@@ -50,6 +54,10 @@ class LessonVersion(BaseModel):
     """Lesson version model (draft → approved workflow)."""
     
     __tablename__ = "lesson_versions"
+    __table_args__ = (
+        # Serves keyset pagination in ContentService.get_versions
+        Index("ix_lesson_versions_created_at_id", "created_at", "id"),
+    )
     
     lesson_id = Column(Integer, ForeignKey("lessons.id"), nullable=False)
     version_number = Column(String, nullable=False)
@@ -70,7 +78,7 @@ class ContentAsset(BaseModel):
     
     __tablename__ = "content_assets"
     
-    lesson_id = Column(Integer, ForeignKey("lessons.id"), nullable=False)
+    lesson_id = Column(Integer, ForeignKey("lessons.id"), nullable=True)  # Null for system prompts
     asset_type = Column(String, nullable=False)  # audio, text, image
     file_url = Column(String, nullable=False)
     file_size = Column(Integer, nullable=True)
@@ -1,9 +1,10 @@
 """Conversation models."""
 
-from sqlalchemy import Column, String, Integer, ForeignKey, Text, DateTime, JSON, Enum, Float
+from sqlalchemy import Column, String, Integer, ForeignKey, Text, DateTime, JSON, Enum, Float, Index
 from sqlalchemy.orm import relationship
 import enum
 from app.db.base import BaseModel
+from app.db.partitioning import PARTITION_BY, register_partitioned_table
 
 
 class SessionStatus(str, enum.Enum):
@@ -18,6 +19,12 @@ class ConversationSession(BaseModel):
     """Conversation session model."""
     
     __tablename__ = "conversation_sessions"
+    __table_args__ = (
+        # Serves SessionService.get_patient_sessions
+        Index("ix_conversation_sessions_patient_id", "patient_id"),
+        # Serves keyset pagination in SessionService.get_sessions
+        Index("ix_conversation_sessions_created_at_id", "created_at", "id"),
+    )
     
     patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False)
     channel = Column(String, nullable=False)  # ivr, whatsapp, sms
@@ -35,9 +42,20 @@ class ConversationSession(BaseModel):
 
 
 class ConversationTurn(BaseModel):
-    """Conversation turn model (replaces Message for more detailed tracking)."""
+    """Conversation turn model (replaces Message for more detailed tracking).
+    
+    Partitioned by month on created_at on PostgreSQL, where created_at is then
+    part of the primary key and other tables cannot hold a foreign key to it.
+    """
     
     __tablename__ = "conversation_turns"
+    __table_args__ = (
+        # Serves the history window loads (latest turns of one session)
+        Index("ix_conversation_turns_session_turn", "session_id", "turn_number"),
+        # Serves the retention cleanup in SchedulerService.cleanup_expired_assets
+        Index("ix_conversation_turns_created_at", "created_at"),
+        {"postgresql_partition_by": PARTITION_BY},
+    )
     
     session_id = Column(Integer, ForeignKey("conversation_sessions.id"), nullable=False)
     turn_number = Column(Integer, nullable=False)  # Sequential turn number
@@ -48,6 +66,7 @@ class ConversationTurn(BaseModel):
     audio_url = Column(String, nullable=True)  # Audio file URL
     tts_audio_url = Column(String, nullable=True)  # Generated TTS audio
     latency_ms = Column(Float, nullable=True)  # Response latency in milliseconds
+    first_audio_latency_ms = Column(Float, nullable=True)  # Time to first streamed audio chunk
     tokens_used = Column(Integer, nullable=True)  # LLM tokens used
     metadata = Column(JSON, nullable=True)  # Additional metadata
     
@@ -55,6 +74,9 @@ class ConversationTurn(BaseModel):
     session = relationship("ConversationSession", back_populates="turns")
 
 
+register_partitioned_table(ConversationTurn.__table__)
+
+
 class CallHistory(BaseModel):
     """Call history model for IVR calls."""
     
@@ -1,6 +1,6 @@
 """Patient model."""
 
-from sqlalchemy import Column, String, Integer, ForeignKey, Date, Boolean, DateTime
+from sqlalchemy import Column, String, Integer, ForeignKey, Date, Boolean, DateTime, Index
 from sqlalchemy.orm import relationship
 from app.db.base import BaseModel
 
@@ -9,6 +9,10 @@ class Patient(BaseModel):
     """Patient model."""
     
     __tablename__ = "patients"
+    __table_args__ = (
+        # Serves keyset pagination in PatientService.get_patients
+        Index("ix_patients_created_at_id", "created_at", "id"),
+    )
     
     hospital_id = Column(Integer, ForeignKey("hospitals.id"), nullable=False)
     first_name = Column(String, nullable=False)
@@ -3,7 +3,9 @@
 from sqlalchemy import Column, String, Integer, ForeignKey, Text, DateTime, JSON, Enum, Float, Boolean
 from sqlalchemy.orm import relationship
 import enum
+from datetime import datetime
 from app.db.base import BaseModel
+from app.db.partitioning import PARTITION_BY, register_partitioned_table
 
 
 class EscalationReason(str, enum.Enum):
@@ -26,12 +28,13 @@ class EscalationStatus(str, enum.Enum):
 
 
 class AIResponseLog(BaseModel):
-    """AI response log for every LLM prompt and output."""
+    """AI response log for every LLM prompt and output (partitioned by month on created_at)."""
     
     __tablename__ = "ai_response_logs"
+    __table_args__ = {"postgresql_partition_by": PARTITION_BY}
     
     session_id = Column(Integer, ForeignKey("conversation_sessions.id"), nullable=True)
-    turn_id = Column(Integer, ForeignKey("conversation_turns.id"), nullable=True)
+    turn_id = Column(Integer, nullable=True)  # No FK: conversation_turns is partitioned
     model_name = Column(String, nullable=False)  # gpt-4o, llama-3, etc.
     prompt = Column(Text, nullable=False)  # Full prompt sent to LLM
     response = Column(Text, nullable=False)  # LLM response
@@ -41,11 +44,18 @@ class AIResponseLog(BaseModel):
     latency_ms = Column(Float, nullable=True)  # Latency in milliseconds
     temperature = Column(Float, nullable=True)
     metadata = Column(JSON, nullable=True)
-    created_at = Column(DateTime, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
     # Relationships
     session = relationship("ConversationSession", foreign_keys=[session_id])
-    turn = relationship("ConversationTurn", foreign_keys=[turn_id])
+    turn = relationship(
+        "ConversationTurn",
+        primaryjoin="foreign(AIResponseLog.turn_id) == ConversationTurn.id",
+        viewonly=True
+    )
+
+
+register_partitioned_table(AIResponseLog.__table__)
 
 
 class EscalationRequest(BaseModel):
@@ -1,6 +1,6 @@
 """Schedule preference model."""
 
-from sqlalchemy import Column, String, Integer, ForeignKey, Time, Boolean, JSON
+from sqlalchemy import Column, String, Integer, ForeignKey, Time, Boolean, JSON, Index
 from sqlalchemy.orm import relationship
 from app.db.base import BaseModel
 
@@ -9,6 +9,10 @@ class SchedulePreference(BaseModel):
     """Schedule preference model for patient content delivery."""
     
     __tablename__ = "schedule_preferences"
+    __table_args__ = (
+        # Serves the per-minute due-window scan in SchedulerService.send_daily_content
+        Index("ix_schedule_preferences_due", "is_active", "preferred_time", "timezone"),
+    )
     
     patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False, unique=True)
     preferred_time = Column(Time, nullable=True)  # Preferred time of day for calls/messages
@@ -1,6 +1,6 @@
 """Scheduling models."""
 
-from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Enum, Boolean, JSON
+from sqlalchemy import Column, String, Integer, ForeignKey, DateTime, Enum, Boolean, JSON, Index, text
 from sqlalchemy.orm import relationship
 import enum
 from app.db.base import BaseModel
@@ -22,6 +22,16 @@ class ScheduledCall(BaseModel):
     """Scheduled call model."""
     
     __tablename__ = "scheduled_calls"
+    __table_args__ = (
+        # Serves the retry claim scan in SchedulerService.retry_missed_calls; partial, so it
+        # only holds the few calls still waiting for a retry
+        Index(
+            "ix_scheduled_calls_retry_due",
+            "next_attempt_at",
+            postgresql_where=text("status = 'FAILED' AND retry_count < max_retries"),
+            sqlite_where=text("status = 'FAILED' AND retry_count < max_retries")
+        ),
+    )
     
     patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False)
     scheduled_time = Column(DateTime, nullable=False)
@@ -32,6 +42,7 @@ class ScheduledCall(BaseModel):
     recurrence_pattern = Column(String, nullable=True)
     retry_count = Column(Integer, default=0)
     max_retries = Column(Integer, default=3)
+    next_attempt_at = Column(DateTime, nullable=True)  # Earliest retry time after a failure
     metadata = Column(JSON, nullable=True)
     
     # Relationships
@@ -0,0 +1,84 @@
+"""Keyset (cursor) pagination on (created_at, id), shared by the sync and async services."""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from sqlalchemy import func, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Planner row estimate, kept current by (auto)ANALYZE; -1 or 0 means never analyzed
+_ESTIMATE_SQL = text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)")
+
+
+class InvalidCursorError(ValueError):
+    """A cursor that was not issued by this API (or was altered)."""
+
+
+class Page:
+    """One page of rows plus the cursor for the next page (None on the last page)."""
+    
+    __slots__ = ("items", "next_cursor", "total")
+    
+    def __init__(self, items: List[Any], next_cursor: Optional[str], total: Optional[int] = None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.total = total
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque cursor pointing just past the row with this (created_at, id)."""
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Recover the (created_at, id) key from a cursor."""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(payload)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor!r}") from e
+
+
+def keyset(query, model, cursor: Optional[str], limit: int):
+    """Order a Query or Select by (created_at, id) and start it after cursor.
+    
+    One extra row is fetched so build_page can tell whether a next page exists.
+    """
+    if cursor:
+        query = query.filter(tuple_(model.created_at, model.id) > tuple_(*decode_cursor(cursor)))
+    return query.order_by(model.created_at, model.id).limit(limit + 1)
+
+
+def build_page(rows: Sequence[Any], limit: int, total: Optional[int] = None) -> Page:
+    """Trim the look-ahead row and derive the next cursor from the last row kept."""
+    items = list(rows[:limit])
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+    return Page(items=items, next_cursor=next_cursor, total=total)
+
+
+def approximate_count(db: Session, model) -> int:
+    """Row count from PostgreSQL's planner statistics, falling back to COUNT(*)."""
+    if db.get_bind().dialect.name == "postgresql":
+        estimate = db.execute(_ESTIMATE_SQL, {"table": model.__tablename__}).scalar()
+        if estimate and estimate > 0:
+            return estimate
+    return db.execute(select(func.count()).select_from(model)).scalar()
+
+
+async def async_approximate_count(db: AsyncSession, model) -> int:
+    """Async version of approximate_count."""
+    if db.get_bind().dialect.name == "postgresql":
+        estimate = (await db.execute(_ESTIMATE_SQL, {"table": model.__tablename__})).scalar()
+        if estimate and estimate > 0:
+            return estimate
+    return (await db.execute(select(func.count()).select_from(model))).scalar()
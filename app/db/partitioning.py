@@ -0,0 +1,124 @@
+"""Monthly range partitions for the append-only conversation tables (PostgreSQL)."""
+
+import re
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import PrimaryKeyConstraint, Table, event, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.compiler import compiles
+from app.core.config import settings
+
+# Tables partitioned BY RANGE (created_at), one partition per calendar month
+PARTITIONED_TABLES = ("conversation_turns", "ai_response_logs")
+
+PARTITION_BY = "RANGE (created_at)"
+
+
+def month_start(value: datetime) -> datetime:
+    """First instant of value's month."""
+    return datetime(value.year, value.month, 1)
+
+
+def add_months(month: datetime, count: int) -> datetime:
+    """Shift a month start by count months."""
+    index = month.year * 12 + month.month - 1 + count
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    """Name of table's partition for month, e.g. conversation_turns_p2026_10."""
+    return f"{table}_p{month:%Y_%m}"
+
+
+def partition_month(table: str, name: str) -> Optional[datetime]:
+    """Month a partition covers, or None if name is not one of table's monthly partitions."""
+    match = re.fullmatch(rf"{re.escape(table)}_p(\d{{4}})_(\d{{2}})", name)
+    if not match:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1)
+
+
+def create_partition_sql(table: str, month: datetime) -> str:
+    """DDL for table's partition covering [month, next month)."""
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+    )
+
+
+def default_partition_sql(table: str) -> str:
+    """DDL for table's catch-all partition (backdated rows older than every monthly partition)."""
+    return f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"
+
+
+def _is_postgresql(connection: Connection) -> bool:
+    return connection.dialect.name == "postgresql"
+
+
+def ensure_partitions(
+    connection: Connection,
+    table: str,
+    now: Optional[datetime] = None,
+    months_ahead: Optional[int] = None
+) -> List[str]:
+    """Create the current month's partition, months_ahead future ones and the default partition.
+    
+    Returns the monthly partition names.
+    """
+    if not _is_postgresql(connection):
+        return []
+    if months_ahead is None:
+        months_ahead = settings.PARTITION_MONTHS_AHEAD
+    
+    current = month_start(now or datetime.utcnow())
+    names = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        connection.execute(text(create_partition_sql(table, month)))
+        names.append(partition_name(table, month))
+    connection.execute(text(default_partition_sql(table)))
+    return names
+
+
+def list_partitions(connection: Connection, table: str) -> List[str]:
+    """Names of the partitions currently attached to table."""
+    if not _is_postgresql(connection):
+        return []
+    rows = connection.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = :table ORDER BY child.relname"
+    ), {"table": table})
+    return [name for (name,) in rows]
+
+
+def retire_partitions(connection: Connection, table: str, cutoff: datetime, detach_only: bool = False) -> List[str]:
+    """Detach (and unless detach_only, drop) table's partitions that end at or before cutoff."""
+    retired = []
+    for name in list_partitions(connection, table):
+        month = partition_month(table, name)
+        if month is None or add_months(month, 1) > cutoff:
+            continue
+        connection.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+        if not detach_only:
+            connection.execute(text(f"DROP TABLE {name}"))
+        retired.append(name)
+    return retired
+
+
+@compiles(PrimaryKeyConstraint, "postgresql")
+def _partitioned_primary_key(constraint, compiler, **kw):
+    # PostgreSQL needs the partition key in a partitioned table's primary key. The
+    # models keep id as their only primary key column, so SQLite still gets an
+    # autoincrementing INTEGER PRIMARY KEY and the ORM identity stays the id.
+    if constraint.table.name in PARTITIONED_TABLES:
+        return "PRIMARY KEY (id, created_at)"
+    return compiler.visit_primary_key_constraint(constraint, **kw)
+
+
+def register_partitioned_table(table: Table):
+    """Create the initial monthly partitions whenever metadata.create_all creates table."""
+    @event.listens_for(table, "after_create")
+    def _create_partitions(target, connection, **kw):
+        ensure_partitions(connection, target.name)
@@ -0,0 +1,146 @@
+"""Connection-pool and session instrumentation."""
+
+import logging
+import threading
+import time
+import traceback
+import weakref
+from typing import Any, Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMetrics:
+    """Checkout wait and usage counters for one engine's pool."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pool: Optional[Pool] = None
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.checkout_wait_ms_total = 0.0
+        self.checkout_wait_ms_max = 0.0
+        self.in_use = 0
+        self.in_use_max = 0
+    
+    def record_wait(self, wait_ms: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.checkout_timeouts += 1
+                return
+            self.checkouts += 1
+            self.checkout_wait_ms_total += wait_ms
+            self.checkout_wait_ms_max = max(self.checkout_wait_ms_max, wait_ms)
+    
+    def record_checkout(self):
+        with self._lock:
+            self.in_use += 1
+            self.in_use_max = max(self.in_use_max, self.in_use)
+    
+    def record_checkin(self):
+        with self._lock:
+            self.in_use -= 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the current counters as a dict."""
+        with self._lock:
+            metrics = {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "checkout_wait_ms_avg": round(self.checkout_wait_ms_total / self.checkouts, 3) if self.checkouts else 0.0,
+                "checkout_wait_ms_max": round(self.checkout_wait_ms_max, 3),
+                "in_use": self.in_use,
+                "in_use_max": self.in_use_max,
+            }
+        if isinstance(self.pool, QueuePool):
+            metrics["pool_size"] = self.pool.size()
+            metrics["overflow"] = max(self.pool.overflow(), 0)
+        return metrics
+
+
+class _TimedCheckoutMixin:
+    """Times how long each checkout waits for a free connection."""
+    
+    metrics: PoolMetrics
+    
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_wait(0.0, timed_out=True)
+            raise
+        self.metrics.record_wait((time.perf_counter() - started) * 1000)
+        return connection
+    
+    def recreate(self):
+        # engine.dispose() swaps in a new pool; event listeners carry over, metrics must too
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        self.metrics.pool = pool
+        return pool
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    """QueuePool that records checkout wait time."""
+
+
+class InstrumentedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout wait time."""
+
+
+def instrument_engine(engine, metrics: PoolMetrics) -> PoolMetrics:
+    """Attach metrics to an engine created with one of the instrumented pool classes."""
+    pool = engine.pool
+    pool.metrics = metrics
+    metrics.pool = pool
+    
+    event.listen(pool, "checkout", lambda *args: metrics.record_checkout())
+    event.listen(pool, "checkin", lambda *args: metrics.record_checkin())
+    return metrics
+
+
+class _SessionLeakStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.unclosed = 0
+    
+    def record(self, origin: Optional[str]):
+        with self._lock:
+            self.unclosed += 1
+        logger.warning("Database session was garbage collected without being closed%s",
+                       f"; opened at:\n{origin}" if origin else "")
+
+
+session_leaks = _SessionLeakStats()
+
+
+def _report_unclosed(state: Dict[str, Any]):
+    if not state["closed"]:
+        session_leaks.record(state["origin"])
+
+
+class TrackedSession(Session):
+    """Session that reports itself if it is garbage collected without close().
+    
+    With ``track_origin`` the opening stack is captured so the report points at
+    the code that leaked it (costly, so only enabled in DEBUG).
+    """
+    
+    track_origin = False
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._close_state = {
+            "closed": False,
+            "origin": "".join(traceback.format_stack(limit=8)[:-1]) if self.track_origin else None,
+        }
+        weakref.finalize(self, _report_unclosed, self._close_state)
+    
+    def close(self):
+        self._close_state["closed"] = True
+        super().close()
@@ -0,0 +1,61 @@
+"""Statement counting for catching N+1 query regressions in tests and debugging."""
+
+from typing import List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+
+class TooManyQueriesError(AssertionError):
+    """An operation issued more SQL statements than its budget."""
+
+
+class QueryCounter:
+    """Counts the statements an engine executes inside a ``with`` block.
+    
+    With max_statements set, leaving the block raises TooManyQueriesError if
+    the budget was exceeded, listing every statement so the lazy load that
+    caused it is easy to spot::
+    
+        with QueryCounter(db, max_statements=2):
+            SchedulerService._claim_retry_batch(db, batch_size=10)
+    
+    The listener sits on the whole engine, so run the counted operation
+    without other threads sharing that engine.
+    """
+    
+    def __init__(self, bind, max_statements: Optional[int] = None):
+        self.engine = self._resolve_engine(bind)
+        self.max_statements = max_statements
+        self.statements: List[str] = []
+    
+    @staticmethod
+    def _resolve_engine(bind) -> Engine:
+        if isinstance(bind, AsyncSession):
+            bind = bind.sync_session
+        if isinstance(bind, Session):
+            bind = bind.get_bind()
+        if isinstance(bind, AsyncEngine):
+            bind = bind.sync_engine
+        return getattr(bind, "engine", bind)
+    
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+    
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+    
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+        if exc_type is None and self.max_statements is not None and self.count > self.max_statements:
+            listing = "\n".join(f"  {n}. {statement}" for n, statement in enumerate(self.statements, 1))
+            raise TooManyQueriesError(
+                f"{self.count} statements executed, budget is {self.max_statements}:\n{listing}"
+            )
+        return False
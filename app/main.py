@@ -5,6 +5,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.core.logging_config import setup_logging
 from app.api.v1 import api_router
+from app.db.database import get_pool_status
+from app.services.ai_log_writer import shutdown_ai_log_writer
 
 # Setup logging
 logger = setup_logging()
@@ -29,6 +31,12 @@ app.add_middleware(
 app.include_router(api_router)
 
 
+@app.on_event("shutdown")
+def flush_audit_logs():
+    """Flush queued AI response logs before the worker exits."""
+    shutdown_ai_log_writer()
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -41,7 +49,7 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    return {"status": "healthy"}
+    return {"status": "healthy", "db_pool": get_pool_status()}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,16 @@
+"""Pagination schemas."""
+
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class PageResponse(BaseModel, Generic[T]):
+    """Schema for one page of a keyset-paginated list."""
+    items: List[T]
+    next_cursor: Optional[str] = None  # Pass back as ?cursor= for the next page; None on the last page
+    total: Optional[int] = None  # Approximate row count, only when include_total is set
+    
+    class Config:
+        from_attributes = True
@@ -0,0 +1,275 @@
+"""Background, batched writer for AIResponseLog rows."""
+
+import asyncio
+import atexit
+import json
+import queue
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.models.safety import AIResponseLog
+
+
+class AIResponseLogWriter:
+    """Queues AI response logs and writes them in batches from a background thread.
+    
+    The queue is bounded: when it is full, ``submit`` blocks until the writer
+    catches up instead of dropping rows, and the wait is recorded in the metrics.
+    Async callers use ``submit_async``, which waits for room in a worker thread
+    so the event loop keeps running.
+    
+    Batches that still fail after WRITE_ATTEMPTS are appended to a dead-letter
+    file and re-queued from it every dead_letter_retry_seconds. ``shutdown``
+    drains everything still queued before returning; rows submitted after that
+    are written synchronously by the caller.
+    """
+    
+    WRITE_ATTEMPTS = 3
+    
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        max_queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval_seconds: Optional[float] = None,
+        dead_letter_path: Optional[str] = None,
+        dead_letter_retry_seconds: Optional[float] = None
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.AI_LOG_BATCH_SIZE
+        self.flush_interval_seconds = flush_interval_seconds or settings.AI_LOG_FLUSH_INTERVAL_SECONDS
+        self.dead_letter_path = Path(dead_letter_path or settings.AI_LOG_DEAD_LETTER_PATH)
+        self.dead_letter_retry_seconds = dead_letter_retry_seconds or settings.AI_LOG_DEAD_LETTER_RETRY_SECONDS
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size or settings.AI_LOG_QUEUE_SIZE)
+        self._stopping = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._dead_letter_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            "enqueued": 0,
+            "written": 0,
+            "batches": 0,
+            "failed_batches": 0,
+            "dead_lettered": 0,
+            "replayed": 0,
+            "sync_writes": 0,
+            "blocked_submits": 0,
+            "blocked_seconds": 0.0,
+            "max_queue_depth": 0,
+        }
+    
+    def start(self):
+        """Start the background writer thread."""
+        if self._thread is None and not self._closed:
+            self._thread = threading.Thread(target=self._run, name="ai-response-log-writer", daemon=True)
+            self._thread.start()
+    
+    def submit(self, row: Dict[str, Any]):
+        """Queue one AIResponseLog row, blocking if the queue is full (backpressure).
+        
+        After shutdown the row is written synchronously instead.
+        """
+        if self._stopping.is_set():
+            self._write_now([row])
+            return
+        
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            wait_start = time.monotonic()
+            self._queue.put(row)
+            with self._metrics_lock:
+                self._metrics["blocked_submits"] += 1
+                self._metrics["blocked_seconds"] += time.monotonic() - wait_start
+        self._count_enqueued()
+        
+        # shutdown may have drained the queue between the check above and the put
+        if self._closed:
+            self._write_leftovers()
+    
+    async def submit_async(self, row: Dict[str, Any]):
+        """Queue one row from async code without blocking the event loop."""
+        if not self._stopping.is_set():
+            try:
+                self._queue.put_nowait(row)
+            except queue.Full:
+                pass
+            else:
+                self._count_enqueued()
+                if self._closed:
+                    await asyncio.to_thread(self._write_leftovers)
+                return
+        
+        # Backpressure and writes after shutdown wait in a worker thread
+        await asyncio.to_thread(self.submit, row)
+    
+    def shutdown(self, timeout: Optional[float] = None):
+        """Stop the writer after flushing every queued row."""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                return
+            self._thread = None
+        self._closed = True
+        self._write_leftovers()
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get writer counters and the current queue depth."""
+        with self._metrics_lock:
+            return {**self._metrics, "queue_depth": self._queue.qsize()}
+    
+    def _run(self):
+        """Write batches until stopped and the queue is drained, replaying dead letters periodically."""
+        next_replay = time.monotonic()
+        while True:
+            if time.monotonic() >= next_replay:
+                try:
+                    self._replay_dead_letters()
+                except Exception as e:
+                    print(f"AI response log dead-letter replay failed: {e}")
+                next_replay = time.monotonic() + self.dead_letter_retry_seconds
+            
+            batch = self._next_batch()
+            if batch:
+                self._write(batch)
+            elif self._stopping.is_set():
+                return
+    
+    def _next_batch(self) -> List[Dict[str, Any]]:
+        """Collect rows until the batch is full or the flush interval elapses."""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval_seconds
+        while len(batch) < self.batch_size:
+            try:
+                if self._stopping.is_set():
+                    batch.append(self._queue.get_nowait())
+                else:
+                    batch.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0)))
+            except queue.Empty:
+                break
+        return batch
+    
+    def _count_enqueued(self):
+        with self._metrics_lock:
+            self._metrics["enqueued"] += 1
+            self._metrics["max_queue_depth"] = max(self._metrics["max_queue_depth"], self._queue.qsize())
+    
+    def _write_leftovers(self):
+        """Write every row still queued on the calling thread."""
+        rows = []
+        while True:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        self._write_now(rows)
+    
+    def _write_now(self, rows: List[Dict[str, Any]]):
+        """Write rows on the calling thread (used once the writer thread has stopped)."""
+        for start in range(0, len(rows), self.batch_size):
+            self._write(rows[start:start + self.batch_size])
+            with self._metrics_lock:
+                self._metrics["sync_writes"] += 1
+    
+    def _write(self, rows: List[Dict[str, Any]]) -> bool:
+        """Insert one batch, retrying transient failures and dead-lettering it if they persist."""
+        for attempt in range(1, self.WRITE_ATTEMPTS + 1):
+            db = self.session_factory()
+            try:
+                db.bulk_insert_mappings(AIResponseLog, rows)
+                db.commit()
+                with self._metrics_lock:
+                    self._metrics["written"] += len(rows)
+                    self._metrics["batches"] += 1
+                return True
+            except Exception as e:
+                db.rollback()
+                print(f"AI response log write failed (attempt {attempt}): {e}")
+                if attempt < self.WRITE_ATTEMPTS:
+                    time.sleep(0.5 * attempt)
+            finally:
+                db.close()
+        
+        with self._metrics_lock:
+            self._metrics["failed_batches"] += 1
+        self._dead_letter(rows)
+        return False
+    
+    def _dead_letter(self, rows: List[Dict[str, Any]]):
+        """Append a batch that could not be written to the dead-letter file (one JSON row per line)."""
+        try:
+            with self._dead_letter_lock:
+                self.dead_letter_path.parent.mkdir(parents=True, exist_ok=True)
+                with self.dead_letter_path.open("a", encoding="utf-8") as f:
+                    for row in rows:
+                        f.write(json.dumps(row, default=_encode_datetime) + "\n")
+            with self._metrics_lock:
+                self._metrics["dead_lettered"] += len(rows)
+        except OSError as e:
+            print(f"AI response log dead-letter write failed, {len(rows)} rows lost: {e}")
+    
+    def _replay_dead_letters(self):
+        """Re-queue dead-lettered rows; rows that fail again go back to the dead-letter file."""
+        replay_path = self.dead_letter_path.with_name(self.dead_letter_path.name + ".replay")
+        with self._dead_letter_lock:
+            # A .replay file left behind by a crash is retried before newer dead letters
+            if not replay_path.exists():
+                if not self.dead_letter_path.exists():
+                    return
+                self.dead_letter_path.replace(replay_path)
+        
+        with replay_path.open(encoding="utf-8") as f:
+            rows = [_decode_row(line) for line in f if line.strip()]
+        for start in range(0, len(rows), self.batch_size):
+            batch = rows[start:start + self.batch_size]
+            if self._write(batch):
+                with self._metrics_lock:
+                    self._metrics["replayed"] += len(batch)
+        replay_path.unlink()
+
+
+def _encode_datetime(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _decode_row(line: str) -> Dict[str, Any]:
+    row = json.loads(line)
+    if row.get("created_at"):
+        row["created_at"] = datetime.fromisoformat(row["created_at"])
+    return row
+
+
+_writer: Optional[AIResponseLogWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_ai_log_writer() -> AIResponseLogWriter:
+    """Get the process-wide writer, starting it on first use."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = AIResponseLogWriter()
+            _writer.start()
+            atexit.register(_writer.shutdown)
+        return _writer
+
+
+def shutdown_ai_log_writer():
+    """Flush and stop the process-wide writer if it was started.
+    
+    AIService instances still holding it write their remaining logs synchronously.
+    """
+    global _writer
+    with _writer_lock:
+        if _writer is not None:
+            _writer.shutdown()
+            _writer = None
@@ -1,20 +1,51 @@
 """AI/LLM service with Whisper ASR, GPT-4o/LLaMA LLM, and TTS."""
 
+import re
 import time
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, AsyncIterator
 from datetime import datetime
 from sqlalchemy.orm import Session
 from app.core.config import settings
-from app.db.models.safety import AIResponseLog
+from app.services.ai_log_writer import AIResponseLogWriter, get_ai_log_writer
+from app.services.response_cache import ResponseCache, get_response_cache
+from app.services.tts_cache import TTSAssetCache
 from app.db.models.conversation import ConversationSession
 from app.workflows.conversation_fsm import ConversationState
 
+# Sentence end: terminal punctuation followed by whitespace
+SENTENCE_END = re.compile(r"[.!?](?:[\"')\]]*)\s+")
+
+
+async def iter_sentences(tokens: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Group a token stream into complete sentences as soon as each one ends."""
+    buffer = ""
+    async for token in tokens:
+        buffer += token
+        while True:
+            match = SENTENCE_END.search(buffer)
+            if not match:
+                break
+            sentence, buffer = buffer[:match.end()].strip(), buffer[match.end():]
+            if sentence:
+                yield sentence
+    if buffer.strip():
+        yield buffer.strip()
+
 
 class AIService:
     """Service for AI/LLM operations with token counting and latency logging."""
     
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: Session,
+        log_writer: Optional[AIResponseLogWriter] = None,
+        response_cache: Optional[ResponseCache] = None,
+        tts_cache: Optional[TTSAssetCache] = None
+    ):
         self.db = db
+        self.log_writer = log_writer or get_ai_log_writer()
+        self.response_cache = response_cache or get_response_cache()
+        self.tts_cache = tts_cache or TTSAssetCache(db)
         self.openai_api_key = settings.OPENAI_API_KEY
         # Model configuration
         self.asr_model = "whisper-1"  # OpenAI Whisper
@@ -47,86 +78,150 @@ class AIService:
         user_input: str,
         current_state: ConversationState,
         context: Dict[str, Any],
-        history: List[Dict[str, str]]
+        history: List[Dict[str, str]],
+        language: Optional[str] = None
     ) -> str:
         """Generate AI response using GPT-4o or LLaMA."""
+        return "".join([
+            token async for token in self.stream_response(user_input, current_state, context, history, language)
+        ])
+    
+    async def stream_response(
+        self,
+        user_input: str,
+        current_state: ConversationState,
+        context: Dict[str, Any],
+        history: List[Dict[str, str]],
+        language: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """Stream the AI response token by token, logging it once complete."""
         start_time = time.time()
         
         # Build prompt based on current state and context
         prompt = self._build_prompt(user_input, current_state, context, history)
         
+        # Repeated lesson-delivery prompts are served from the cache when possible
+        cache_key = self.response_cache.make_key(current_state, context, language, prompt)
+        if cache_key:
+            cached_response = self.response_cache.get(cache_key)
+            if cached_response is not None:
+                yield cached_response
+                # Cache hits are audited like model calls, under a distinct model name
+                await self._log_ai_response(
+                    prompt=prompt,
+                    response=cached_response,
+                    input_tokens=0,
+                    output_tokens=0,
+                    total_tokens=0,
+                    latency_ms=(time.time() - start_time) * 1000,
+                    model_name=f"cache:{self.llm_model}"
+                )
+                return
+        
+        tokens = []
+        
         try:
             # TODO: Integrate with OpenAI GPT-4o or LLaMA
-            # import openai
-            # openai.api_key = self.openai_api_key
-            # response = openai.ChatCompletion.create(
+            # from openai import AsyncOpenAI
+            # client = AsyncOpenAI(api_key=self.openai_api_key)
+            # stream = await client.chat.completions.create(
             #     model=self.llm_model,
             #     messages=[
             #         {"role": "system", "content": self._get_system_prompt(current_state)},
             #         {"role": "user", "content": prompt}
             #     ],
             #     temperature=0.7,
-            #     max_tokens=500
+            #     max_tokens=500,
+            #     stream=True
             # )
-            # 
-            # response_text = response.choices[0].message.content
-            # input_tokens = response.usage.prompt_tokens
-            # output_tokens = response.usage.completion_tokens
-            # total_tokens = response.usage.total_tokens
+            # async for chunk in stream:
+            #     token = chunk.choices[0].delta.content or ""
+            #     tokens.append(token)
+            #     yield token
             
             # Placeholder implementation
             response_text = f"AI response for state {current_state.value}: {user_input}"
-            input_tokens = len(prompt.split())  # Approximate
-            output_tokens = len(response_text.split())  # Approximate
-            total_tokens = input_tokens + output_tokens
-            
-            latency_ms = (time.time() - start_time) * 1000
-            
-            # Log AI response
-            self._log_ai_response(
-                prompt=prompt,
-                response=response_text,
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
-                total_tokens=total_tokens,
-                latency_ms=latency_ms,
-                model_name=self.llm_model
-            )
-            
-            return response_text
+            for token in re.findall(r"\S+\s*", response_text):
+                tokens.append(token)
+                yield token
         except Exception as e:
             print(f"LLM error: {e}")
-            return "I apologize, I'm having trouble processing that. Could you please repeat?"
+            fallback = "I apologize, I'm having trouble processing that. Could you please repeat?"
+            yield fallback
+            return
+        
+        response_text = "".join(tokens)
+        input_tokens = len(prompt.split())  # Approximate
+        output_tokens = len(response_text.split())  # Approximate
+        total_tokens = input_tokens + output_tokens
+        
+        latency_ms = (time.time() - start_time) * 1000
+        
+        if cache_key:
+            self.response_cache.set(cache_key, response_text)
+        
+        # Log AI response
+        await self._log_ai_response(
+            prompt=prompt,
+            response=response_text,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            total_tokens=total_tokens,
+            latency_ms=latency_ms,
+            model_name=self.llm_model
+        )
     
-    async def synthesize_speech(self, text: str, language: str = "en") -> str:
-        """Synthesize speech from text using TTS (African-accent voice)."""
+    async def synthesize_speech(
+        self,
+        text: str,
+        language: str = "en",
+        cacheable: bool = False,
+        lesson_id: Optional[int] = None
+    ) -> str:
+        """Synthesize speech from text using TTS (African-accent voice).
+        
+        Only fixed prompts, whose text is identical for every patient, should pass
+        ``cacheable=True`` to be served from the TTS cache; LLM output never should.
+        """
         start_time = time.time()
         
         try:
-            # TODO: Integrate with OpenAI TTS or other TTS service
-            # import openai
-            # openai.api_key = self.openai_api_key
-            # response = openai.Audio.speech.create(
-            #     model=self.tts_model,
-            #     voice=self.tts_voice,  # Configure for African accent
-            #     input=text,
-            #     language=language
-            # )
-            # 
-            # # Save audio file
-            # audio_url = f"audio/{datetime.utcnow().timestamp()}.mp3"
-            # with open(audio_url, "wb") as f:
-            #     f.write(response.content)
-            # return audio_url
+            if cacheable:
+                audio_url = await self.tts_cache.get_or_render(
+                    text, language, self.tts_voice, self.tts_model, self.render_speech, lesson_id=lesson_id
+                )
+            else:
+                # TODO: Save rendered audio to storage
+                # audio = await self.render_speech(text, language)
+                # audio_url = f"audio/{datetime.utcnow().timestamp()}.mp3"
+                # LocalFileStorage().save(audio_url, audio)
+                
+                # Placeholder implementation
+                audio_url = f"audio/{datetime.utcnow().timestamp()}.mp3"
             
-            # Placeholder implementation
             latency_ms = (time.time() - start_time) * 1000
             print(f"TTS synthesis completed in {latency_ms:.2f}ms")
-            return f"audio/{datetime.utcnow().timestamp()}.mp3"
+            return audio_url
         except Exception as e:
             print(f"TTS error: {e}")
             return ""
     
+    async def render_speech(self, text: str, language: str = "en") -> bytes:
+        """Render speech audio for text with the TTS model."""
+        # TODO: Integrate with OpenAI TTS or other TTS service
+        # import openai
+        # openai.api_key = self.openai_api_key
+        # response = openai.Audio.speech.create(
+        #     model=self.tts_model,
+        #     voice=self.tts_voice,  # Configure for African accent
+        #     input=text,
+        #     language=language
+        # )
+        # return response.content
+        
+        # Placeholder implementation
+        return b""
+    
     def _build_prompt(
         self,
         user_input: str,
@@ -156,7 +251,7 @@ class AIService:
         # Add conversation history
         if history:
             base_prompt += "\n\nConversation history:"
-            for msg in history[-3:]:  # Last 3 messages
+            for msg in history[-settings.CONVERSATION_HISTORY_WINDOW:]:
                 base_prompt += f"\n{msg['role']}: {msg['content']}"
         
         base_prompt += f"\n\nUser input: {user_input}"
@@ -180,7 +275,7 @@ CRITICAL RULES:
 
 Your role is to educate, not to diagnose or treat."""
     
-    def _log_ai_response(
+    async def _log_ai_response(
         self,
         prompt: str,
         response: str,
@@ -192,21 +287,19 @@ Your role is to educate, not to diagnose or treat."""
         session_id: Optional[int] = None,
         turn_id: Optional[int] = None
     ):
-        """Log AI response for audit purposes."""
-        log = AIResponseLog(
-            session_id=session_id,
-            turn_id=turn_id,
-            model_name=model_name,
-            prompt=prompt,
-            response=response,
-            input_tokens=input_tokens,
-            output_tokens=output_tokens,
-            total_tokens=total_tokens,
-            latency_ms=latency_ms,
-            created_at=datetime.utcnow()
-        )
-        self.db.add(log)
-        self.db.commit()
+        """Log AI response for audit purposes (written in batches off the request path)."""
+        await self.log_writer.submit_async({
+            "session_id": session_id,
+            "turn_id": turn_id,
+            "model_name": model_name,
+            "prompt": prompt,
+            "response": response,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": total_tokens,
+            "latency_ms": latency_ms,
+            "created_at": datetime.utcnow()
+        })
     
     def count_tokens(self, text: str) -> int:
         """Count tokens in text (approximate)."""
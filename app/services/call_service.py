@@ -1,7 +1,8 @@
 """Outbound call service."""
 
-from typing import Optional
-from datetime import datetime
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from app.db.models.patient import Patient
 from app.db.models.scheduling import ScheduledCall, CallStatus
@@ -17,14 +18,28 @@ class CallService:
         self.twilio_account_sid = settings.TWILIO_ACCOUNT_SID
         self.twilio_auth_token = settings.TWILIO_AUTH_TOKEN
     
+    @contextmanager
+    def _session_scope(self):
+        """Use the injected session, or open one for this call and close it afterwards."""
+        if self.db is not None:
+            yield
+            return
+        from app.db.database import SessionLocal
+        self.db = SessionLocal()
+        try:
+            yield
+        finally:
+            self.db.close()
+            self.db = None
+    
     def initiate_call(self, patient: Patient, scheduled_call: Optional[ScheduledCall] = None) -> dict:
         """Initiate an outbound call to a patient."""
-        if not self.db:
-            from app.db.database import SessionLocal
-            self.db = SessionLocal()
-        
+        with self._session_scope():
+            return self._initiate_call(patient, scheduled_call)
+    
+    def _initiate_call(self, patient: Patient, scheduled_call: Optional[ScheduledCall]) -> dict:
         try:
-            # TODO: Integrate with Twilio
+            # TODO: Integrate with Twilio (see OutboundDialer for batched, concurrent dialing)
             # from twilio.rest import Client
             # client = Client(self.twilio_account_sid, self.twilio_auth_token)
             # 
@@ -34,50 +49,74 @@ class CallService:
             #     from_=settings.TWILIO_PHONE_NUMBER
             # )
             
-            # Create call history
-            session = ConversationSession(
+            session, call_history = self.create_call_records([(patient, scheduled_call)])[0]
+            self.db.commit()
+            
+            return {
+                "status": "initiated",
+                "call_sid": None,  # call.sid when Twilio integrated
+                "patient_id": patient.id,
+                "session_id": session.id
+            }
+        except Exception as e:
+            if scheduled_call:
+                self.mark_call_failed(scheduled_call)
+                self.db.commit()
+            raise e
+    
+    def create_call_records(
+        self,
+        calls: List[Tuple[Patient, Optional[ScheduledCall]]]
+    ) -> List[Tuple[ConversationSession, CallHistory]]:
+        """Create the session and call history rows for a batch of calls (flushed, not committed)."""
+        started_at = datetime.utcnow()
+        
+        sessions = [
+            ConversationSession(
                 patient_id=patient.id,
                 channel="ivr",
                 status=SessionStatus.ACTIVE,
-                started_at=datetime.utcnow()
+                started_at=started_at
             )
-            self.db.add(session)
-            self.db.commit()
-            
+            for patient, _ in calls
+        ]
+        self.db.add_all(sessions)
+        self.db.flush()
+        
+        call_histories = []
+        for (patient, scheduled_call), session in zip(calls, sessions):
             call_history = CallHistory(
                 session_id=session.id,
                 phone_number=patient.phone_number,
-                call_sid=None,  # call.sid when Twilio integrated
+                call_sid=None,
                 call_status="initiated",
-                attempt_number=1,
-                started_at=datetime.utcnow()
+                attempt_number=(scheduled_call.retry_count or 0) + 1 if scheduled_call else 1,
+                started_at=started_at
             )
-            self.db.add(call_history)
+            call_histories.append(call_history)
             
             if scheduled_call:
                 scheduled_call.status = CallStatus.IN_PROGRESS
                 scheduled_call.call_history = call_history
-            
-            self.db.commit()
-            
-            return {
-                "status": "initiated",
-                "call_sid": None,  # call.sid when Twilio integrated
-                "patient_id": patient.id,
-                "session_id": session.id
-            }
-        except Exception as e:
-            if scheduled_call:
-                scheduled_call.status = CallStatus.FAILED
-                self.db.commit()
-            raise e
+        
+        self.db.add_all(call_histories)
+        self.db.flush()
+        
+        return list(zip(sessions, call_histories))
+    
+    @staticmethod
+    def mark_call_failed(scheduled_call: ScheduledCall):
+        """Mark a scheduled call failed and set its next retry time (1h, 2h, 4h, ...)."""
+        failed_at = datetime.utcnow()
+        scheduled_call.status = CallStatus.FAILED
+        scheduled_call.next_attempt_at = failed_at + timedelta(hours=2 ** (scheduled_call.retry_count or 0))
     
     def handle_call_status_update(self, call_sid: str, status: str) -> dict:
         """Handle call status updates from telephony provider."""
-        if not self.db:
-            from app.db.database import SessionLocal
-            self.db = SessionLocal()
-        
+        with self._session_scope():
+            return self._handle_call_status_update(call_sid, status)
+    
+    def _handle_call_status_update(self, call_sid: str, status: str) -> dict:
         call_history = self.db.query(CallHistory).filter(
             CallHistory.call_sid == call_sid
         ).first()
@@ -1,9 +1,14 @@
 """Content service."""
 
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.db.models.content import Lesson, Condition, ContentVersion
+from typing import List, Optional, Tuple
+from datetime import datetime
+from app.db.models.content import Lesson, Condition, LessonVersion, LessonVersionStatus
+from app.db.pagination import DEFAULT_PAGE_SIZE, Page, approximate_count, async_approximate_count, build_page, keyset
 from app.schemas.content import LessonCreate, ConditionCreate, ContentVersionCreate
+from app.services.response_cache import get_response_cache
 
 
 class ContentService:
@@ -15,9 +20,20 @@ class ContentService:
         return db.query(Lesson).filter(Lesson.id == lesson_id).first()
     
     @staticmethod
-    def get_lessons(db: Session, skip: int = 0, limit: int = 100) -> List[Lesson]:
-        """Get all lessons."""
-        return db.query(Lesson).offset(skip).limit(limit).all()
+    def get_lesson_with_approved_version(db: Session, lesson_id: int) -> Tuple[Optional[Lesson], Optional[LessonVersion]]:
+        """Get a lesson and its approved version (if any) in one query, without loading every version."""
+        row = db.query(Lesson, LessonVersion).outerjoin(
+            LessonVersion,
+            and_(LessonVersion.lesson_id == Lesson.id, LessonVersion.status == LessonVersionStatus.APPROVED)
+        ).filter(Lesson.id == lesson_id).first()
+        return (row[0], row[1]) if row else (None, None)
+    
+    @staticmethod
+    def get_lessons(db: Session, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+                    include_total: bool = False) -> Page:
+        """Get a page of lessons, oldest first."""
+        rows = keyset(db.query(Lesson), Lesson, cursor, limit).all()
+        return build_page(rows, limit, approximate_count(db, Lesson) if include_total else None)
     
     @staticmethod
     def create_lesson(db: Session, lesson_data: LessonCreate) -> Lesson:
@@ -48,11 +64,152 @@ class ContentService:
         return condition
     
     @staticmethod
-    def create_version(db: Session, version_data: ContentVersionCreate) -> ContentVersion:
+    def create_version(db: Session, version_data: ContentVersionCreate) -> LessonVersion:
         """Create a new content version."""
-        version = ContentVersion(**version_data.dict())
+        version = LessonVersion(**version_data.dict())
         db.add(version)
         db.commit()
         db.refresh(version)
         return version
+    
+    @staticmethod
+    def get_versions(db: Session, lesson_id: Optional[int] = None, cursor: Optional[str] = None,
+                     limit: int = DEFAULT_PAGE_SIZE, include_total: bool = False) -> Page:
+        """Get a page of lesson versions, optionally for one lesson."""
+        query = db.query(LessonVersion)
+        total = None
+        if lesson_id is not None:
+            query = query.filter(LessonVersion.lesson_id == lesson_id)
+            # A lesson has few versions, so its exact count is cheap
+            if include_total:
+                total = query.count()
+        elif include_total:
+            total = approximate_count(db, LessonVersion)
+        return build_page(keyset(query, LessonVersion, cursor, limit).all(), limit, total)
+    
+    @staticmethod
+    def approve_version(db: Session, version_id: int, approver_id: Optional[int] = None) -> Optional[LessonVersion]:
+        """Approve a lesson version, making it the lesson's current content."""
+        version = db.query(LessonVersion).filter(LessonVersion.id == version_id).first()
+        if not version:
+            return None
+        
+        # Archive the previously approved version
+        db.query(LessonVersion).filter(
+            LessonVersion.lesson_id == version.lesson_id,
+            LessonVersion.status == LessonVersionStatus.APPROVED,
+            LessonVersion.id != version.id
+        ).update({LessonVersion.status: LessonVersionStatus.ARCHIVED}, synchronize_session=False)
+        
+        version.status = LessonVersionStatus.APPROVED
+        version.approved_by = approver_id
+        version.approved_at = datetime.utcnow()
+        version.lesson.content = version.content
+        db.commit()
+        db.refresh(version)
+        
+        # Cached lesson-delivery responses were generated from the old content
+        get_response_cache().invalidate_lesson(version.lesson_id)
+        return version
 
+
+class AsyncContentService:
+    """Content operations for async request handlers."""
+    
+    @staticmethod
+    async def get_lesson(db: AsyncSession, lesson_id: int) -> Optional[Lesson]:
+        """Get lesson by ID."""
+        return await db.get(Lesson, lesson_id)
+    
+    @staticmethod
+    async def get_lessons(db: AsyncSession, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+                          include_total: bool = False) -> Page:
+        """Get a page of lessons, oldest first."""
+        result = await db.execute(keyset(select(Lesson), Lesson, cursor, limit))
+        total = await async_approximate_count(db, Lesson) if include_total else None
+        return build_page(result.scalars().all(), limit, total)
+    
+    @staticmethod
+    async def create_lesson(db: AsyncSession, lesson_data: LessonCreate) -> Lesson:
+        """Create a new lesson."""
+        lesson = Lesson(**lesson_data.dict())
+        db.add(lesson)
+        await db.commit()
+        await db.refresh(lesson)
+        return lesson
+    
+    @staticmethod
+    async def get_condition(db: AsyncSession, condition_id: int) -> Optional[Condition]:
+        """Get condition by ID."""
+        return await db.get(Condition, condition_id)
+    
+    @staticmethod
+    async def get_conditions(db: AsyncSession) -> List[Condition]:
+        """Get all conditions."""
+        result = await db.execute(select(Condition).order_by(Condition.id))
+        return list(result.scalars())
+    
+    @staticmethod
+    async def create_condition(db: AsyncSession, condition_data: ConditionCreate) -> Condition:
+        """Create a new condition."""
+        condition = Condition(**condition_data.dict())
+        db.add(condition)
+        await db.commit()
+        await db.refresh(condition)
+        return condition
+    
+    @staticmethod
+    async def create_version(db: AsyncSession, version_data: ContentVersionCreate) -> LessonVersion:
+        """Create a new content version."""
+        version = LessonVersion(**version_data.dict())
+        db.add(version)
+        await db.commit()
+        await db.refresh(version)
+        return version
+    
+    @staticmethod
+    async def get_versions(db: AsyncSession, lesson_id: Optional[int] = None, cursor: Optional[str] = None,
+                           limit: int = DEFAULT_PAGE_SIZE, include_total: bool = False) -> Page:
+        """Get a page of lesson versions, optionally for one lesson."""
+        query = select(LessonVersion)
+        total = None
+        if lesson_id is not None:
+            query = query.where(LessonVersion.lesson_id == lesson_id)
+            # A lesson has few versions, so its exact count is cheap
+            if include_total:
+                total = (await db.execute(
+                    select(func.count()).select_from(LessonVersion).where(LessonVersion.lesson_id == lesson_id)
+                )).scalar()
+        elif include_total:
+            total = await async_approximate_count(db, LessonVersion)
+        result = await db.execute(keyset(query, LessonVersion, cursor, limit))
+        return build_page(result.scalars().all(), limit, total)
+    
+    @staticmethod
+    async def approve_version(db: AsyncSession, version_id: int, approver_id: Optional[int] = None) -> Optional[LessonVersion]:
+        """Approve a lesson version, making it the lesson's current content."""
+        version = await db.get(LessonVersion, version_id)
+        if not version:
+            return None
+        
+        # Archive the previously approved version
+        await db.execute(
+            update(LessonVersion).where(
+                LessonVersion.lesson_id == version.lesson_id,
+                LessonVersion.status == LessonVersionStatus.APPROVED,
+                LessonVersion.id != version.id
+            ).values(status=LessonVersionStatus.ARCHIVED).execution_options(synchronize_session=False)
+        )
+        
+        # Loaded explicitly: lazy relationship loads aren't available on an AsyncSession
+        lesson = await db.get(Lesson, version.lesson_id)
+        version.status = LessonVersionStatus.APPROVED
+        version.approved_by = approver_id
+        version.approved_at = datetime.utcnow()
+        lesson.content = version.content
+        await db.commit()
+        await db.refresh(version)
+        
+        # Cached lesson-delivery responses were generated from the old content
+        get_response_cache().invalidate_lesson(version.lesson_id)
+        return version
@@ -1,66 +1,128 @@
 """CSV importer service."""
 
 import csv
-from typing import List, Dict
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from app.db.models.patient import Patient
 from app.db.models.hospital import Hospital
+from app.db.models.enrollment import EnrollmentSyncLog
 from app.utils.phone_utils import normalize_phone_number
 
+# Rows per committed chunk in bulk mode; keeps multi-row INSERTs well under
+# the PostgreSQL bind-parameter limit.
+BULK_CHUNK_SIZE = 2000
+
+# Rows per batch when streaming an import in a single transaction
+STREAM_BATCH_SIZE = 1000
+
+
+def _iter_chunks(iterable: Iterable, size: int) -> Iterator[List]:
+    """Yield successive lists of at most `size` items."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
 
 class CSVImporterService:
     """Service for importing hospital CSV data with deduplication."""
     
     @staticmethod
-    def import_patients_from_csv(db: Session, hospital_id: int, csv_file_path: str) -> Dict[str, int]:
-        """Import patients from CSV file with deduplication by phone number."""
+    def import_patients_from_csv(
+        db: Session,
+        hospital_id: int,
+        csv_file_path: str,
+        batch_size: int = STREAM_BATCH_SIZE
+    ) -> Dict[str, Any]:
+        """Import patients from CSV file with deduplication by phone number.
+        
+        Rows are streamed in fixed-size batches inserted without building ORM
+        objects, so memory stays flat regardless of file size. The import
+        commits once at the end.
+        """
+        return CSVImporterService._import_chunks(
+            db, hospital_id, csv_file_path, batch_size, commit_each_chunk=False
+        )
+    
+    @staticmethod
+    def import_patients_bulk(
+        db: Session,
+        hospital_id: int,
+        csv_file_path: str,
+        sync_log: Optional[EnrollmentSyncLog] = None,
+        chunk_size: int = BULK_CHUNK_SIZE
+    ) -> Dict[str, Any]:
+        """Import patients in committed chunks, recording progress on sync_log after each one."""
+        return CSVImporterService._import_chunks(
+            db, hospital_id, csv_file_path, chunk_size, sync_log=sync_log, commit_each_chunk=True
+        )
+    
+    @staticmethod
+    def _import_chunks(
+        db: Session,
+        hospital_id: int,
+        csv_file_path: str,
+        chunk_size: int,
+        sync_log: Optional[EnrollmentSyncLog] = None,
+        commit_each_chunk: bool = True
+    ) -> Dict[str, Any]:
+        """Stream the file in chunks, deduplicating each against the file so far and the database."""
         imported_count = 0
         skipped_count = 0
         error_count = 0
+        total_rows = 0
         errors = []
+        # Normalized phones already taken from this file (~100 bytes each, so tens of
+        # MB for a million-row file); repeats are skipped without a database lookup
+        seen_phones = set()
         
         # Expected CSV format: first_name, last_name, phone_number, date_of_birth, language_preference
         
-        with open(csv_file_path, 'r') as file:
+        with open(csv_file_path, 'r', newline='') as file:
             reader = csv.DictReader(file)
-            for row_num, row in enumerate(reader, start=2):  # Start at 2 (1 is header)
-                try:
-                    phone_number = row.get('phone_number', '').strip()
-                    if not phone_number:
-                        error_count += 1
-                        errors.append({"row": row_num, "error": "Missing phone number"})
-                        continue
-                    
-                    # Normalize phone number
-                    normalized_phone = normalize_phone_number(phone_number)
-                    if not normalized_phone:
-                        error_count += 1
-                        errors.append({"row": row_num, "error": "Invalid phone number format"})
-                        continue
-                    
-                    # Check for duplicate phone number
-                    existing_patient = db.query(Patient).filter(
-                        Patient.phone_number == normalized_phone
-                    ).first()
-                    
-                    if existing_patient:
+            for chunk in _iter_chunks(enumerate(reader, start=2), chunk_size):  # Start at 2 (1 is header)
+                total_rows += len(chunk)
+                mappings, chunk_errors, chunk_duplicates = CSVImporterService._normalize_chunk(hospital_id, chunk)
+                error_count += len(chunk_errors)
+                skipped_count += chunk_duplicates
+                if len(errors) < 10:
+                    errors.extend(chunk_errors[:10 - len(errors)])
+                
+                # Phones repeated from an earlier chunk of this file
+                candidates = {}
+                for phone, row in mappings.items():
+                    if phone in seen_phones:
                         skipped_count += 1
-                        continue
-                    
-                    # Create new patient
-                    patient = Patient(
-                        hospital_id=hospital_id,
-                        first_name=row.get('first_name', '').strip(),
-                        last_name=row.get('last_name', '').strip(),
-                        phone_number=normalized_phone,
-                        language_preference=row.get('language_preference', 'en').strip() or 'en'
-                    )
-                    db.add(patient)
-                    imported_count += 1
-                except Exception as e:
-                    error_count += 1
-                    errors.append({"row": row_num, "error": str(e)})
-                    continue
+                    else:
+                        candidates[phone] = row
+                        seen_phones.add(phone)
+                
+                if candidates:
+                    # Single IN (...) lookup for the whole chunk
+                    existing_phones = {
+                        phone for (phone,) in db.query(Patient.phone_number).filter(
+                            Patient.phone_number.in_(list(candidates))
+                        )
+                    }
+                    new_rows = [row for phone, row in candidates.items() if phone not in existing_phones]
+                    inserted = CSVImporterService._insert_patient_rows(db, new_rows)
+                    imported_count += inserted
+                    skipped_count += len(candidates) - inserted
+                
+                if sync_log is not None:
+                    sync_log.total_rows = total_rows
+                    sync_log.imported_count = imported_count
+                    sync_log.skipped_count = skipped_count
+                    sync_log.error_count = error_count
+                    # A new list each chunk: the JSON column only persists reassignments
+                    sync_log.error_details = list(errors)
+                
+                if commit_each_chunk:
+                    db.commit()
         
         db.commit()
         
@@ -68,6 +130,61 @@ class CSVImporterService:
             "imported": imported_count,
             "skipped": skipped_count,
             "errors": error_count,
-            "error_details": errors[:10]  # Limit error details
+            "error_details": errors  # Limited to the first 10
         }
-
+    
+    @staticmethod
+    def _normalize_chunk(
+        hospital_id: int,
+        chunk: List[Tuple[int, Dict[str, str]]]
+    ) -> Tuple[Dict[str, Dict[str, Any]], List[Dict[str, Any]], int]:
+        """Normalize a chunk of CSV rows into patient mappings keyed by phone number."""
+        mappings: Dict[str, Dict[str, Any]] = {}
+        errors = []
+        duplicates = 0
+        
+        for row_num, row in chunk:
+            try:
+                phone_number = (row.get('phone_number') or '').strip()
+                if not phone_number:
+                    errors.append({"row": row_num, "error": "Missing phone number"})
+                    continue
+                
+                normalized_phone = normalize_phone_number(phone_number)
+                if not normalized_phone:
+                    errors.append({"row": row_num, "error": "Invalid phone number format"})
+                    continue
+                
+                if normalized_phone in mappings:
+                    duplicates += 1
+                    continue
+                
+                mappings[normalized_phone] = {
+                    "hospital_id": hospital_id,
+                    "first_name": (row.get('first_name') or '').strip(),
+                    "last_name": (row.get('last_name') or '').strip(),
+                    "phone_number": normalized_phone,
+                    "language_preference": (row.get('language_preference') or '').strip() or 'en',
+                    "is_active": True
+                }
+            except Exception as e:
+                # A malformed row is reported, not fatal to the rest of the file
+                errors.append({"row": row_num, "error": str(e)})
+        
+        return mappings, errors, duplicates
+    
+    @staticmethod
+    def _insert_patient_rows(db: Session, rows: List[Dict[str, Any]]) -> int:
+        """Insert patient rows in one statement, returning the number inserted."""
+        if not rows:
+            return 0
+        
+        if db.get_bind().dialect.name == "postgresql":
+            # Rows inserted concurrently by another import are skipped, not fatal
+            stmt = pg_insert(Patient).values(rows).on_conflict_do_nothing(
+                index_elements=[Patient.phone_number]
+            )
+            return db.execute(stmt).rowcount
+        
+        db.bulk_insert_mappings(Patient, rows)
+        return len(rows)
@@ -0,0 +1,173 @@
+"""Concurrent outbound dialing engine."""
+
+import asyncio
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.models.patient import Patient
+from app.db.models.scheduling import ScheduledCall
+from app.db.models.conversation import CallHistory, ConversationSession, SessionStatus
+from app.services.call_service import CallService
+from app.utils.phone_utils import get_carrier
+
+
+class TelephonyClient(ABC):
+    """Interface for placing outbound calls through a telephony provider."""
+    
+    @abstractmethod
+    async def place_call(self, to_number: str) -> str:
+        """Place a call and return the provider's call SID."""
+
+
+class TwilioTelephonyClient(TelephonyClient):
+    """Twilio-backed telephony client."""
+    
+    def __init__(self):
+        from twilio.rest import Client
+        self.client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
+    
+    async def place_call(self, to_number: str) -> str:
+        """Place a call via the Twilio REST API without blocking the event loop."""
+        call = await asyncio.to_thread(
+            self.client.calls.create,
+            url=f"{settings.APP_URL}/api/v1/ivr/voice",
+            to=to_number,
+            from_=settings.TWILIO_PHONE_NUMBER
+        )
+        return call.sid
+
+
+class FakeTelephonyClient(TelephonyClient):
+    """In-process telephony client for tests and local development."""
+    
+    def __init__(self, latency_seconds: float = 0.0, failing_numbers: Optional[List[str]] = None):
+        self.latency_seconds = latency_seconds
+        self.failing_numbers = set(failing_numbers or [])
+        self.placed_calls: List[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+    
+    async def place_call(self, to_number: str) -> str:
+        """Record the call and return a fake SID."""
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency_seconds)
+            if to_number in self.failing_numbers:
+                raise RuntimeError(f"Call to {to_number} failed")
+            self.placed_calls.append(to_number)
+            return f"FAKE{len(self.placed_calls):08d}"
+        finally:
+            self.in_flight -= 1
+
+
+def get_telephony_client() -> TelephonyClient:
+    """Get the configured telephony client (fake when Twilio is not configured)."""
+    if settings.TWILIO_ACCOUNT_SID and settings.TWILIO_AUTH_TOKEN:
+        return TwilioTelephonyClient()
+    return FakeTelephonyClient()
+
+
+class CarrierRateLimiter:
+    """Spaces call starts per carrier to stay within each carrier's calls-per-second limit."""
+    
+    def __init__(self, rates: Dict[str, float]):
+        self.rates = rates
+        self._next_slot: Dict[str, float] = {}
+    
+    async def acquire(self, carrier: str):
+        """Wait until the next call to `carrier` may start."""
+        rate = self.rates.get(carrier) or self.rates.get("other")
+        if not rate:
+            return
+        
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self._next_slot.get(carrier, now))
+        self._next_slot[carrier] = slot + 1.0 / rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class OutboundDialer:
+    """Places batches of outbound calls concurrently, built around CallService's call records."""
+    
+    def __init__(
+        self,
+        db: Session,
+        client: Optional[TelephonyClient] = None,
+        max_concurrency: Optional[int] = None,
+        carrier_rate_limits: Optional[Dict[str, float]] = None,
+        batch_size: Optional[int] = None
+    ):
+        self.db = db
+        self.call_service = CallService(db)
+        self.client = client or get_telephony_client()
+        self.max_concurrency = max_concurrency or settings.DIALER_MAX_CONCURRENCY
+        # An empty mapping means no carrier limits, not the configured defaults
+        self.rate_limiter = CarrierRateLimiter(
+            settings.DIALER_CARRIER_RATE_LIMITS if carrier_rate_limits is None else carrier_rate_limits
+        )
+        self.batch_size = batch_size or settings.DIALER_BATCH_SIZE
+    
+    async def dial(self, calls: List[Tuple[Patient, Optional[ScheduledCall]]]) -> List[Dict[str, Any]]:
+        """Dial every (patient, scheduled call) pair, committing once per batch."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        results = []
+        
+        for start in range(0, len(calls), self.batch_size):
+            batch = calls[start:start + self.batch_size]
+            records = self.call_service.create_call_records(batch)
+            self.db.commit()
+            
+            outcomes = await asyncio.gather(*(
+                self._place_call(semaphore, patient.phone_number)
+                for patient, _ in batch
+            ))
+            
+            for (patient, scheduled_call), (session, call_history), outcome in zip(batch, records, outcomes):
+                results.append(self._apply_outcome(patient, scheduled_call, session, call_history, outcome))
+            self.db.commit()
+        
+        return results
+    
+    async def _place_call(self, semaphore: asyncio.Semaphore, phone_number: str) -> Dict[str, Any]:
+        """Place one call within the concurrency and carrier rate limits."""
+        async with semaphore:
+            await self.rate_limiter.acquire(get_carrier(phone_number))
+            try:
+                return {"call_sid": await self.client.place_call(phone_number)}
+            except Exception as e:
+                return {"error": str(e)}
+    
+    def _apply_outcome(
+        self,
+        patient: Patient,
+        scheduled_call: Optional[ScheduledCall],
+        session: ConversationSession,
+        call_history: CallHistory,
+        outcome: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Record a call outcome on its rows (committed with the rest of the batch)."""
+        if "error" in outcome:
+            call_history.call_status = "failed"
+            call_history.ended_at = datetime.utcnow()
+            session.status = SessionStatus.ABANDONED
+            session.ended_at = call_history.ended_at
+            if scheduled_call:
+                CallService.mark_call_failed(scheduled_call)
+            return {
+                "status": "failed",
+                "error": outcome["error"],
+                "patient_id": patient.id,
+                "session_id": session.id
+            }
+        
+        call_history.call_sid = outcome["call_sid"]
+        return {
+            "status": "initiated",
+            "call_sid": outcome["call_sid"],
+            "patient_id": patient.id,
+            "session_id": session.id
+        }
@@ -1,5 +1,6 @@
 """Escalation service."""
 
+from contextlib import contextmanager
 from typing import Dict, Any, Optional
 from datetime import datetime
 from sqlalchemy.orm import Session
@@ -14,6 +15,20 @@ class EscalationService:
     def __init__(self, db: Optional[Session] = None):
         self.db = db
     
+    @contextmanager
+    def _session_scope(self):
+        """Use the injected session, or open one for this call and close it afterwards."""
+        if self.db is not None:
+            yield
+            return
+        from app.db.database import SessionLocal
+        self.db = SessionLocal()
+        try:
+            yield
+        finally:
+            self.db.close()
+            self.db = None
+    
     def escalate_to_human(
         self,
         session: ConversationSession,
@@ -21,11 +36,15 @@ class EscalationService:
         details: Optional[Dict[str, Any]] = None
     ) -> EscalationRequest:
         """Escalate conversation to human agent."""
-        if not self.db:
-            # Create new session if not provided
-            from app.db.database import SessionLocal
-            self.db = SessionLocal()
-        
+        with self._session_scope():
+            return self._escalate_to_human(session, reason, details)
+    
+    def _escalate_to_human(
+        self,
+        session: ConversationSession,
+        reason: EscalationReason,
+        details: Optional[Dict[str, Any]]
+    ) -> EscalationRequest:
         # Create escalation request
         escalation = EscalationRequest(
             session_id=session.id,
@@ -0,0 +1,66 @@
+"""Per-session rolling state for escalation decisions."""
+
+from collections import deque
+from typing import Any, Dict, Optional
+
+
+class EscalationTracker:
+    """Running violation count plus the last few input checks for one session.
+    
+    Each turn updates the tracker in O(1), so ``should_escalate`` costs the same
+    however long the session runs. ``to_dict``/``from_dict`` round-trip it through
+    ``ConversationSession.metadata``.
+    """
+    
+    __slots__ = ("violation_count", "recent_checks", "turns_seen")
+    
+    METADATA_KEY = "escalation"
+    RECENT_WINDOW = 3  # Number of recent user inputs checked for emergencies/symptoms
+    VIOLATION_THRESHOLD = 2  # Unsafe assistant responses (one violation each) before a human takes over
+    
+    def __init__(self, violation_count: int = 0, recent_checks=(), turns_seen: int = 0):
+        self.violation_count = violation_count
+        self.recent_checks = deque(recent_checks, maxlen=self.RECENT_WINDOW)
+        self.turns_seen = turns_seen
+    
+    def record_check(self, should_escalate: bool):
+        """Record the result of one user-input safety check."""
+        self.recent_checks.append(bool(should_escalate))
+        self.turns_seen += 1
+    
+    def record_violation(self, count: int = 1):
+        """Record safety violations found in an assistant response."""
+        self.violation_count += count
+    
+    def should_escalate(self) -> bool:
+        """Determine if the session should be escalated to a human."""
+        return self.violation_count >= self.VIOLATION_THRESHOLD or any(self.recent_checks)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for ConversationSession.metadata."""
+        return {
+            "violation_count": self.violation_count,
+            "recent_checks": list(self.recent_checks),
+            "turns_seen": self.turns_seen
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "EscalationTracker":
+        """Restore from ConversationSession.metadata; a missing entry gives a fresh tracker."""
+        if not data:
+            return cls()
+        return cls(
+            violation_count=data.get("violation_count", 0),
+            recent_checks=data.get("recent_checks", ()),
+            turns_seen=data.get("turns_seen", 0)
+        )
+    
+    @classmethod
+    def for_session(cls, session) -> "EscalationTracker":
+        """Load the tracker checkpointed on a ConversationSession."""
+        return cls.from_dict((session.metadata or {}).get(cls.METADATA_KEY))
+    
+    def checkpoint(self, session):
+        """Write the tracker into session.metadata (committed with the caller's transaction)."""
+        # Assign a new dict so the JSON column is flagged as changed
+        session.metadata = {**(session.metadata or {}), self.METADATA_KEY: self.to_dict()}
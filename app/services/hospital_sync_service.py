@@ -0,0 +1,110 @@
+"""Parallel hospital CSV sync orchestration."""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.models.hospital import Hospital
+from app.db.models.enrollment import EnrollmentSyncLog, SyncStatus
+from app.services.csv_importer import CSVImporterService
+
+
+def _mark_failed(db: Session, sync_log: EnrollmentSyncLog, error: str):
+    """Move a sync log to FAILED."""
+    sync_log.status = SyncStatus.FAILED
+    sync_log.completed_at = datetime.utcnow()
+    sync_log.error_details = [{"error": error}]
+    db.commit()
+
+
+def _sync_hospital(sync_log_id: int, csv_file_path: str) -> Dict[str, Any]:
+    """Import one hospital's CSV inside a worker process, with its own DB session."""
+    db = SessionLocal()
+    try:
+        sync_log = db.query(EnrollmentSyncLog).filter(EnrollmentSyncLog.id == sync_log_id).first()
+        sync_log.status = SyncStatus.IN_PROGRESS
+        sync_log.started_at = datetime.utcnow()
+        db.commit()
+        
+        try:
+            result = CSVImporterService.import_patients_bulk(
+                db, sync_log.hospital_id, csv_file_path, sync_log=sync_log
+            )
+        except Exception as e:
+            db.rollback()
+            _mark_failed(db, sync_log, str(e))
+            return {"sync_log_id": sync_log_id, "status": SyncStatus.FAILED.value, "error": str(e)}
+        
+        sync_log.status = SyncStatus.COMPLETED
+        sync_log.completed_at = datetime.utcnow()
+        db.commit()
+        
+        return {"sync_log_id": sync_log_id, "status": SyncStatus.COMPLETED.value, **result}
+    finally:
+        db.close()
+
+
+class HospitalSyncService:
+    """Fans hospital CSV imports out across a process pool, one hospital per task."""
+    
+    def __init__(self, max_workers: Optional[int] = None, sync_dir: Optional[str] = None):
+        self.max_workers = max_workers or settings.HOSPITAL_SYNC_WORKERS
+        self.sync_dir = sync_dir or settings.HOSPITAL_SYNC_DIR
+    
+    def get_csv_path(self, hospital: Hospital, filename: str) -> str:
+        """Get the expected CSV path for a hospital."""
+        return os.path.join(self.sync_dir, hospital.code, filename)
+    
+    def run_weekly_sync(self, db: Session) -> List[Dict[str, Any]]:
+        """Sync every hospital in parallel, tracking each run in an EnrollmentSyncLog."""
+        filename = f"weekly_sync_{datetime.now().strftime('%Y%m%d')}.csv"
+        hospitals = db.query(Hospital).all()
+        
+        sync_logs = []
+        for hospital in hospitals:
+            sync_log = EnrollmentSyncLog(
+                hospital_id=hospital.id,
+                filename=filename,
+                total_rows=0,
+                status=SyncStatus.PENDING
+            )
+            db.add(sync_log)
+            sync_logs.append((sync_log, self.get_csv_path(hospital, filename)))
+        db.commit()
+        
+        results = []
+        jobs = []
+        for sync_log, csv_path in sync_logs:
+            if not os.path.exists(csv_path):
+                _mark_failed(db, sync_log, f"CSV file not found: {csv_path}")
+                results.append({"sync_log_id": sync_log.id, "status": SyncStatus.FAILED.value})
+            else:
+                jobs.append((sync_log, csv_path))
+        
+        if not jobs:
+            return results
+        
+        # Spawned workers avoid inheriting the scheduler's threads and DB connections
+        with ProcessPoolExecutor(
+            max_workers=min(self.max_workers, len(jobs)),
+            mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            futures = {
+                pool.submit(_sync_hospital, sync_log.id, csv_path): sync_log
+                for sync_log, csv_path in jobs
+            }
+            for future in as_completed(futures):
+                sync_log = futures[future]
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    # The worker died before it could record the failure itself
+                    db.refresh(sync_log)
+                    _mark_failed(db, sync_log, str(e))
+                    results.append({"sync_log_id": sync_log.id, "status": SyncStatus.FAILED.value})
+        
+        return results
@@ -1,8 +1,11 @@
 """Patient service."""
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Optional
 from app.db.models.patient import Patient
+from app.db.pagination import DEFAULT_PAGE_SIZE, Page, approximate_count, async_approximate_count, build_page, keyset
 from app.schemas.patient import PatientCreate, PatientUpdate
 
 
@@ -15,9 +18,11 @@ class PatientService:
         return db.query(Patient).filter(Patient.id == patient_id).first()
     
     @staticmethod
-    def get_patients(db: Session, skip: int = 0, limit: int = 100) -> List[Patient]:
-        """Get all patients."""
-        return db.query(Patient).offset(skip).limit(limit).all()
+    def get_patients(db: Session, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+                     include_total: bool = False) -> Page:
+        """Get a page of patients, oldest first."""
+        rows = keyset(db.query(Patient), Patient, cursor, limit).all()
+        return build_page(rows, limit, approximate_count(db, Patient) if include_total else None)
     
     @staticmethod
     def create_patient(db: Session, patient_data: PatientCreate) -> Patient:
@@ -54,3 +59,54 @@ class PatientService:
         db.commit()
         return True
 
+
+class AsyncPatientService:
+    """Patient operations for async request handlers."""
+    
+    @staticmethod
+    async def get_patient(db: AsyncSession, patient_id: int) -> Optional[Patient]:
+        """Get patient by ID."""
+        return await db.get(Patient, patient_id)
+    
+    @staticmethod
+    async def get_patients(db: AsyncSession, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+                           include_total: bool = False) -> Page:
+        """Get a page of patients, oldest first."""
+        result = await db.execute(keyset(select(Patient), Patient, cursor, limit))
+        total = await async_approximate_count(db, Patient) if include_total else None
+        return build_page(result.scalars().all(), limit, total)
+    
+    @staticmethod
+    async def create_patient(db: AsyncSession, patient_data: PatientCreate) -> Patient:
+        """Create a new patient."""
+        patient = Patient(**patient_data.dict())
+        db.add(patient)
+        await db.commit()
+        await db.refresh(patient)
+        return patient
+    
+    @staticmethod
+    async def update_patient(db: AsyncSession, patient_id: int, patient_data: PatientUpdate) -> Optional[Patient]:
+        """Update a patient."""
+        patient = await AsyncPatientService.get_patient(db, patient_id)
+        if not patient:
+            return None
+        
+        update_data = patient_data.dict(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(patient, field, value)
+        
+        await db.commit()
+        await db.refresh(patient)
+        return patient
+    
+    @staticmethod
+    async def delete_patient(db: AsyncSession, patient_id: int) -> bool:
+        """Delete a patient."""
+        patient = await AsyncPatientService.get_patient(db, patient_id)
+        if not patient:
+            return False
+        
+        await db.delete(patient)
+        await db.commit()
+        return True
@@ -0,0 +1,143 @@
+"""Response cache for repeated lesson-delivery LLM prompts."""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from app.core.config import settings
+from app.core.redis_client import get_redis
+from app.workflows.conversation_fsm import ConversationState
+
+# Lesson-delivery states, where many patients send the same prompt (same lesson, same reply)
+CACHEABLE_STATES = frozenset({
+    ConversationState.TOPIC_INTRO,
+    ConversationState.DELIVER_LESSON_INTRO,
+    ConversationState.DELIVER_LESSON_BRIEF,
+})
+
+
+class InMemoryCacheBackend:
+    """Thread-safe LRU cache with per-entry TTL."""
+    
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: str, ttl_seconds: int):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def get_counter(self, key: str) -> int:
+        with self._lock:
+            return self._counters.get(key, 0)
+    
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+
+class RedisCacheBackend:
+    """Redis-backed cache; eviction is left to the server's maxmemory-policy."""
+    
+    def __init__(self, client):
+        self.client = client
+    
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.get(key)
+        return value.decode() if value is not None else None
+    
+    def set(self, key: str, value: str, ttl_seconds: int):
+        self.client.setex(key, ttl_seconds, value)
+    
+    def get_counter(self, key: str) -> int:
+        value = self.client.get(key)
+        return int(value) if value is not None else 0
+    
+    def incr(self, key: str) -> int:
+        return self.client.incr(key)
+
+
+class ResponseCache:
+    """Content-addressed cache of LLM responses for lesson-delivery states.
+    
+    Keys hash the full prompt (which carries the patient's input and history,
+    so a response is only ever reused for an identical prompt), the state,
+    lesson, language and the lesson's generation counter; approving a new
+    LessonVersion bumps the counter, which orphans every cached response for
+    that lesson.
+    """
+    
+    KEY_PREFIX = "carearena:llm"
+    
+    def __init__(self, backend, ttl_seconds: Optional[int] = None):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds or settings.LLM_CACHE_TTL_SECONDS
+    
+    def _generation_key(self, lesson_id: int) -> str:
+        return f"{self.KEY_PREFIX}:lesson_generation:{lesson_id}"
+    
+    def make_key(
+        self,
+        state: Optional[ConversationState],
+        context: Dict[str, Any],
+        language: Optional[str],
+        prompt: str
+    ) -> Optional[str]:
+        """Build the cache key for a prompt, or None if the prompt is not cacheable."""
+        lesson_id = context.get("lesson_id")
+        if state not in CACHEABLE_STATES or lesson_id is None:
+            return None
+        
+        normalized = json.dumps({
+            "state": state.value,
+            "lesson_id": lesson_id,
+            "language": (language or "en").lower(),
+            "generation": self.backend.get_counter(self._generation_key(lesson_id)),
+            "prompt": hashlib.sha256(prompt.encode()).hexdigest(),
+        }, sort_keys=True, separators=(",", ":"))
+        return f"{self.KEY_PREFIX}:response:{hashlib.sha256(normalized.encode()).hexdigest()}"
+    
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response."""
+        return self.backend.get(key)
+    
+    def set(self, key: str, response: str):
+        """Cache a response."""
+        self.backend.set(key, response, self.ttl_seconds)
+    
+    def invalidate_lesson(self, lesson_id: int):
+        """Invalidate every cached response for a lesson."""
+        self.backend.incr(self._generation_key(lesson_id))
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the process-wide response cache (Redis-backed when REDIS_URL is configured)."""
+    global _cache
+    if _cache is None:
+        client = get_redis()
+        backend = RedisCacheBackend(client) if client is not None else InMemoryCacheBackend(settings.LLM_CACHE_MAX_ENTRIES)
+        _cache = ResponseCache(backend)
+    return _cache
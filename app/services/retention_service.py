@@ -0,0 +1,146 @@
+"""Retention cleanup for conversation audio, transcripts and whole monthly partitions."""
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.models.conversation import ConversationTurn
+from app.db.models.safety import AIResponseLog
+from app.db.partitioning import add_months, month_start, retire_partitions
+from app.services.storage import LocalFileStorage
+from app.services.tts_cache import TTSAssetCache
+
+
+class RetentionService:
+    """Retires expired monthly partitions and clears expired turn audio and transcripts.
+    
+    Turns and AI response logs past their retention are removed a whole month
+    partition at a time (PostgreSQL). Audio and transcripts expire much sooner
+    than the rows holding them, so they are cleared in keyset-paginated chunks.
+    Each chunk is a range of turn ids: the referenced files are deleted first,
+    then one ``UPDATE ... WHERE id BETWEEN`` clears the columns and commits, so
+    memory and lock time stay bounded however large the table grows. Rows that
+    were already cleared are never selected again.
+    """
+    
+    def __init__(
+        self,
+        db: Session,
+        storage: Optional[LocalFileStorage] = None,
+        audio_retention_days: Optional[int] = None,
+        transcript_retention_days: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        delete_workers: Optional[int] = None,
+        turn_retention_months: Optional[int] = None,
+        ai_log_retention_months: Optional[int] = None,
+        detach_only: Optional[bool] = None
+    ):
+        self.db = db
+        self.storage = storage or LocalFileStorage()
+        self.audio_retention_days = audio_retention_days or settings.AUDIO_RETENTION_DAYS
+        self.transcript_retention_days = transcript_retention_days or settings.TRANSCRIPT_RETENTION_DAYS
+        self.chunk_size = chunk_size or settings.RETENTION_CHUNK_SIZE
+        self.delete_workers = delete_workers or settings.RETENTION_DELETE_WORKERS
+        self.turn_retention_months = turn_retention_months or settings.CONVERSATION_TURN_RETENTION_MONTHS
+        self.ai_log_retention_months = ai_log_retention_months or settings.AI_RESPONSE_LOG_RETENTION_MONTHS
+        self.detach_only = settings.PARTITION_DETACH_ONLY if detach_only is None else detach_only
+    
+    def run(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Apply every retention window and return what was cleared."""
+        now = now or datetime.utcnow()
+        partitions = self.retire_partitions(now)
+        audio = self.purge_audio(now - timedelta(days=self.audio_retention_days))
+        transcripts = self.purge_transcripts(now - timedelta(days=self.transcript_retention_days))
+        return {**partitions, **audio, "transcript_turns": transcripts}
+    
+    def retire_partitions(self, now: datetime) -> Dict[str, int]:
+        """Drop (or detach) the monthly partitions wholly older than each table's retention."""
+        connection = self.db.connection()
+        current = month_start(now)
+        retired = {
+            "turn_partitions": len(retire_partitions(
+                connection, ConversationTurn.__tablename__,
+                add_months(current, -self.turn_retention_months), self.detach_only
+            )),
+            "ai_log_partitions": len(retire_partitions(
+                connection, AIResponseLog.__tablename__,
+                add_months(current, -self.ai_log_retention_months), self.detach_only
+            )),
+        }
+        self.db.commit()
+        return retired
+    
+    def _is_deletable(self, key: str) -> bool:
+        # TTS cache files are shared across turns and evicted by the cache itself;
+        # provider-hosted recordings (full URLs) are not in our storage
+        return bool(key) and "://" not in key and not key.startswith(f"{TTSAssetCache.PREFIX}/")
+    
+    def purge_audio(self, cutoff: datetime) -> Dict[str, int]:
+        """Delete audio files for turns older than cutoff and clear their URLs."""
+        has_audio = or_(ConversationTurn.audio_url.isnot(None), ConversationTurn.tts_audio_url.isnot(None))
+        turns_cleared = 0
+        files_deleted = 0
+        last_id = 0
+        
+        while True:
+            rows = self.db.query(
+                ConversationTurn.id, ConversationTurn.audio_url, ConversationTurn.tts_audio_url
+            ).filter(
+                ConversationTurn.id > last_id,
+                ConversationTurn.created_at < cutoff,
+                has_audio
+            ).order_by(ConversationTurn.id).limit(self.chunk_size).all()
+            if not rows:
+                break
+            
+            keys = [key for _, audio_url, tts_audio_url in rows for key in (audio_url, tts_audio_url)
+                    if self._is_deletable(key)]
+            # Files go first: if the UPDATE fails, the next run retries the (now missing) files
+            files_deleted += self.storage.delete_many(keys, max_workers=self.delete_workers)
+            
+            first_id, last_id = rows[0].id, rows[-1].id
+            result = self.db.execute(
+                update(ConversationTurn).where(
+                    ConversationTurn.id.between(first_id, last_id),
+                    ConversationTurn.created_at < cutoff,
+                    has_audio
+                ).values(audio_url=None, tts_audio_url=None).execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+            turns_cleared += result.rowcount
+            
+            if len(rows) < self.chunk_size:
+                break
+        
+        return {"audio_turns": turns_cleared, "files_deleted": files_deleted}
+    
+    def purge_transcripts(self, cutoff: datetime) -> int:
+        """Clear ASR transcripts on turns older than cutoff."""
+        turns_cleared = 0
+        last_id = 0
+        
+        while True:
+            ids: List[int] = [turn_id for (turn_id,) in self.db.query(ConversationTurn.id).filter(
+                ConversationTurn.id > last_id,
+                ConversationTurn.created_at < cutoff,
+                ConversationTurn.asr_transcript.isnot(None)
+            ).order_by(ConversationTurn.id).limit(self.chunk_size)]
+            if not ids:
+                break
+            
+            last_id = ids[-1]
+            result = self.db.execute(
+                update(ConversationTurn).where(
+                    ConversationTurn.id.between(ids[0], last_id),
+                    ConversationTurn.created_at < cutoff,
+                    ConversationTurn.asr_transcript.isnot(None)
+                ).values(asr_transcript=None).execution_options(synchronize_session=False)
+            )
+            self.db.commit()
+            turns_cleared += result.rowcount
+            
+            if len(ids) < self.chunk_size:
+                break
+        
+        return turns_cleared
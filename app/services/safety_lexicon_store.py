@@ -0,0 +1,134 @@
+"""Versioned, per-language safety lexicons with hot reload."""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Optional
+import app
+from app.core.config import settings
+from app.services.safety_matcher import SafetyMatcher
+
+# Resolved from the package, not the working directory
+SHIPPED_LEXICON_PATH = str(Path(app.__file__).resolve().parent / "data" / "safety_lexicons.json")
+
+DEFAULT_LANGUAGE = "en"
+CATEGORIES = ("diagnosis", "medical_advice", "symptoms", "emergency")
+
+
+class LexiconSnapshot(NamedTuple):
+    """One compiled version of the lexicon file; never mutated once built."""
+    version: int
+    mtime: float
+    matchers: Mapping[str, SafetyMatcher]
+
+
+def load_lexicons(path: str) -> Dict:
+    """Read the lexicon file and resolve each language's ``extends`` chain.
+    
+    Returns ``{"version": int, "languages": {language: {category: [terms]}}}``.
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    
+    raw_languages = data["languages"]
+    if DEFAULT_LANGUAGE not in raw_languages:
+        raise ValueError(f"Lexicon file {path} has no '{DEFAULT_LANGUAGE}' section")
+    
+    def resolve(language: str, seen: tuple) -> Dict[str, List[str]]:
+        if language in seen:
+            raise ValueError(f"Lexicon 'extends' cycle: {' -> '.join(seen + (language,))}")
+        entry = raw_languages[language]
+        base = resolve(entry["extends"], seen + (language,)) if entry.get("extends") else {}
+        return {
+            category: list(dict.fromkeys(base.get(category, []) + list(entry.get(category, []))))
+            for category in CATEGORIES
+        }
+    
+    return {
+        "version": int(data["version"]),
+        "languages": {language: resolve(language, ()) for language in raw_languages},
+    }
+
+
+def compile_snapshot(path: str) -> LexiconSnapshot:
+    """Load the lexicon file and compile one matcher per language."""
+    mtime = os.stat(path).st_mtime
+    lexicons = load_lexicons(path)
+    matchers = {
+        language: SafetyMatcher(categories)
+        for language, categories in lexicons["languages"].items()
+    }
+    return LexiconSnapshot(lexicons["version"], mtime, MappingProxyType(matchers))
+
+
+class LexiconStore:
+    """Serves the current compiled lexicons and swaps in new versions as the file changes.
+    
+    Readers only ever see a complete snapshot: a reload compiles everything first and
+    then replaces the snapshot reference in one assignment. A reload that fails keeps
+    serving the previous snapshot.
+    """
+    
+    def __init__(self, path: str, reload_seconds: float = 30.0):
+        self.path = path
+        self.reload_seconds = reload_seconds
+        self._lock = threading.Lock()
+        self._snapshot = compile_snapshot(path)  # A broken file at startup should fail loudly
+        self._last_checked = time.monotonic()
+        self._failed_mtime: Optional[float] = None
+    
+    def snapshot(self) -> LexiconSnapshot:
+        """Get the current snapshot, reloading first if the file has changed."""
+        if time.monotonic() - self._last_checked >= self.reload_seconds:
+            self.reload_if_changed()
+        return self._snapshot
+    
+    def get_matcher(self, language: Optional[str] = None) -> SafetyMatcher:
+        """Get the matcher for a language, falling back to English."""
+        matchers = self.snapshot().matchers
+        return matchers.get(language or DEFAULT_LANGUAGE) or matchers[DEFAULT_LANGUAGE]
+    
+    def reload_if_changed(self) -> bool:
+        """Recompile if the file's mtime moved; returns True if a new snapshot was swapped in."""
+        # Only one thread pays the compile cost; the rest keep using the current snapshot
+        if not self._lock.acquire(blocking=False):
+            return False
+        try:
+            self._last_checked = time.monotonic()
+            try:
+                mtime = os.stat(self.path).st_mtime
+            except OSError as e:
+                print(f"Error reading safety lexicons at {self.path}: {e}")
+                return False
+            if mtime in (self._snapshot.mtime, self._failed_mtime):
+                return False
+            try:
+                self._snapshot = compile_snapshot(self.path)
+                return True
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                # Don't retry the same broken file until it is edited again
+                self._failed_mtime = mtime
+                print(f"Error reloading safety lexicons from {self.path}: {e}")
+                return False
+        finally:
+            self._lock.release()
+
+
+_store: Optional[LexiconStore] = None
+_store_lock = threading.Lock()
+
+
+def get_lexicon_store() -> LexiconStore:
+    """Get the process-wide lexicon store, loading it on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = LexiconStore(
+                    settings.SAFETY_LEXICON_PATH or SHIPPED_LEXICON_PATH,
+                    settings.SAFETY_LEXICON_RELOAD_SECONDS
+                )
+    return _store
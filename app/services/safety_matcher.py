@@ -0,0 +1,121 @@
+"""Compiled multi-pattern keyword matcher for safety checks."""
+
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Set, Tuple
+
+
+class SafetyMatch(NamedTuple):
+    """One keyword hit, with character offsets into the scanned text."""
+    category: str
+    term: str
+    start: int
+    end: int
+
+
+# Inflectional endings accepted after a keyword, so "pain" also matches "pains"
+INFLECTIONS = ("ing", "es", "ed", "s")
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def _word_end(text: str, end: int, term: str) -> int:
+    """End of the word a keyword hit ending at end belongs to, or -1 if it is not a whole word."""
+    if end == len(text) or not _is_word_char(text[end]) or not _is_word_char(term[-1]):
+        return end
+    suffixes = INFLECTIONS + ("d",) if term.endswith("e") else INFLECTIONS
+    for suffix in suffixes:
+        stop = end + len(suffix)
+        if text.startswith(suffix, end) and (stop == len(text) or not _is_word_char(text[stop])):
+            return stop
+    return -1
+
+
+def _fold(text: str) -> Tuple[str, List[int]]:
+    """Casefold text, mapping each folded character back to its index in text."""
+    folded = []
+    origin = []
+    for index, char in enumerate(text):
+        for folded_char in char.casefold():
+            folded.append(folded_char)
+            origin.append(index)
+    return "".join(folded), origin
+
+
+class SafetyMatcher:
+    """Aho-Corasick automaton over every category's keywords.
+    
+    The automaton is built once; ``scan`` then finds all (possibly overlapping)
+    whole-word keyword hits of every category in a single pass over the text,
+    so the cost per message does not grow with the size of the lexicons.
+    """
+    
+    __slots__ = ("_goto", "_fail", "_output")
+    
+    def __init__(self, lexicons: Dict[str, Iterable[str]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._output: List[List[Tuple[str, FrozenSet[str]]]] = [[]]
+        
+        categories_by_term: Dict[str, Set[str]] = {}
+        for category, terms in lexicons.items():
+            for term in terms:
+                normalized = term.casefold().strip()
+                if normalized:
+                    categories_by_term.setdefault(normalized, set()).add(category)
+        
+        for term, categories in categories_by_term.items():
+            node = 0
+            for char in term:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._output.append([])
+                node = next_node
+            self._output[node].append((term, frozenset(categories)))
+        
+        # Breadth-first failure links; each node inherits its fallback's outputs
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                if node:
+                    fallback = self._fail[node]
+                    while fallback and char not in self._goto[fallback]:
+                        fallback = self._fail[fallback]
+                    self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+    
+    def scan(self, text: str) -> List[SafetyMatch]:
+        """Find every whole-word keyword hit in text, in order of end offset.
+        
+        Offsets index the original text. A hit may carry an inflectional
+        ending ("chest pains", "fevers"), which its span then includes.
+        """
+        folded, origin = _fold(text)
+        matches = []
+        node = 0
+        for index, char in enumerate(folded):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            
+            for term, categories in self._output[node]:
+                start = index - len(term) + 1
+                # Whole words only, so "paint" does not match "pain"
+                if start > 0 and _is_word_char(folded[start - 1]) and _is_word_char(term[0]):
+                    continue
+                end = _word_end(folded, index + 1, term)
+                if end < 0:
+                    continue
+                for category in categories:
+                    matches.append(SafetyMatch(category, term, origin[start], origin[end - 1] + 1))
+        return matches
+    
+    def categories(self, text: str) -> Set[str]:
+        """Get the set of categories with at least one hit in text."""
+        return {match.category for match in self.scan(text)}
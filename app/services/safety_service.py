@@ -3,137 +3,177 @@
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 from sqlalchemy.orm import Session
-from app.db.models.safety import AIResponseLog, EscalationRequest, EscalationReason
-from app.db.models.conversation import ConversationSession, ConversationTurn
+from app.db.models.safety import AIResponseLog, AuditLog, EscalationRequest, EscalationReason
+from app.db.models.conversation import ConversationSession
+from app.services.escalation_tracker import EscalationTracker
+from app.services.safety_lexicon_store import LexiconStore, get_lexicon_store
+from app.services.safety_matcher import SafetyMatch, SafetyMatcher
 
 
 class SafetyService:
     """Service for medical safety guardrails."""
     
-    # Safety violation keywords
-    DIAGNOSIS_KEYWORDS = [
-        "diagnose", "diagnosis", "you have", "you've got", "you're suffering from",
-        "you're sick with", "you're infected with"
-    ]
+    def __init__(self, db: Session, language: Optional[str] = None,
+                 lexicon_store: Optional[LexiconStore] = None):
+        self.db = db
+        self.language = language
+        self.lexicon_store = lexicon_store or get_lexicon_store()
+        self._pending_events: List[Any] = []
+        self._trackers: Dict[int, EscalationTracker] = {}  # session id -> rolling escalation state
     
-    MEDICAL_ADVICE_KEYWORDS = [
-        "you should take", "you need to", "prescribe", "medication", "treatment",
-        "you must", "you have to"
-    ]
+    def get_matcher(self, language: Optional[str] = None) -> SafetyMatcher:
+        """Get the compiled matcher for a language (defaults to this service's language)."""
+        return self.lexicon_store.get_matcher(language or self.language)
     
-    SYMPTOM_KEYWORDS = [
-        "pain", "ache", "bleeding", "fever", "nausea", "vomiting", "dizziness",
-        "shortness of breath", "chest pain", "headache", "cramps"
-    ]
+    def get_tracker(self, session: ConversationSession) -> EscalationTracker:
+        """Get the escalation tracker for a session, restoring its last checkpoint on first use."""
+        tracker = self._trackers.get(session.id)
+        if tracker is None:
+            tracker = EscalationTracker.for_session(session)
+            self._trackers[session.id] = tracker
+        return tracker
     
-    EMERGENCY_KEYWORDS = [
-        "emergency", "urgent", "severe pain", "can't breathe", "unconscious",
-        "chest pain", "heart attack", "stroke", "bleeding heavily"
-    ]
+    def checkpoint(self, session: ConversationSession):
+        """Persist the session's escalation tracker to its metadata (caller commits)."""
+        tracker = self._trackers.get(session.id)
+        if tracker is not None:
+            tracker.checkpoint(session)
     
-    def __init__(self, db: Session):
-        self.db = db
+    @staticmethod
+    def _matches_for(matches: List[SafetyMatch], category: str) -> List[Dict[str, Any]]:
+        """Serialize one category's matches for audit details."""
+        return [
+            {"term": match.term, "start": match.start, "end": match.end}
+            for match in matches if match.category == category
+        ]
     
-    def check_input(self, user_input: str) -> Dict[str, Any]:
-        """Check user input for safety violations."""
-        input_lower = user_input.lower()
+    def check_input(self, user_input: str, language: Optional[str] = None,
+                    session: Optional[ConversationSession] = None) -> Dict[str, Any]:
+        """Check user input for safety violations.
+        
+        When a session is given, the result is also recorded on its escalation tracker.
+        """
+        matches = self.get_matcher(language).scan(user_input)
+        categories = {match.category for match in matches}
+        if session is not None:
+            self.get_tracker(session).record_check(bool(categories & {"emergency", "symptoms"}))
         
         # Check for emergency
-        is_emergency = any(keyword in input_lower for keyword in self.EMERGENCY_KEYWORDS)
-        if is_emergency:
+        if "emergency" in categories:
             return {
                 "should_escalate": True,
                 "reason": EscalationReason.EMERGENCY,
                 "violation_type": "emergency",
-                "severity": "critical"
+                "severity": "critical",
+                "matches": self._matches_for(matches, "emergency")
             }
         
         # Check for symptoms mentioned
-        has_symptoms = any(keyword in input_lower for keyword in self.SYMPTOM_KEYWORDS)
-        if has_symptoms:
+        if "symptoms" in categories:
             return {
                 "should_escalate": True,
                 "reason": EscalationReason.SYMPTOMS_MENTIONED,
                 "violation_type": "symptoms",
-                "severity": "high"
+                "severity": "high",
+                "matches": self._matches_for(matches, "symptoms")
             }
         
         return {
             "should_escalate": False,
             "reason": None,
             "violation_type": None,
-            "severity": "low"
+            "severity": "low",
+            "matches": []
         }
     
-    def validate_llm_response(self, response: str, session: ConversationSession) -> Dict[str, Any]:
-        """Validate LLM response for safety violations."""
-        response_lower = response.lower()
+    def validate_llm_response(self, response: str, session: ConversationSession,
+                              flush: bool = True) -> Dict[str, Any]:
+        """Validate LLM response for safety violations.
+        
+        Safety events are written together in one commit; pass ``flush=False`` to
+        leave them buffered for the caller's own transaction (see ``flush_events``).
+        """
+        matches = self.get_matcher().scan(response)
+        categories = {match.category for match in matches}
         violations = []
         
         # Rule 1: No diagnosis allowed
-        if any(keyword in response_lower for keyword in self.DIAGNOSIS_KEYWORDS):
+        if "diagnosis" in categories:
+            diagnosis_matches = self._matches_for(matches, "diagnosis")
             violations.append({
                 "type": "diagnosis",
                 "severity": "critical",
-                "message": "LLM attempted to provide diagnosis"
+                "message": "LLM attempted to provide diagnosis",
+                "matches": diagnosis_matches
             })
-            self.log_safety_event(session, "diagnosis_attempted", response)
+            self.log_safety_event(session, "diagnosis_attempted", response, diagnosis_matches)
         
         # Rule 2: No medical advice
-        if any(keyword in response_lower for keyword in self.MEDICAL_ADVICE_KEYWORDS):
+        if "medical_advice" in categories:
+            advice_matches = self._matches_for(matches, "medical_advice")
             violations.append({
                 "type": "medical_advice",
                 "severity": "high",
-                "message": "LLM attempted to provide medical advice"
+                "message": "LLM attempted to provide medical advice",
+                "matches": advice_matches
             })
-            self.log_safety_event(session, "medical_advice_attempted", response)
+            self.log_safety_event(session, "medical_advice_attempted", response, advice_matches)
         
         # Rule 3: Check for symptom mentions (should redirect)
-        if any(keyword in response_lower for keyword in self.SYMPTOM_KEYWORDS):
+        if "symptoms" in categories:
             violations.append({
                 "type": "symptom_handling",
                 "severity": "medium",
-                "message": "Response mentions symptoms - should redirect"
+                "message": "Response mentions symptoms - should redirect",
+                "matches": self._matches_for(matches, "symptoms")
             })
         
+        # One unsafe response counts as one violation however many rules it breaks,
+        # so a single turn cannot reach the escalation threshold on its own
+        if "diagnosis" in categories or "medical_advice" in categories:
+            self.get_tracker(session).record_violation()
+        
+        if flush:
+            self.flush_events()
+        
         return {
             "is_valid": len(violations) == 0,
             "violations": violations,
             "should_redirect": len(violations) > 0
         }
     
-    def log_safety_event(self, session: ConversationSession, event_type: str, details: str):
-        """Log safety violation event."""
-        from app.db.models.audit import AuditLog
-        
+    def log_safety_event(self, session: ConversationSession, event_type: str, details: str,
+                         matches: Optional[List[Dict[str, Any]]] = None):
+        """Buffer a safety violation event until the next ``flush_events``."""
         audit_log = AuditLog(
             action=f"safety_violation_{event_type}",
             entity_type="conversation_session",
             entity_id=session.id,
-            details={"event_type": event_type, "details": details},
+            details={
+                "event_type": event_type,
+                "details": details,
+                "matches": matches or [],
+                "lexicon_version": self.lexicon_store.snapshot().version
+            },
             timestamp=datetime.utcnow()
         )
-        self.db.add(audit_log)
-        self.db.commit()
+        self._pending_events.append(audit_log)
+    
+    def flush_events(self, commit: bool = True) -> int:
+        """Write buffered safety events; with ``commit=False`` they join the caller's transaction."""
+        if not self._pending_events:
+            return 0
+        count = len(self._pending_events)
+        self.db.add_all(self._pending_events)
+        self._pending_events = []
+        if commit:
+            self.db.commit()
+        return count
     
-    def should_escalate(self, conversation_history: List[ConversationTurn]) -> bool:
+    def should_escalate(self, session: ConversationSession) -> bool:
         """Determine if conversation should be escalated to human."""
-        # Escalate if multiple safety violations
-        violation_count = sum(1 for turn in conversation_history 
-                           if turn.metadata and turn.metadata.get("safety_violation"))
-        
-        if violation_count >= 2:
-            return True
-        
-        # Escalate if emergency keywords detected
-        recent_turns = conversation_history[-3:] if len(conversation_history) >= 3 else conversation_history
-        for turn in recent_turns:
-            if turn.user_input:
-                check = self.check_input(turn.user_input)
-                if check["should_escalate"]:
-                    return True
-        
-        return False
+        # Multiple safety violations, or an emergency/symptom in the last few user inputs
+        return self.get_tracker(session).should_escalate()
     
     def create_escalation_request(self, session: ConversationSession, reason: EscalationReason, 
                                   description: Optional[str] = None) -> EscalationRequest:
@@ -1,42 +1,54 @@
 """Scheduler service with APScheduler jobs."""
 
-from datetime import datetime, time as dt_time
-from typing import List, Optional
-from sqlalchemy.orm import Session
+import asyncio
+from collections import defaultdict
+from datetime import datetime, time as dt_time, timedelta
+from typing import Dict, Iterator, List, Optional
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, joinedload
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.date import DateTrigger
+from app.core.config import settings
+from app.db import partitioning
 from app.db.database import SessionLocal
 from app.db.models.scheduling import ScheduledCall, CallStatus
 from app.db.models.patient import Patient
 from app.db.models.schedule_preference import SchedulePreference
-from app.db.models.hospital import Hospital
-from app.db.models.enrollment import EnrollmentSyncLog, SyncStatus
-from app.services.call_service import CallService
-from app.services.csv_importer import CSVImporterService
+from app.services.ai_service import AIService
+from app.services.dialer_service import OutboundDialer
+from app.services.hospital_sync_service import HospitalSyncService
+from app.services.retention_service import RetentionService
+from app.workflows.call_flow import fixed_prompt_renderings
 from app.workflows.sms_flow import SMSFlow
 from app.workflows.whatsapp_flow import WhatsAppFlow
 from app.db.models.conversation import ConversationSession, SessionStatus
 import pytz
 
+# Failed calls claimed per retry batch
+RETRY_BATCH_SIZE = 500
+
 
 class SchedulerService:
     """Service for scheduling jobs with APScheduler."""
     
     def __init__(self):
+        # Last minute whose daily content has been sent (UTC, truncated to the minute)
+        self.content_watermark: Optional[datetime] = None
         self.scheduler = BackgroundScheduler()
         self.scheduler.start()
-        self.call_service = CallService()
     
     def setup_jobs(self):
         """Setup all scheduled jobs."""
-        # Daily content delivery at preferred times
+        # Content delivery at preferred times (ticks every minute)
         self.scheduler.add_job(
             self.send_daily_content,
-            trigger=CronTrigger(hour=8, minute=0),  # 8 AM daily
+            trigger=CronTrigger(minute='*'),
             id='daily_content_delivery',
             name='Send daily content at preferred times',
-            replace_existing=True
+            replace_existing=True,
+            coalesce=True,
+            max_instances=1
         )
         
         # Weekly hospital sync
@@ -57,6 +69,15 @@ class SchedulerService:
             replace_existing=True
         )
         
+        # Pre-render fixed prompt audio ahead of the morning call wave - daily at 5 AM
+        self.scheduler.add_job(
+            self.prewarm_tts_cache,
+            trigger=CronTrigger(hour=5, minute=0),
+            id='prewarm_tts_cache',
+            name='Pre-render fixed prompt audio',
+            replace_existing=True
+        )
+        
         # Cleanup job (delete expired audio/transcripts) - daily at 3 AM
         self.scheduler.add_job(
             self.cleanup_expired_assets,
@@ -65,60 +86,90 @@ class SchedulerService:
             name='Cleanup expired audio/transcripts',
             replace_existing=True
         )
+        
+        # Keep monthly partitions created ahead of inserts - daily at 1 AM, and once at startup
+        self.scheduler.add_job(
+            self.ensure_partitions,
+            trigger=CronTrigger(hour=1, minute=0),
+            id='ensure_partitions',
+            name='Create upcoming monthly partitions',
+            replace_existing=True,
+            next_run_time=datetime.now()
+        )
     
-    def send_daily_content(self):
-        """Send content at patient's preferred time."""
-        db = SessionLocal()
-        try:
-            # Get all active patients with schedule preferences
-            preferences = db.query(SchedulePreference).filter(
-                SchedulePreference.is_active == True
-            ).all()
-            
-            current_time = datetime.now(pytz.timezone('Africa/Accra'))
-            current_hour = current_time.hour
-            current_minute = current_time.minute
-            
-            for preference in preferences:
-                if not preference.preferred_time:
-                    continue
-                
-                # Check if it's the preferred time
-                pref_hour = preference.preferred_time.hour
-                pref_minute = preference.preferred_time.minute
-                
-                if current_hour == pref_hour and current_minute == pref_minute:
-                    # Send content based on channel preference
-                    if preference.channel_preference == "ivr":
-                        self._schedule_ivr_call(db, preference.patient_id)
-                    elif preference.channel_preference == "sms":
-                        self._send_sms_content(db, preference.patient_id)
-                    elif preference.channel_preference == "whatsapp":
-                        self._send_whatsapp_content(db, preference.patient_id)
-        finally:
-            db.close()
+    def send_daily_content(self, now: Optional[datetime] = None):
+        """Send content to patients whose preferred time fell in any minute since the last run.
+        
+        A tick that was coalesced, skipped (max_instances) or ran late leaves
+        minutes behind the watermark; they are sent now, at most
+        CONTENT_CATCHUP_MINUTES back, each minute exactly once.
+        """
+        now = (now or datetime.now(pytz.utc)).replace(second=0, microsecond=0)
+        for minute in self._content_minutes_due(now):
+            db = SessionLocal()
+            try:
+                self._send_content_for_minute(db, minute)
+            finally:
+                db.close()
+            self.content_watermark = minute
+    
+    def _content_minutes_due(self, now: datetime) -> Iterator[datetime]:
+        """Minutes after the watermark up to and including now (just now on the first run)."""
+        start = now if self.content_watermark is None else self.content_watermark + timedelta(minutes=1)
+        minute = max(start, now - timedelta(minutes=settings.CONTENT_CATCHUP_MINUTES))
+        while minute <= now:
+            yield minute
+            minute += timedelta(minutes=1)
+    
+    def _send_content_for_minute(self, db: Session, minute: datetime):
+        """Send content to patients whose preferred time falls in the minute starting at `minute`."""
+        preferences = self._get_due_preferences(db, minute)
+        
+        ivr_patient_ids = []
+        for preference in preferences:
+            # Send content based on channel preference
+            if preference.channel_preference == "ivr":
+                ivr_patient_ids.append(preference.patient_id)
+            elif preference.channel_preference == "sms":
+                self._send_sms_content(db, preference.patient_id)
+            elif preference.channel_preference == "whatsapp":
+                self._send_whatsapp_content(db, preference.patient_id)
+        
+        if ivr_patient_ids:
+            self._schedule_ivr_calls(db, ivr_patient_ids)
+    
+    @staticmethod
+    def _get_due_preferences(db: Session, now: datetime) -> List[SchedulePreference]:
+        """Get active preferences whose local preferred time is in the minute starting at `now`."""
+        # Timezones sharing a local wall-clock minute are grouped so each group is a
+        # single range scan on the (is_active, preferred_time, timezone) index.
+        zones_by_minute: Dict[dt_time, List[str]] = defaultdict(list)
+        for zone_name in pytz.all_timezones:
+            local_now = now.astimezone(pytz.timezone(zone_name))
+            zones_by_minute[dt_time(local_now.hour, local_now.minute)].append(zone_name)
+        
+        window_clauses = []
+        for minute_start, zone_names in zones_by_minute.items():
+            minute_end = minute_start.replace(second=59, microsecond=999999)
+            zone_clause = SchedulePreference.timezone.in_(zone_names)
+            if 'Africa/Accra' in zone_names:  # column default
+                zone_clause = or_(zone_clause, SchedulePreference.timezone.is_(None))
+            window_clauses.append(and_(
+                SchedulePreference.preferred_time >= minute_start,
+                SchedulePreference.preferred_time <= minute_end,
+                zone_clause
+            ))
+        
+        return db.query(SchedulePreference).filter(
+            SchedulePreference.is_active == True,
+            or_(*window_clauses)
+        ).all()
     
     def weekly_hospital_sync(self):
         """Weekly hospital CSV sync."""
         db = SessionLocal()
         try:
-            hospitals = db.query(Hospital).all()
-            
-            for hospital in hospitals:
-                # TODO: Fetch CSV from hospital's endpoint or file system
-                # For now, create a sync log entry
-                sync_log = EnrollmentSyncLog(
-                    hospital_id=hospital.id,
-                    filename=f"weekly_sync_{datetime.now().strftime('%Y%m%d')}.csv",
-                    total_rows=0,
-                    status=SyncStatus.PENDING
-                )
-                db.add(sync_log)
-                db.commit()
-                
-                # TODO: Process CSV import
-                # importer = CSVImporterService()
-                # result = importer.import_patients_from_csv(db, hospital.id, csv_path)
+            HospitalSyncService().run_weekly_sync(db)
         finally:
             db.close()
     
@@ -126,29 +177,57 @@ class SchedulerService:
         """Retry missed calls with exponential backoff."""
         db = SessionLocal()
         try:
-            # Get failed calls that haven't exceeded max retries
-            failed_calls = db.query(ScheduledCall).filter(
-                ScheduledCall.status == CallStatus.FAILED,
-                ScheduledCall.retry_count < ScheduledCall.max_retries
-            ).all()
-            
-            for call in failed_calls:
-                # Check if enough time has passed since last attempt
-                time_since_last = datetime.utcnow() - call.updated_at
-                hours_since = time_since_last.total_seconds() / 3600
+            dialer = OutboundDialer(db)
+            while True:
+                claimed_calls = self._claim_retry_batch(db, RETRY_BATCH_SIZE)
+                if claimed_calls:
+                    asyncio.run(dialer.dial([(call.patient, call) for call in claimed_calls]))
                 
-                # Exponential backoff: 1h, 2h, 4h
-                required_hours = 2 ** call.retry_count
-                
-                if hours_since >= required_hours:
-                    # Retry the call
-                    call.retry_count += 1
-                    call.status = CallStatus.SCHEDULED
-                    call.scheduled_time = datetime.utcnow()
-                    db.commit()
-                    
-                    # Initiate call
-                    self.call_service.initiate_call(call.patient, call)
+                if len(claimed_calls) < RETRY_BATCH_SIZE:
+                    break
+        finally:
+            db.close()
+    
+    @staticmethod
+    def _claim_retry_batch(db: Session, batch_size: int) -> List[ScheduledCall]:
+        """Claim a batch of failed calls whose backoff has elapsed and mark them scheduled."""
+        now = datetime.utcnow()
+        
+        # SKIP LOCKED lets several scheduler replicas claim disjoint batches
+        call_ids = [
+            call_id for (call_id,) in db.query(ScheduledCall.id).filter(
+                ScheduledCall.status == CallStatus.FAILED,
+                ScheduledCall.retry_count < ScheduledCall.max_retries,
+                ScheduledCall.next_attempt_at <= now
+            ).order_by(ScheduledCall.next_attempt_at).limit(batch_size).with_for_update(skip_locked=True)
+        ]
+        if not call_ids:
+            db.commit()
+            return []
+        
+        db.query(ScheduledCall).filter(ScheduledCall.id.in_(call_ids)).update(
+            {
+                ScheduledCall.retry_count: ScheduledCall.retry_count + 1,
+                ScheduledCall.status: CallStatus.SCHEDULED,
+                ScheduledCall.scheduled_time: now,
+                ScheduledCall.next_attempt_at: None,
+            },
+            synchronize_session=False
+        )
+        db.commit()
+        
+        # The dialer reads every call's patient: load them in the same query
+        return db.query(ScheduledCall).options(
+            joinedload(ScheduledCall.patient)
+        ).filter(ScheduledCall.id.in_(call_ids)).all()
+    
+    def prewarm_tts_cache(self):
+        """Render the call flow's fixed prompts into the TTS cache."""
+        db = SessionLocal()
+        try:
+            ai_service = AIService(db)
+            renderings = fixed_prompt_renderings(settings.TTS_PREWARM_LANGUAGES)
+            asyncio.run(ai_service.tts_cache.prewarm(ai_service, renderings))
         finally:
             db.close()
     
@@ -156,49 +235,43 @@ class SchedulerService:
         """Cleanup expired audio files and transcripts."""
         db = SessionLocal()
         try:
-            from app.db.models.conversation import ConversationTurn
-            from datetime import timedelta
-            
-            # Delete audio files older than 30 days
-            cutoff_date = datetime.utcnow() - timedelta(days=30)
-            
-            old_turns = db.query(ConversationTurn).filter(
-                ConversationTurn.created_at < cutoff_date
-            ).all()
-            
-            for turn in old_turns:
-                # TODO: Delete actual audio files from storage
-                # if turn.audio_url:
-                #     delete_file_from_storage(turn.audio_url)
-                # if turn.tts_audio_url:
-                #     delete_file_from_storage(turn.tts_audio_url)
-                
-                # Clear URLs (keep the record)
-                turn.audio_url = None
-                turn.tts_audio_url = None
-            
+            RetentionService(db).run()
+        finally:
+            db.close()
+    
+    def ensure_partitions(self):
+        """Create the current and upcoming monthly partitions of the partitioned tables."""
+        db = SessionLocal()
+        try:
+            connection = db.connection()
+            for table in partitioning.PARTITIONED_TABLES:
+                partitioning.ensure_partitions(connection, table)
             db.commit()
         finally:
             db.close()
     
-    def _schedule_ivr_call(self, db: Session, patient_id: int):
-        """Schedule IVR call for patient."""
-        patient = db.query(Patient).filter(Patient.id == patient_id).first()
-        if not patient:
+    def _schedule_ivr_calls(self, db: Session, patient_ids: List[int]):
+        """Schedule and dial IVR calls for a batch of patients."""
+        patients = db.query(Patient).filter(Patient.id.in_(patient_ids)).all()
+        if not patients:
             return
         
-        # Create scheduled call
-        scheduled_call = ScheduledCall(
-            patient_id=patient_id,
-            scheduled_time=datetime.utcnow(),
-            status=CallStatus.SCHEDULED,
-            channel="ivr"
-        )
-        db.add(scheduled_call)
+        # Create scheduled calls
+        now = datetime.utcnow()
+        scheduled_calls = [
+            ScheduledCall(
+                patient_id=patient.id,
+                scheduled_time=now,
+                status=CallStatus.SCHEDULED,
+                channel="ivr"
+            )
+            for patient in patients
+        ]
+        db.add_all(scheduled_calls)
         db.commit()
         
-        # Initiate call immediately
-        self.call_service.initiate_call(patient, scheduled_call)
+        # Dial immediately, concurrently
+        asyncio.run(OutboundDialer(db).dial(list(zip(patients, scheduled_calls))))
     
     def _send_sms_content(self, db: Session, patient_id: int):
         """Send SMS content to patient."""
@@ -1,9 +1,12 @@
 """Session service."""
 
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from typing import Any, Dict, List, Optional
 from datetime import datetime
-from app.db.models.conversation import ConversationSession, Message, SessionStatus
+from app.db.models.conversation import ConversationSession, ConversationTurn, SessionStatus
+from app.db.pagination import DEFAULT_PAGE_SIZE, Page, approximate_count, async_approximate_count, build_page, keyset
 from app.schemas.session import SessionCreate, MessageCreate
 
 
@@ -12,13 +15,17 @@ class SessionService:
     
     @staticmethod
     def get_session(db: Session, session_id: int) -> Optional[ConversationSession]:
-        """Get session by ID."""
-        return db.query(ConversationSession).filter(ConversationSession.id == session_id).first()
+        """Get session by ID, with the patient every conversation flow reads."""
+        return db.query(ConversationSession).options(
+            joinedload(ConversationSession.patient)
+        ).filter(ConversationSession.id == session_id).first()
     
     @staticmethod
-    def get_sessions(db: Session, skip: int = 0, limit: int = 100) -> List[ConversationSession]:
-        """Get all sessions."""
-        return db.query(ConversationSession).offset(skip).limit(limit).all()
+    def get_sessions(db: Session, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+                     include_total: bool = False) -> Page:
+        """Get a page of sessions, oldest first."""
+        rows = keyset(db.query(ConversationSession), ConversationSession, cursor, limit).all()
+        return build_page(rows, limit, approximate_count(db, ConversationSession) if include_total else None)
     
     @staticmethod
     def get_patient_sessions(db: Session, patient_id: int) -> List[ConversationSession]:
@@ -39,13 +46,31 @@ class SessionService:
         return session
     
     @staticmethod
-    def add_message(db: Session, message_data: MessageCreate) -> Message:
-        """Add a message to a session."""
-        message = Message(**message_data.dict())
-        db.add(message)
+    def turn_fields(message_data: MessageCreate) -> Dict[str, Any]:
+        """Map a message onto ConversationTurn columns (turn_number is assigned separately)."""
+        return {
+            "session_id": message_data.session_id,
+            "role": message_data.role,
+            "user_input": message_data.content if message_data.role == "user" else None,
+            "assistant_response": message_data.content if message_data.role != "user" else None,
+            "audio_url": message_data.audio_url,
+            "metadata": message_data.metadata,
+        }
+    
+    @staticmethod
+    def add_message(db: Session, message_data: MessageCreate) -> ConversationTurn:
+        """Add a message to a session as its next conversation turn."""
+        last_turn_number = db.query(func.max(ConversationTurn.turn_number)).filter(
+            ConversationTurn.session_id == message_data.session_id
+        ).scalar()
+        turn = ConversationTurn(
+            **SessionService.turn_fields(message_data),
+            turn_number=(last_turn_number or 0) + 1
+        )
+        db.add(turn)
         db.commit()
-        db.refresh(message)
-        return message
+        db.refresh(turn)
+        return turn
     
     @staticmethod
     def end_session(db: Session, session_id: int) -> Optional[ConversationSession]:
@@ -60,3 +85,70 @@ class SessionService:
         db.refresh(session)
         return session
 
+
+class AsyncSessionService:
+    """Conversation session operations for async request handlers."""
+    
+    @staticmethod
+    async def get_session(db: AsyncSession, session_id: int) -> Optional[ConversationSession]:
+        """Get session by ID."""
+        return await db.get(ConversationSession, session_id)
+    
+    @staticmethod
+    async def get_sessions(db: AsyncSession, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+                           include_total: bool = False) -> Page:
+        """Get a page of sessions, oldest first."""
+        result = await db.execute(keyset(select(ConversationSession), ConversationSession, cursor, limit))
+        total = await async_approximate_count(db, ConversationSession) if include_total else None
+        return build_page(result.scalars().all(), limit, total)
+    
+    @staticmethod
+    async def get_patient_sessions(db: AsyncSession, patient_id: int) -> List[ConversationSession]:
+        """Get all sessions for a patient."""
+        result = await db.execute(
+            select(ConversationSession).where(ConversationSession.patient_id == patient_id)
+        )
+        return list(result.scalars())
+    
+    @staticmethod
+    async def create_session(db: AsyncSession, session_data: SessionCreate) -> ConversationSession:
+        """Create a new session."""
+        session = ConversationSession(
+            **session_data.dict(),
+            started_at=datetime.utcnow(),
+            status=SessionStatus.ACTIVE
+        )
+        db.add(session)
+        await db.commit()
+        await db.refresh(session)
+        return session
+    
+    @staticmethod
+    async def add_message(db: AsyncSession, message_data: MessageCreate) -> ConversationTurn:
+        """Add a message to a session as its next conversation turn."""
+        last_turn_number = await db.scalar(
+            select(func.max(ConversationTurn.turn_number)).where(
+                ConversationTurn.session_id == message_data.session_id
+            )
+        )
+        turn = ConversationTurn(
+            **SessionService.turn_fields(message_data),
+            turn_number=(last_turn_number or 0) + 1
+        )
+        db.add(turn)
+        await db.commit()
+        await db.refresh(turn)
+        return turn
+    
+    @staticmethod
+    async def end_session(db: AsyncSession, session_id: int) -> Optional[ConversationSession]:
+        """End a session."""
+        session = await AsyncSessionService.get_session(db, session_id)
+        if not session:
+            return None
+        
+        session.status = SessionStatus.COMPLETED
+        session.ended_at = datetime.utcnow()
+        await db.commit()
+        await db.refresh(session)
+        return session
@@ -0,0 +1,63 @@
+"""Media file storage."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, Optional, Tuple
+from app.core.config import settings
+
+
+class LocalFileStorage:
+    """Local-disk storage standing in for object storage; keys are relative paths."""
+    
+    def __init__(self, root: Optional[str] = None):
+        self.root = os.path.abspath(root or settings.MEDIA_STORAGE_DIR)
+    
+    def path_for(self, key: str) -> str:
+        """Get the absolute path for a key, refusing keys outside the storage root."""
+        path = os.path.abspath(os.path.join(self.root, key))
+        if os.path.commonpath([self.root, path]) != self.root:
+            raise ValueError(f"Storage key escapes storage root: {key}")
+        return path
+    
+    def save(self, key: str, data: bytes) -> str:
+        """Write data under a key (atomically) and return the key."""
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return key
+    
+    def exists(self, key: str) -> bool:
+        """Check whether a key exists."""
+        return os.path.exists(self.path_for(key))
+    
+    def touch(self, key: str):
+        """Mark a key as recently used."""
+        os.utime(self.path_for(key))
+    
+    def delete(self, key: str) -> bool:
+        """Delete a key, returning False if it did not exist."""
+        try:
+            os.remove(self.path_for(key))
+            return True
+        except FileNotFoundError:
+            return False
+    
+    def delete_many(self, keys: Iterable[str], max_workers: int = 8) -> int:
+        """Delete keys in parallel with bounded concurrency; returns how many existed."""
+        keys = list(keys)
+        if not keys:
+            return 0
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(keys))) as executor:
+            return sum(executor.map(self.delete, keys))
+    
+    def iter_files(self, prefix: str = "") -> Iterator[Tuple[str, int, float]]:
+        """Yield (key, size in bytes, last-used time) for every file under a prefix."""
+        base = self.path_for(prefix) if prefix else self.root
+        for dirpath, _, filenames in os.walk(base):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                stat = os.stat(path)
+                yield os.path.relpath(path, self.root), stat.st_size, stat.st_mtime
@@ -0,0 +1,108 @@
+"""Pre-rendered TTS audio cache."""
+
+import hashlib
+from typing import Awaitable, Callable, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.models.content import ContentAsset
+from app.services.storage import LocalFileStorage
+
+
+class TTSAssetCache:
+    """Caches synthesized audio on disk keyed by hash(text, voice, tts_model, language).
+    
+    Each cached file is recorded as a ContentAsset. When the cache grows past
+    its byte budget, the least recently used files are evicted.
+    """
+    
+    PREFIX = "tts"
+    
+    def __init__(self, db: Session, storage: Optional[LocalFileStorage] = None, max_bytes: Optional[int] = None):
+        self.db = db
+        self.storage = storage or LocalFileStorage()
+        self.max_bytes = max_bytes or settings.TTS_CACHE_MAX_BYTES
+        self._total_bytes: Optional[int] = None
+    
+    @staticmethod
+    def make_key(text: str, voice: str, tts_model: str, language: str) -> str:
+        """Build the content hash for a rendering."""
+        payload = "\x1f".join([" ".join(text.split()), voice, tts_model, (language or "en").lower()])
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
+    def storage_key(self, cache_key: str) -> str:
+        """Get the storage key for a cache key."""
+        return f"{self.PREFIX}/{cache_key[:2]}/{cache_key}.mp3"
+    
+    async def get_or_render(
+        self,
+        text: str,
+        language: str,
+        voice: str,
+        tts_model: str,
+        render: Callable[[str, str], Awaitable[bytes]],
+        lesson_id: Optional[int] = None
+    ) -> str:
+        """Get the cached audio URL for text, rendering and storing it on a miss."""
+        cache_key = self.make_key(text, voice, tts_model, language)
+        key = self.storage_key(cache_key)
+        if self.storage.exists(key):
+            self.storage.touch(key)
+            return key
+        
+        audio = await render(text, language)
+        self.storage.save(key, audio)
+        self.db.add(ContentAsset(
+            lesson_id=lesson_id,
+            asset_type="audio",
+            file_url=key,
+            file_size=len(audio),
+            mime_type="audio/mpeg",
+            language=language,
+            metadata={"cache_key": cache_key, "voice": voice, "tts_model": tts_model}
+        ))
+        self.db.commit()
+        
+        self._add_bytes(len(audio))
+        return key
+    
+    def _add_bytes(self, size: int):
+        """Track cache size and evict once it exceeds the budget."""
+        if self._total_bytes is None:
+            self._total_bytes = sum(file_size for _, file_size, _ in self.storage.iter_files(self.PREFIX))
+        else:
+            self._total_bytes += size
+        if self._total_bytes > self.max_bytes:
+            self.evict()
+    
+    def evict(self) -> List[str]:
+        """Delete least recently used files until the cache is within budget."""
+        files = sorted(self.storage.iter_files(self.PREFIX), key=lambda entry: entry[2])
+        total_bytes = sum(file_size for _, file_size, _ in files)
+        
+        evicted = []
+        for key, file_size, _ in files:
+            if total_bytes <= self.max_bytes:
+                break
+            if self.storage.delete(key):
+                evicted.append(key)
+            total_bytes -= file_size
+        
+        if evicted:
+            self.db.query(ContentAsset).filter(
+                ContentAsset.file_url.in_(evicted)
+            ).delete(synchronize_session=False)
+            self.db.commit()
+        
+        self._total_bytes = total_bytes
+        return evicted
+    
+    async def prewarm(self, ai_service, renderings: Iterable[Tuple[str, str]]) -> int:
+        """Render the (text, language) pairs that are not cached yet; returns files rendered."""
+        rendered = 0
+        for text, language in renderings:
+            key = self.storage_key(self.make_key(text, ai_service.tts_voice, ai_service.tts_model, language))
+            if self.storage.exists(key):
+                continue
+            await self.get_or_render(text, language, ai_service.tts_voice, ai_service.tts_model, ai_service.render_speech)
+            rendered += 1
+        return rendered
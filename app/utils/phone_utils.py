@@ -39,3 +39,24 @@ def format_phone_number(phone: str) -> str:
     
     return normalized
 
+
+# Ghana mobile network prefixes (digits after +233)
+CARRIER_PREFIXES = {
+    "mtn": ("24", "25", "53", "54", "55", "59"),
+    "vodafone": ("20", "50"),
+    "airteltigo": ("26", "27", "56", "57"),
+}
+
+
+def get_carrier(phone: str) -> str:
+    """Get the mobile carrier for a phone number, or "other" if unknown."""
+    normalized = normalize_phone_number(phone)
+    if not normalized or not normalized.startswith('+233'):
+        return "other"
+    
+    prefix = normalized[4:6]
+    for carrier, prefixes in CARRIER_PREFIXES.items():
+        if prefix in prefixes:
+            return carrier
+    
+    return "other"
@@ -1,26 +1,82 @@
 """Orchestrator for IVR conversation flow - ASR → LLM → TTS pipeline."""
 
-from typing import Dict, Any, Optional
+import asyncio
+import time
+from typing import Dict, Any, Iterable, Optional, AsyncIterator, Set, Tuple
 from datetime import datetime
+from app.core.config import settings
 from app.workflows.conversation_fsm import ConversationFSM, ConversationState
+from app.workflows.conversation_history import ConversationHistory
+from app.workflows.conversation_store import ConversationStore, get_conversation_store
+from app.workflows.intent_classifier import Intent, classify
 from app.db.models.conversation import ConversationSession, ConversationTurn
-from app.services.ai_service import AIService
+from app.services.ai_service import AIService, iter_sentences
 from app.services.safety_service import SafetyService
 from app.services.escalation_service import EscalationService
 from sqlalchemy.orm import Session
 
+# Fixed (non-LLM) prompts by language. Only these are identical for every patient,
+# so only their audio goes through the TTS cache. Languages without a translation
+# hear the English text.
+FIXED_PROMPTS: Dict[str, Dict[str, str]] = {
+    "emergency": {
+        "en": "I understand this is an emergency. Please stay on the line while I connect you with emergency services.",
+    },
+}
+
+
+def fixed_prompt(name: str, language: Optional[str]) -> Tuple[str, str]:
+    """Get a fixed prompt's text for language and the language it is written in."""
+    translations = FIXED_PROMPTS[name]
+    if language in translations:
+        return translations[language], language
+    return translations["en"], "en"
+
+
+def fixed_prompt_renderings(languages: Iterable[str]) -> Set[Tuple[str, str]]:
+    """Every (text, language) the call flow synthesizes for fixed prompts, for cache prewarming."""
+    return {fixed_prompt(name, language) for name in FIXED_PROMPTS for language in languages}
+
 
 class CallFlow:
     """Orchestrator for IVR conversation with ASR → LLM → TTS pipeline."""
     
-    def __init__(self, session: ConversationSession, db: Session):
+    def __init__(self, session: ConversationSession, db: Session, history_window: Optional[int] = None,
+                 conversation_store: Optional[ConversationStore] = None):
         self.session = session
         self.db = db
+        # Read once: every commit expires session and patient, so later reads would reload both
+        self.language = session.patient.language_preference
         self.fsm = ConversationFSM(ConversationState.SESSION_START)
-        self.ai_service = AIService()
-        self.safety_service = SafetyService()
-        self.escalation_service = EscalationService()
+        self.ai_service = AIService(db)
+        self.safety_service = SafetyService(db, language=self.language)
+        self.escalation_service = EscalationService(db)
         self.turn_counter = 0
+        self.history = ConversationHistory(
+            db, session.id, history_window or settings.CONVERSATION_HISTORY_WINDOW, since=session.started_at
+        )
+        self.conversation_store = conversation_store or get_conversation_store()
+        self.restore_snapshot()
+        # The session's lesson keys the LLM response cache (and is named in the prompt)
+        if session.lesson_id is not None:
+            self.fsm.context["lesson_id"] = session.lesson_id
+    
+    def restore_snapshot(self) -> bool:
+        """Resume this session from its latest snapshot; returns False if there was none."""
+        snapshot = self.conversation_store.load(self.session.id)
+        if snapshot is None:
+            # No snapshot (first turn, or it expired): at least keep the persisted state
+            if self.session.current_state:
+                self.fsm = ConversationFSM(ConversationState(self.session.current_state), channel=self.fsm.channel)
+            return False
+        self.fsm = snapshot.fsm
+        self.turn_counter = snapshot.turn_counter
+        self.history.restore(snapshot.last_turn_number, snapshot.messages)
+        return True
+    
+    def save_snapshot(self):
+        """Store this session's state so the next turn can run on any worker."""
+        self.conversation_store.save(self.session.id, self.fsm, self.turn_counter, self.history)
     
     async def process_audio_input(self, audio_url: str) -> Dict[str, Any]:
         """Process audio input through ASR → LLM → TTS pipeline."""
@@ -30,7 +86,7 @@ class CallFlow:
         user_input = await self.ai_service.transcribe_audio(audio_url)
         
         # Step 2: Safety check
-        safety_check = self.safety_service.check_input(user_input)
+        safety_check = self.safety_service.check_input(user_input, session=self.session)
         
         if safety_check["should_escalate"]:
             return await self.handle_emergency(user_input, safety_check)
@@ -38,10 +94,10 @@ class CallFlow:
         # Step 3: Process based on current state
         response_data = await self.process_user_input(user_input)
         
-        # Step 4: Generate TTS audio
+        # Step 4: Generate TTS audio (LLM output differs per patient, so it is never cached)
         tts_audio_url = await self.ai_service.synthesize_speech(
             response_data["response"],
-            language=self.session.patient.language_preference
+            language=self.language
         )
         
         # Step 5: Log turn
@@ -54,6 +110,75 @@ class CallFlow:
             "latency_ms": latency_ms
         }
     
+    async def process_audio_input_streaming(self, audio_url: str) -> AsyncIterator[Dict[str, Any]]:
+        """Process audio input, yielding TTS audio sentence by sentence as the LLM streams.
+        
+        Each intermediate item carries one audio chunk; the final item (``is_final``)
+        carries the full response, state and latencies.
+        """
+        start_time = time.perf_counter()
+        
+        user_input = await self.ai_service.transcribe_audio(audio_url)
+        
+        safety_check = self.safety_service.check_input(user_input, session=self.session)
+        if safety_check["should_escalate"]:
+            yield {**await self.handle_emergency(user_input, safety_check), "is_final": True}
+            return
+        
+        language = self.language
+        sentences: asyncio.Queue = asyncio.Queue()
+        
+        async def produce_sentences():
+            # Keeps the LLM generating while earlier sentences are synthesized
+            try:
+                async for sentence in iter_sentences(self.ai_service.stream_response(
+                    user_input=user_input,
+                    current_state=self.fsm.current_state,
+                    context=self.fsm.context,
+                    history=self.get_conversation_history(),
+                    language=language
+                )):
+                    await sentences.put(sentence)
+            finally:
+                await sentences.put(None)
+        
+        producer = asyncio.create_task(produce_sentences())
+        response_parts = []
+        tts_audio_urls = []
+        first_audio_latency_ms = None
+        try:
+            while (sentence := await sentences.get()) is not None:
+                tts_audio_url = await self.ai_service.synthesize_speech(sentence, language=language)
+                if first_audio_latency_ms is None:
+                    first_audio_latency_ms = (time.perf_counter() - start_time) * 1000
+                response_parts.append(sentence)
+                tts_audio_urls.append(tts_audio_url)
+                yield {"text": sentence, "tts_audio_url": tts_audio_url, "is_final": False}
+        except BaseException:
+            # Caller hung up (generator closed) or synthesis failed
+            producer.cancel()
+            raise
+        await producer
+        
+        response = " ".join(response_parts)
+        self.advance_state(user_input, response)
+        
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        self.log_turn(
+            user_input, response, audio_url, tts_audio_urls[0] if tts_audio_urls else None, latency_ms,
+            first_audio_latency_ms=first_audio_latency_ms,
+            metadata={"tts_audio_urls": tts_audio_urls}
+        )
+        
+        yield {
+            "response": response,
+            "state": self.fsm.current_state.value,
+            "tts_audio_urls": tts_audio_urls,
+            "latency_ms": latency_ms,
+            "first_audio_latency_ms": first_audio_latency_ms,
+            "is_final": True
+        }
+    
     async def process_user_input(self, user_input: str) -> Dict[str, Any]:
         """Process user input and generate response."""
         # Get conversation history
@@ -64,9 +189,19 @@ class CallFlow:
             user_input=user_input,
             current_state=self.fsm.current_state,
             context=self.fsm.context,
-            history=history
+            history=history,
+            language=self.language
         )
         
+        self.advance_state(user_input, response)
+        
+        return {
+            "response": response,
+            "state": self.fsm.current_state.value
+        }
+    
+    def advance_state(self, user_input: str, response: str):
+        """Apply the state transition for this turn and persist the session state."""
         # Process state transitions based on response
         next_state = self.determine_next_state(user_input, response)
         if next_state:
@@ -75,20 +210,16 @@ class CallFlow:
         # Update session state
         self.session.current_state = self.fsm.current_state.value
         self.db.commit()
-        
-        return {
-            "response": response,
-            "state": self.fsm.current_state.value
-        }
     
     def determine_next_state(self, user_input: str, response: str) -> Optional[ConversationState]:
         """Determine next state based on user input and current state."""
         state = self.fsm.current_state
+        intents = classify(user_input, self.language)
         
         if state == ConversationState.SESSION_START:
             return ConversationState.OPT_IN_PROMPT
         elif state == ConversationState.OPT_IN_PROMPT:
-            if "yes" in user_input.lower() or "ok" in user_input.lower():
+            if Intent.CONSENT_YES in intents:
                 self.fsm.context["consent_granted"] = True
                 return ConversationState.GREETING
             else:
@@ -102,14 +233,14 @@ class CallFlow:
         elif state == ConversationState.DELIVER_LESSON_BRIEF:
             return ConversationState.ENGAGEMENT_CHECK
         elif state == ConversationState.ENGAGEMENT_CHECK:
-            if "yes" in user_input.lower() or "continue" in user_input.lower():
+            if Intent.CONSENT_YES in intents or Intent.CONTINUE in intents:
                 return ConversationState.DELIVER_LESSON_DETAILED
             else:
                 return ConversationState.SCHEDULE_OFFER
         elif state == ConversationState.DELIVER_LESSON_DETAILED:
             return ConversationState.SCHEDULE_OFFER
         elif state == ConversationState.SCHEDULE_OFFER:
-            if "yes" in user_input.lower():
+            if Intent.CONSENT_YES in intents:
                 return ConversationState.CONFIRM_SCHEDULE
             else:
                 return ConversationState.END_SESSION
@@ -129,10 +260,11 @@ class CallFlow:
             details={"user_input": user_input}
         )
         
-        response = "I understand this is an emergency. Please stay on the line while I connect you with emergency services."
+        response, response_language = fixed_prompt("emergency", self.language)
         tts_audio_url = await self.ai_service.synthesize_speech(
             response,
-            language=self.session.patient.language_preference
+            language=response_language,
+            cacheable=True
         )
         
         self.log_turn(user_input, response, None, tts_audio_url, 0)
@@ -145,23 +277,15 @@ class CallFlow:
         }
     
     def get_conversation_history(self) -> list:
-        """Get conversation history for context."""
-        turns = self.db.query(ConversationTurn).filter(
-            ConversationTurn.session_id == self.session.id
-        ).order_by(ConversationTurn.turn_number).all()
-        
-        return [
-            {
-                "role": turn.role,
-                "content": turn.user_input or turn.assistant_response
-            }
-            for turn in turns
-        ]
+        """Get recent conversation history for context."""
+        return self.history.messages()
     
     def log_turn(self, user_input: str, assistant_response: str, audio_url: Optional[str], 
-                 tts_audio_url: Optional[str], latency_ms: float):
+                 tts_audio_url: Optional[str], latency_ms: float,
+                 first_audio_latency_ms: Optional[float] = None, metadata: Optional[Dict[str, Any]] = None):
         """Log conversation turn."""
-        self.turn_counter += 1
+        self.history.load()
+        self.turn_counter = max(self.turn_counter, self.history.last_turn_number) + 1
         turn = ConversationTurn(
             session_id=self.session.id,
             turn_number=self.turn_counter,
@@ -170,8 +294,15 @@ class CallFlow:
             assistant_response=assistant_response,
             audio_url=audio_url,
             tts_audio_url=tts_audio_url,
-            latency_ms=latency_ms
+            latency_ms=latency_ms,
+            first_audio_latency_ms=first_audio_latency_ms,
+            metadata=metadata
         )
         self.db.add(turn)
+        # Any safety events from this turn are written in the same commit
+        self.safety_service.flush_events(commit=False)
+        self.safety_service.checkpoint(self.session)
         self.db.commit()
+        self.history.append(turn.turn_number, turn.role, user_input, assistant_response)
+        self.save_snapshot()
 
@@ -1,7 +1,8 @@
 """Conversation finite state machine for voice agent."""
 
 from enum import Enum
-from typing import Optional, Dict, Any
+from types import MappingProxyType
+from typing import Optional, Dict, Any, FrozenSet, Iterable, Mapping
 
 
 class ConversationState(str, Enum):
@@ -21,11 +22,129 @@ class ConversationState(str, Enum):
     END_SESSION = "end_session"
 
 
+TransitionGraph = Mapping[ConversationState, FrozenSet[ConversationState]]
+
+
+def build_transition_graph(
+    edges: Mapping[ConversationState, Iterable[ConversationState]],
+    extra_edges: Optional[Mapping[ConversationState, Iterable[ConversationState]]] = None
+) -> TransitionGraph:
+    """Freeze an edge list (plus optional extra edges) into a read-only transition graph."""
+    extra_edges = extra_edges or {}
+    return MappingProxyType({
+        state: frozenset(edges.get(state, ())) | frozenset(extra_edges.get(state, ()))
+        for state in ConversationState
+    })
+
+
+# Base graph, used as-is for IVR calls
+_BASE_EDGES = {
+    ConversationState.SESSION_START: [
+        ConversationState.OPT_IN_PROMPT,
+        ConversationState.EMERGENCY_FALLBACK,
+        ConversationState.END_SESSION
+    ],
+    ConversationState.OPT_IN_PROMPT: [
+        ConversationState.GREETING,
+        ConversationState.END_SESSION,
+        ConversationState.EMERGENCY_FALLBACK
+    ],
+    ConversationState.GREETING: [
+        ConversationState.TOPIC_INTRO,
+        ConversationState.EMERGENCY_FALLBACK,
+        ConversationState.END_SESSION
+    ],
+    ConversationState.TOPIC_INTRO: [
+        ConversationState.DELIVER_LESSON_INTRO,
+        ConversationState.SAFE_REDIRECT,
+        ConversationState.EMERGENCY_FALLBACK,
+        ConversationState.END_SESSION
+    ],
+    ConversationState.DELIVER_LESSON_INTRO: [
+        ConversationState.DELIVER_LESSON_BRIEF,
+        ConversationState.ENGAGEMENT_CHECK,
+        ConversationState.SAFE_REDIRECT,
+        ConversationState.EMERGENCY_FALLBACK,
+        ConversationState.END_SESSION
+    ],
+    ConversationState.DELIVER_LESSON_BRIEF: [
+        ConversationState.DELIVER_LESSON_DETAILED,
+        ConversationState.ENGAGEMENT_CHECK,
+        ConversationState.SAFE_REDIRECT,
+        ConversationState.EMERGENCY_FALLBACK,
+        ConversationState.END_SESSION
+    ],
+    ConversationState.DELIVER_LESSON_DETAILED: [
+        ConversationState.ENGAGEMENT_CHECK,
+        ConversationState.SCHEDULE_OFFER,
+        ConversationState.SAFE_REDIRECT,
+        ConversationState.EMERGENCY_FALLBACK,
+        ConversationState.END_SESSION
+    ],
+    ConversationState.ENGAGEMENT_CHECK: [
+        ConversationState.DELIVER_LESSON_DETAILED,
+        ConversationState.SCHEDULE_OFFER,
+        ConversationState.END_SESSION,
+        ConversationState.EMERGENCY_FALLBACK
+    ],
+    ConversationState.SCHEDULE_OFFER: [
+        ConversationState.CONFIRM_SCHEDULE,
+        ConversationState.END_SESSION,
+        ConversationState.EMERGENCY_FALLBACK
+    ],
+    ConversationState.CONFIRM_SCHEDULE: [
+        ConversationState.END_SESSION,
+        ConversationState.EMERGENCY_FALLBACK
+    ],
+    ConversationState.SAFE_REDIRECT: [
+        ConversationState.END_SESSION,
+        ConversationState.EMERGENCY_FALLBACK
+    ],
+    ConversationState.EMERGENCY_FALLBACK: [
+        ConversationState.END_SESSION
+    ],
+    ConversationState.END_SESSION: [],
+}
+
+# WhatsApp users can jump to the next lesson or ask for a reminder from any lesson state
+_LESSON_STATES = [
+    ConversationState.TOPIC_INTRO,
+    ConversationState.DELIVER_LESSON_INTRO,
+    ConversationState.DELIVER_LESSON_BRIEF,
+    ConversationState.DELIVER_LESSON_DETAILED,
+    ConversationState.ENGAGEMENT_CHECK,
+]
+_WHATSAPP_EXTRA_EDGES = {
+    state: [ConversationState.DELIVER_LESSON_INTRO, ConversationState.SCHEDULE_OFFER]
+    for state in _LESSON_STATES
+}
+_WHATSAPP_EXTRA_EDGES[ConversationState.CONFIRM_SCHEDULE] = [ConversationState.DELIVER_LESSON_INTRO]
+
+IVR_TRANSITIONS = build_transition_graph(_BASE_EDGES)
+WHATSAPP_TRANSITIONS = build_transition_graph(_BASE_EDGES, _WHATSAPP_EXTRA_EDGES)
+
+# Keyed by ConversationSession.channel
+CHANNEL_TRANSITIONS: Mapping[str, TransitionGraph] = MappingProxyType({
+    "ivr": IVR_TRANSITIONS,
+    "whatsapp": WHATSAPP_TRANSITIONS,
+    "sms": IVR_TRANSITIONS,
+})
+
+
 class ConversationFSM:
-    """Finite state machine for managing conversation flow."""
+    """Finite state machine for managing conversation flow.
+    
+    Transition graphs are shared and immutable, so each live conversation only
+    holds its state, channel and context.
+    """
     
-    def __init__(self, initial_state: ConversationState = ConversationState.SESSION_START):
+    __slots__ = ("current_state", "channel", "context", "transitions")
+    
+    def __init__(self, initial_state: ConversationState = ConversationState.SESSION_START,
+                 channel: str = "ivr", transitions: Optional[TransitionGraph] = None):
         self.current_state = initial_state
+        self.channel = channel
+        self.transitions = transitions or CHANNEL_TRANSITIONS.get(channel, IVR_TRANSITIONS)
         self.context: Dict[str, Any] = {
             "consent_granted": False,
             "lesson_id": None,
@@ -44,72 +163,15 @@ class ConversationFSM:
     
     def is_valid_transition(self, from_state: ConversationState, to_state: ConversationState) -> bool:
         """Check if transition is valid."""
-        valid_transitions = {
-            ConversationState.SESSION_START: [
-                ConversationState.OPT_IN_PROMPT,
-                ConversationState.EMERGENCY_FALLBACK,
-                ConversationState.END_SESSION
-            ],
-            ConversationState.OPT_IN_PROMPT: [
-                ConversationState.GREETING,
-                ConversationState.END_SESSION,
-                ConversationState.EMERGENCY_FALLBACK
-            ],
-            ConversationState.GREETING: [
-                ConversationState.TOPIC_INTRO,
-                ConversationState.EMERGENCY_FALLBACK,
-                ConversationState.END_SESSION
-            ],
-            ConversationState.TOPIC_INTRO: [
-                ConversationState.DELIVER_LESSON_INTRO,
-                ConversationState.SAFE_REDIRECT,
-                ConversationState.EMERGENCY_FALLBACK,
-                ConversationState.END_SESSION
-            ],
-            ConversationState.DELIVER_LESSON_INTRO: [
-                ConversationState.DELIVER_LESSON_BRIEF,
-                ConversationState.ENGAGEMENT_CHECK,
-                ConversationState.SAFE_REDIRECT,
-                ConversationState.EMERGENCY_FALLBACK,
-                ConversationState.END_SESSION
-            ],
-            ConversationState.DELIVER_LESSON_BRIEF: [
-                ConversationState.DELIVER_LESSON_DETAILED,
-                ConversationState.ENGAGEMENT_CHECK,
-                ConversationState.SAFE_REDIRECT,
-                ConversationState.EMERGENCY_FALLBACK,
-                ConversationState.END_SESSION
-            ],
-            ConversationState.DELIVER_LESSON_DETAILED: [
-                ConversationState.ENGAGEMENT_CHECK,
-                ConversationState.SCHEDULE_OFFER,
-                ConversationState.SAFE_REDIRECT,
-                ConversationState.EMERGENCY_FALLBACK,
-                ConversationState.END_SESSION
-            ],
-            ConversationState.ENGAGEMENT_CHECK: [
-                ConversationState.DELIVER_LESSON_DETAILED,
-                ConversationState.SCHEDULE_OFFER,
-                ConversationState.END_SESSION,
-                ConversationState.EMERGENCY_FALLBACK
-            ],
-            ConversationState.SCHEDULE_OFFER: [
-                ConversationState.CONFIRM_SCHEDULE,
-                ConversationState.END_SESSION,
-                ConversationState.EMERGENCY_FALLBACK
-            ],
-            ConversationState.CONFIRM_SCHEDULE: [
-                ConversationState.END_SESSION,
-                ConversationState.EMERGENCY_FALLBACK
-            ],
-            ConversationState.SAFE_REDIRECT: [
-                ConversationState.END_SESSION,
-                ConversationState.EMERGENCY_FALLBACK
-            ],
-            ConversationState.EMERGENCY_FALLBACK: [
-                ConversationState.END_SESSION
-            ],
-            ConversationState.END_SESSION: [],
-        }
-        return to_state in valid_transitions.get(from_state, [])
-
+        return to_state in self.transitions[from_state]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize state, channel and context for a conversation snapshot."""
+        return {"state": self.current_state.value, "channel": self.channel, "context": self.context}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ConversationFSM":
+        """Rebuild an FSM from ``to_dict`` output."""
+        fsm = cls(ConversationState(data["state"]), channel=data["channel"])
+        fsm.context.update(data["context"])
+        return fsm
@@ -0,0 +1,60 @@
+"""Bounded in-memory window of recent conversation turns."""
+
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional
+from sqlalchemy.orm import Session
+from app.db.models.conversation import ConversationTurn
+
+
+class ConversationHistory:
+    """Ring buffer of the most recent turns, seeded once from the database."""
+    
+    def __init__(self, db: Session, session_id: int, window: int, since: Optional[datetime] = None):
+        self.db = db
+        self.session_id = session_id
+        self.window = window
+        self.since = since  # Session start: lets PostgreSQL skip older monthly partitions
+        self._messages: Optional[Deque[Dict[str, str]]] = None
+        self.last_turn_number = 0
+    
+    @staticmethod
+    def to_message(role: str, user_input: Optional[str], assistant_response: Optional[str]) -> Dict[str, str]:
+        """Build a prompt history entry from a turn's fields."""
+        return {
+            "role": role,
+            "content": user_input or assistant_response
+        }
+    
+    def load(self):
+        """Seed the buffer from the session's latest turns (no-op once loaded)."""
+        if self._messages is not None:
+            return
+        
+        query = self.db.query(ConversationTurn).filter(ConversationTurn.session_id == self.session_id)
+        if self.since is not None:
+            query = query.filter(ConversationTurn.created_at >= self.since)
+        turns = query.order_by(ConversationTurn.turn_number.desc()).limit(self.window).all()
+        
+        self._messages = deque(
+            (self.to_message(turn.role, turn.user_input, turn.assistant_response) for turn in reversed(turns)),
+            maxlen=self.window
+        )
+        if turns:
+            self.last_turn_number = turns[0].turn_number
+    
+    def restore(self, last_turn_number: int, messages: List[Dict[str, str]]):
+        """Seed the buffer from a conversation snapshot instead of the database."""
+        self._messages = deque(messages, maxlen=self.window)
+        self.last_turn_number = last_turn_number
+    
+    def messages(self) -> List[Dict[str, str]]:
+        """Get the buffered turns, oldest first."""
+        self.load()
+        return list(self._messages)
+    
+    def append(self, turn_number: int, role: str, user_input: Optional[str], assistant_response: Optional[str]):
+        """Record a newly logged turn."""
+        self.load()
+        self._messages.append(self.to_message(role, user_input, assistant_response))
+        self.last_turn_number = turn_number
@@ -0,0 +1,82 @@
+"""Snapshots of live conversation state so any worker can pick up the next turn."""
+
+import json
+from typing import Dict, List, NamedTuple, Optional
+from app.core.config import settings
+from app.core.redis_client import get_redis
+from app.services.response_cache import InMemoryCacheBackend, RedisCacheBackend
+from app.workflows.conversation_fsm import ConversationFSM
+from app.workflows.conversation_history import ConversationHistory
+
+SNAPSHOT_VERSION = 1
+
+
+class ConversationSnapshot(NamedTuple):
+    """Everything a flow needs to continue a conversation without replaying it."""
+    fsm: ConversationFSM
+    turn_counter: int
+    last_turn_number: int
+    messages: List[Dict[str, str]]
+
+
+class ConversationStore:
+    """Saves and restores conversation snapshots as compact JSON in a key-value backend.
+    
+    Uses the same backends as the response cache: Redis when REDIS_URL is set so
+    every worker sees the same snapshot, otherwise an in-process LRU.
+    """
+    
+    KEY_PREFIX = "carearena:conversation"
+    
+    def __init__(self, backend, ttl_seconds: Optional[int] = None):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds or settings.CONVERSATION_SNAPSHOT_TTL_SECONDS
+    
+    def _key(self, session_id: int) -> str:
+        return f"{self.KEY_PREFIX}:{session_id}"
+    
+    @staticmethod
+    def dumps(fsm: ConversationFSM, turn_counter: int, history: ConversationHistory) -> str:
+        """Encode a flow's state as a snapshot string."""
+        return json.dumps({
+            "v": SNAPSHOT_VERSION,
+            "fsm": fsm.to_dict(),
+            "turn": turn_counter,
+            "last_turn": history.last_turn_number,
+            "messages": history.messages(),
+        }, separators=(",", ":"), default=str)
+    
+    @staticmethod
+    def loads(raw: str) -> Optional[ConversationSnapshot]:
+        """Decode a snapshot string; returns None for snapshots written by another format version."""
+        data = json.loads(raw)
+        if data.get("v") != SNAPSHOT_VERSION:
+            return None
+        return ConversationSnapshot(
+            fsm=ConversationFSM.from_dict(data["fsm"]),
+            turn_counter=data["turn"],
+            last_turn_number=data["last_turn"],
+            messages=data["messages"],
+        )
+    
+    def save(self, session_id: int, fsm: ConversationFSM, turn_counter: int, history: ConversationHistory):
+        """Store the latest snapshot for a session."""
+        self.backend.set(self._key(session_id), self.dumps(fsm, turn_counter, history), self.ttl_seconds)
+    
+    def load(self, session_id: int) -> Optional[ConversationSnapshot]:
+        """Get the latest snapshot for a session, or None if there isn't a usable one."""
+        raw = self.backend.get(self._key(session_id))
+        return self.loads(raw) if raw is not None else None
+
+
+_store: Optional[ConversationStore] = None
+
+
+def get_conversation_store() -> ConversationStore:
+    """Get the process-wide conversation store (Redis-backed when REDIS_URL is configured)."""
+    global _store
+    if _store is None:
+        client = get_redis()
+        backend = RedisCacheBackend(client) if client is not None else InMemoryCacheBackend(settings.CONVERSATION_STORE_MAX_ENTRIES)
+        _store = ConversationStore(backend)
+    return _store
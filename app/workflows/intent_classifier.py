@@ -0,0 +1,83 @@
+"""Keyword intent classifier shared by the conversation flows."""
+
+import re
+from enum import Enum
+from typing import Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+DEFAULT_LANGUAGE = "en"
+_TOKEN_RE = re.compile(r"[\w']+")
+
+
+class Intent(str, Enum):
+    """What a patient's message asks for."""
+    CONSENT_YES = "consent_yes"
+    OPT_OUT = "opt_out"
+    ACK = "ack"
+    CONTINUE = "continue"
+    SCHEDULE = "schedule"
+
+
+# Phrases matched as whole words anywhere in the message
+INTENT_PHRASES: Dict[str, Dict[Intent, Tuple[str, ...]]] = {
+    "en": {
+        Intent.CONSENT_YES: ("yes", "ok", "okay", "start", "sure", "yeah"),
+        Intent.OPT_OUT: ("stop", "unsubscribe", "cancel", "opt out", "quit"),
+        Intent.ACK: ("ok", "okay", "yes", "received", "thanks", "thank you"),
+        Intent.CONTINUE: ("continue", "next lesson", "go on"),
+        Intent.SCHEDULE: ("schedule", "remind", "reminder"),
+    },
+}
+
+# Replies that only count when they are the entire message (e.g. an SMS of just "END")
+INTENT_REPLIES: Dict[str, Dict[Intent, Tuple[str, ...]]] = {
+    "en": {
+        Intent.OPT_OUT: ("end",),
+    },
+}
+
+
+def tokenize(text: str) -> Tuple[str, ...]:
+    """Split a message into casefolded word tokens."""
+    return tuple(_TOKEN_RE.findall(text.casefold()))
+
+
+class _CompiledTable:
+    """Phrase table indexed by first token."""
+    
+    __slots__ = ("by_first_token", "replies")
+    
+    def __init__(self, phrases: Mapping[Intent, Tuple[str, ...]], replies: Mapping[Intent, Tuple[str, ...]]):
+        by_first_token: Dict[str, List[Tuple[Tuple[str, ...], Intent]]] = {}
+        for intent, intent_phrases in phrases.items():
+            for phrase in intent_phrases:
+                tokens = tokenize(phrase)
+                by_first_token.setdefault(tokens[0], []).append((tokens, intent))
+        self.by_first_token = by_first_token
+        self.replies: Dict[Tuple[str, ...], FrozenSet[Intent]] = {}
+        for intent, intent_replies in replies.items():
+            for reply in intent_replies:
+                tokens = tokenize(reply)
+                self.replies[tokens] = self.replies.get(tokens, frozenset()) | {intent}
+
+
+_TABLES: Dict[str, _CompiledTable] = {
+    language: _CompiledTable(INTENT_PHRASES.get(language, {}), INTENT_REPLIES.get(language, {}))
+    for language in set(INTENT_PHRASES) | set(INTENT_REPLIES)
+}
+
+
+def classify(text: str, language: Optional[str] = None) -> FrozenSet[Intent]:
+    """Get every intent expressed in a message.
+    
+    The message is tokenized once and matched against the language's table
+    (English when the language has none yet); "ok" matches "ok" but not "book".
+    """
+    table = _TABLES.get(language or DEFAULT_LANGUAGE) or _TABLES[DEFAULT_LANGUAGE]
+    tokens = tokenize(text)
+    intents = set(table.replies.get(tokens, ()))
+    
+    for index, token in enumerate(tokens):
+        for phrase, intent in table.by_first_token.get(token, ()):
+            if tokens[index:index + len(phrase)] == phrase:
+                intents.add(intent)
+    return frozenset(intents)
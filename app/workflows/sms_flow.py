@@ -3,10 +3,11 @@
 from typing import Dict, Any, Optional
 from sqlalchemy.orm import Session
 from app.db.models.conversation import ConversationSession, ConversationTurn
-from app.db.models.content import Lesson
 from app.services.ai_service import AIService
 from app.services.safety_service import SafetyService
 from app.services.escalation_service import EscalationService
+from app.services.content_service import ContentService
+from app.workflows.intent_classifier import Intent, classify
 
 
 class SMSFlow:
@@ -15,25 +16,20 @@ class SMSFlow:
     def __init__(self, session: ConversationSession, db: Session):
         self.session = session
         self.db = db
+        # Read once: every commit expires session and patient, so later reads would reload both
+        self.language = session.patient.language_preference
         self.ai_service = AIService(db)
-        self.safety_service = SafetyService(db)
-        self.escalation_service = EscalationService()
+        self.safety_service = SafetyService(db, language=self.language)
+        self.escalation_service = EscalationService(db)
         self.turn_counter = 0
     
     async def send_lesson_snippet(self, lesson_id: int) -> Dict[str, Any]:
         """Send approved lesson snippet via SMS."""
-        lesson = self.db.query(Lesson).filter(Lesson.id == lesson_id).first()
+        lesson, approved_version = ContentService.get_lesson_with_approved_version(self.db, lesson_id)
         
         if not lesson or not lesson.is_active:
             return {"error": "Lesson not found or inactive"}
         
-        # Get approved version
-        approved_version = None
-        for version in lesson.versions:
-            if version.status.value == "approved":
-                approved_version = version
-                break
-        
         content = approved_version.content if approved_version else lesson.content
         
         # Truncate to SMS-friendly length (160 chars)
@@ -53,16 +49,18 @@ class SMSFlow:
     
     async def process_incoming_message(self, message: str) -> Dict[str, Any]:
         """Process incoming SMS message."""
+        intents = classify(message, self.language)
+        
         # Check for opt-out keywords
-        if self._is_opt_out(message):
+        if Intent.OPT_OUT in intents:
             return self.handle_opt_out()
         
         # Check for acknowledgment keywords
-        if self._is_acknowledgment(message):
+        if Intent.ACK in intents:
             return {"response": "Thank you for confirming!"}
         
         # Safety check
-        safety_check = self.safety_service.check_input(message)
+        safety_check = self.safety_service.check_input(message, session=self.session)
         
         if safety_check["should_escalate"]:
             return await self.handle_emergency(message, safety_check)
@@ -77,16 +75,6 @@ class SMSFlow:
             "response": response
         }
     
-    def _is_opt_out(self, message: str) -> bool:
-        """Check for opt-out keywords."""
-        opt_out_keywords = ["stop", "unsubscribe", "cancel", "opt out", "quit", "end"]
-        return any(keyword in message.lower() for keyword in opt_out_keywords)
-    
-    def _is_acknowledgment(self, message: str) -> bool:
-        """Check for acknowledgment keywords."""
-        ack_keywords = ["ok", "okay", "yes", "received", "thanks", "thank you"]
-        return any(keyword in message.lower() for keyword in ack_keywords)
-    
     def handle_opt_out(self) -> Dict[str, Any]:
         """Handle opt-out request."""
         # TODO: Update consent record
@@ -159,5 +147,8 @@ class SMSFlow:
             metadata={"lesson_id": lesson_id} if lesson_id else None
         )
         self.db.add(turn)
+        # Any safety events from this turn are written in the same commit
+        self.safety_service.flush_events(commit=False)
+        self.safety_service.checkpoint(self.session)
         self.db.commit()
 
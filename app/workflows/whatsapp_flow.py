@@ -1,34 +1,68 @@
 """WhatsApp conversation flow."""
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, FrozenSet, List, Optional
 from sqlalchemy.orm import Session
 from app.db.models.conversation import ConversationSession, ConversationTurn
 from app.services.ai_service import AIService
 from app.services.safety_service import SafetyService
 from app.services.escalation_service import EscalationService
+from app.core.config import settings
 from app.workflows.conversation_fsm import ConversationFSM, ConversationState
+from app.workflows.conversation_history import ConversationHistory
+from app.workflows.intent_classifier import Intent, classify
+from app.workflows.conversation_store import ConversationStore, get_conversation_store
 
 
 class WhatsAppFlow:
     """Orchestrator for WhatsApp conversation with natural-language chatbot flow."""
     
-    def __init__(self, session: ConversationSession, db: Session):
+    def __init__(self, session: ConversationSession, db: Session,
+                 conversation_store: Optional[ConversationStore] = None):
         self.session = session
         self.db = db
-        self.fsm = ConversationFSM(ConversationState.SESSION_START)
+        # Read once: every commit expires session and patient, so later reads would reload both
+        self.language = session.patient.language_preference
+        self.fsm = ConversationFSM(ConversationState.SESSION_START, channel="whatsapp")
         self.ai_service = AIService(db)
-        self.safety_service = SafetyService(db)
-        self.escalation_service = EscalationService()
+        self.safety_service = SafetyService(db, language=self.language)
+        self.escalation_service = EscalationService(db)
         self.turn_counter = 0
+        self.history = ConversationHistory(
+            db, session.id, settings.CONVERSATION_HISTORY_WINDOW, since=session.started_at
+        )
+        self.conversation_store = conversation_store or get_conversation_store()
+        self.restore_snapshot()
+        # The session's lesson keys the LLM response cache (and is named in the prompt)
+        if session.lesson_id is not None:
+            self.fsm.context["lesson_id"] = session.lesson_id
+    
+    def restore_snapshot(self) -> bool:
+        """Resume this session from its latest snapshot; returns False if there was none."""
+        snapshot = self.conversation_store.load(self.session.id)
+        if snapshot is None:
+            # No snapshot (first turn, or it expired): at least keep the persisted state
+            if self.session.current_state:
+                self.fsm = ConversationFSM(ConversationState(self.session.current_state), channel=self.fsm.channel)
+            return False
+        self.fsm = snapshot.fsm
+        self.turn_counter = snapshot.turn_counter
+        self.history.restore(snapshot.last_turn_number, snapshot.messages)
+        return True
+    
+    def save_snapshot(self):
+        """Store this session's state so the next turn can run on any worker."""
+        self.conversation_store.save(self.session.id, self.fsm, self.turn_counter, self.history)
     
     async def process_message(self, message: str, media_url: Optional[str] = None) -> Dict[str, Any]:
         """Process incoming WhatsApp message."""
+        intents = classify(message, self.language)
+        
         # Check for opt-out keywords
-        if self._is_opt_out(message):
+        if Intent.OPT_OUT in intents:
             return self.handle_opt_out()
         
         # Safety check
-        safety_check = self.safety_service.check_input(message)
+        safety_check = self.safety_service.check_input(message, session=self.session)
         
         if safety_check["should_escalate"]:
             return await self.handle_emergency(message, safety_check)
@@ -39,11 +73,12 @@ class WhatsAppFlow:
             user_input=message,
             current_state=self.fsm.current_state,
             context=self.fsm.context,
-            history=history
+            history=history,
+            language=self.language
         )
         
         # Determine next state
-        next_state = self._determine_next_state(message, response)
+        next_state = self._determine_next_state(intents)
         if next_state:
             self.fsm.transition(next_state)
         
@@ -60,11 +95,6 @@ class WhatsAppFlow:
             "state": self.fsm.current_state.value
         }
     
-    def _is_opt_out(self, message: str) -> bool:
-        """Check for opt-out keywords."""
-        opt_out_keywords = ["stop", "unsubscribe", "cancel", "opt out", "quit"]
-        return any(keyword in message.lower() for keyword in opt_out_keywords)
-    
     def handle_opt_out(self) -> Dict[str, Any]:
         """Handle opt-out request."""
         # TODO: Update consent record
@@ -82,6 +112,7 @@ class WhatsAppFlow:
             reason=safety_check.get("reason"),
             details={"user_input": message}
         )
+        self.save_snapshot()
         
         return {
             "response": "I understand this is an emergency. Please contact emergency services immediately. For medical emergencies, call 193 (Ghana Emergency Services).",
@@ -89,26 +120,36 @@ class WhatsAppFlow:
             "state": self.fsm.current_state.value
         }
     
-    def _determine_next_state(self, user_input: str, response: str) -> Optional[ConversationState]:
-        """Determine next state based on user input."""
-        input_lower = user_input.lower()
+    def _determine_next_state(self, intents: FrozenSet[Intent]) -> Optional[ConversationState]:
+        """Determine next state based on the message's intents.
+        
+        Returns None (stay put) when the intent has no edge from the current
+        state, e.g. "Next lesson" after an emergency.
+        """
         state = self.fsm.current_state
+        next_state = None
         
         if state == ConversationState.SESSION_START:
-            return ConversationState.OPT_IN_PROMPT
+            next_state = ConversationState.OPT_IN_PROMPT
         elif state == ConversationState.OPT_IN_PROMPT:
-            if "yes" in input_lower or "ok" in input_lower or "start" in input_lower:
+            if Intent.CONSENT_YES in intents:
                 self.fsm.context["consent_granted"] = True
-                return ConversationState.GREETING
+                next_state = ConversationState.GREETING
             else:
-                return ConversationState.END_SESSION
+                next_state = ConversationState.END_SESSION
         elif state == ConversationState.GREETING:
-            return ConversationState.TOPIC_INTRO
-        elif "next lesson" in input_lower or "continue" in input_lower:
-            return ConversationState.DELIVER_LESSON_INTRO
-        elif "schedule" in input_lower or "remind" in input_lower:
-            return ConversationState.SCHEDULE_OFFER
+            next_state = ConversationState.TOPIC_INTRO
+        elif state == ConversationState.SCHEDULE_OFFER:
+            # Accepting the offer ("Yes, schedule it") confirms it
+            if Intent.SCHEDULE in intents or Intent.CONSENT_YES in intents:
+                next_state = ConversationState.CONFIRM_SCHEDULE
+        elif Intent.CONTINUE in intents:
+            next_state = ConversationState.DELIVER_LESSON_INTRO
+        elif Intent.SCHEDULE in intents:
+            next_state = ConversationState.SCHEDULE_OFFER
         
+        if next_state is not None and self.fsm.is_valid_transition(state, next_state):
+            return next_state
         return None
     
     def _generate_quick_replies(self) -> List[str]:
@@ -131,22 +172,13 @@ class WhatsAppFlow:
         return buttons
     
     def _get_conversation_history(self) -> list:
-        """Get conversation history."""
-        turns = self.db.query(ConversationTurn).filter(
-            ConversationTurn.session_id == self.session.id
-        ).order_by(ConversationTurn.turn_number).all()
-        
-        return [
-            {
-                "role": turn.role,
-                "content": turn.user_input or turn.assistant_response
-            }
-            for turn in turns
-        ]
+        """Get recent conversation history."""
+        return self.history.messages()
     
     def _log_turn(self, user_input: str, assistant_response: str):
         """Log conversation turn."""
-        self.turn_counter += 1
+        self.history.load()
+        self.turn_counter = max(self.turn_counter, self.history.last_turn_number) + 1
         turn = ConversationTurn(
             session_id=self.session.id,
             turn_number=self.turn_counter,
@@ -155,5 +187,10 @@ class WhatsAppFlow:
             assistant_response=assistant_response
         )
         self.db.add(turn)
+        # Any safety events from this turn are written in the same commit
+        self.safety_service.flush_events(commit=False)
+        self.safety_service.checkpoint(self.session)
         self.db.commit()
+        self.history.append(turn.turn_number, turn.role, user_input, assistant_response)
+        self.save_snapshot()
 
@@ -0,0 +1,53 @@
+"""Call retry backoff, streaming latency and due-window index
+
+Revision ID: 3f1a9c2d7b10
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+
+Brings a database created from the original models up to date with the
+model changes made since: retry backoff on scheduled calls, first-audio
+latency on turns, system-prompt TTS assets without a lesson, and the
+schedule preference due-window index.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1a9c2d7b10'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('scheduled_calls', sa.Column('next_attempt_at', sa.DateTime(), nullable=True))
+    # Calls that failed before backoff existed are retryable straight away
+    op.execute(
+        "UPDATE scheduled_calls SET next_attempt_at = updated_at "
+        "WHERE status = 'FAILED' AND next_attempt_at IS NULL"
+    )
+    
+    op.add_column('conversation_turns', sa.Column('first_audio_latency_ms', sa.Float(), nullable=True))
+    
+    with op.batch_alter_table('content_assets') as batch_op:
+        batch_op.alter_column('lesson_id', existing_type=sa.Integer(), nullable=True)
+    
+    op.create_index(
+        'ix_schedule_preferences_due',
+        'schedule_preferences',
+        ['is_active', 'preferred_time', 'timezone']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_schedule_preferences_due', table_name='schedule_preferences')
+    
+    op.execute("DELETE FROM content_assets WHERE lesson_id IS NULL")
+    with op.batch_alter_table('content_assets') as batch_op:
+        batch_op.alter_column('lesson_id', existing_type=sa.Integer(), nullable=False)
+    
+    op.drop_column('conversation_turns', 'first_audio_latency_ms')
+    op.drop_column('scheduled_calls', 'next_attempt_at')
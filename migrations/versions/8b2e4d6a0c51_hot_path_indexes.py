@@ -0,0 +1,69 @@
+"""Indexes for hot query paths
+
+Revision ID: 8b2e4d6a0c51
+Revises: 3f1a9c2d7b10
+Create Date: 2026-10-17 10:00:00.000000
+
+- conversation_turns (session_id, turn_number): history window loads
+- conversation_turns (created_at): retention cleanup
+- scheduled_calls (next_attempt_at) WHERE retryable failure: retry claim scan
+- conversation_sessions (patient_id): a patient's sessions
+
+On PostgreSQL the indexes are built CONCURRENTLY so the hot tables stay
+writable while the migration runs.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2e4d6a0c51'
+down_revision: Union[str, None] = '3f1a9c2d7b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RETRYABLE_FAILURE = sa.text("status = 'FAILED' AND retry_count < max_retries")
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_conversation_turns_session_turn',
+            'conversation_turns',
+            ['session_id', 'turn_number'],
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_conversation_turns_created_at',
+            'conversation_turns',
+            ['created_at'],
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_scheduled_calls_retry_due',
+            'scheduled_calls',
+            ['next_attempt_at'],
+            postgresql_where=RETRYABLE_FAILURE,
+            sqlite_where=RETRYABLE_FAILURE,
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_conversation_sessions_patient_id',
+            'conversation_sessions',
+            ['patient_id'],
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_conversation_sessions_patient_id', table_name='conversation_sessions',
+                      postgresql_concurrently=True)
+        op.drop_index('ix_scheduled_calls_retry_due', table_name='scheduled_calls',
+                      postgresql_concurrently=True)
+        op.drop_index('ix_conversation_turns_created_at', table_name='conversation_turns',
+                      postgresql_concurrently=True)
+        op.drop_index('ix_conversation_turns_session_turn', table_name='conversation_turns',
+                      postgresql_concurrently=True)
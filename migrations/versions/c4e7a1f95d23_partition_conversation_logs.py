@@ -0,0 +1,105 @@
+"""Monthly range partitions for conversation_turns and ai_response_logs
+
+Revision ID: c4e7a1f95d23
+Revises: 8b2e4d6a0c51
+Create Date: 2026-10-17 11:00:00.000000
+
+Both tables are rebuilt as PARTITION BY RANGE (created_at) parents with one
+partition per month, from the oldest row's month to PARTITION_MONTHS_AHEAD
+months ahead, plus a DEFAULT partition for backdated rows; SchedulerService
+keeps creating future partitions from then on.
+The primary keys become (id, created_at), as PostgreSQL requires the partition
+key in every unique constraint, which also means ai_response_logs.turn_id can
+no longer be a foreign key.
+
+Rows are copied while each table is locked against writes, so run this in a
+maintenance window; it needs a live connection (no --sql mode). Other
+databases are left as they are.
+"""
+from datetime import datetime
+from typing import Iterator, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+from app.db.partitioning import add_months, month_start, partition_name
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e7a1f95d23'
+down_revision: Union[str, None] = '8b2e4d6a0c51'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# ai_response_logs goes first on upgrade: dropping the old table drops its turn_id FK
+TABLES = ('ai_response_logs', 'conversation_turns')
+
+INDEXES = {
+    'ai_response_logs': [('ix_ai_response_logs_id', ['id'])],
+    'conversation_turns': [
+        ('ix_conversation_turns_id', ['id']),
+        ('ix_conversation_turns_session_turn', ['session_id', 'turn_number']),
+        ('ix_conversation_turns_created_at', ['created_at']),
+    ],
+}
+
+
+def _months(table: str) -> Iterator[datetime]:
+    first = op.get_bind().execute(sa.text(f"SELECT min(created_at) FROM {table}")).scalar()
+    current = month_start(datetime.utcnow())
+    month = min(month_start(first), current) if first else current
+    while month <= add_months(current, settings.PARTITION_MONTHS_AHEAD):
+        yield month
+        month = add_months(month, 1)
+
+
+def _rebuild(table: str, partitioned: bool) -> None:
+    """Swap table for a (non-)partitioned copy with the same columns, rows and id sequence."""
+    staging = f"{table}_rebuild"
+    
+    op.execute(f"LOCK TABLE {table} IN EXCLUSIVE MODE")
+    if partitioned:
+        op.execute(f"CREATE TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)")
+        op.execute(f"ALTER TABLE {staging} ADD CONSTRAINT {staging}_pkey PRIMARY KEY (id, created_at)")
+        for month in _months(table):
+            op.execute(
+                f"CREATE TABLE {partition_name(table, month)} PARTITION OF {staging} "
+                f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+            )
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {staging} DEFAULT")
+    else:
+        op.execute(f"CREATE TABLE {staging} (LIKE {table} INCLUDING DEFAULTS)")
+        op.execute(f"ALTER TABLE {staging} ADD CONSTRAINT {staging}_pkey PRIMARY KEY (id)")
+    
+    op.execute(f"INSERT INTO {staging} SELECT * FROM {table}")
+    # Keep the sequence when the old table (its owner) is dropped
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {staging}.id")
+    op.execute(f"DROP TABLE {table}")
+    op.execute(f"ALTER TABLE {staging} RENAME TO {table}")
+    op.execute(f"ALTER TABLE {table} RENAME CONSTRAINT {staging}_pkey TO {table}_pkey")
+    
+    op.create_foreign_key(f'{table}_session_id_fkey', table, 'conversation_sessions', ['session_id'], ['id'])
+    for name, columns in INDEXES[table]:
+        op.create_index(name, table, columns)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    
+    for table in TABLES:
+        _rebuild(table, partitioned=True)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    
+    for table in reversed(TABLES):
+        _rebuild(table, partitioned=False)
+    # Partitions retired since the upgrade may have taken referenced turns with them
+    op.execute(
+        "ALTER TABLE ai_response_logs ADD CONSTRAINT ai_response_logs_turn_id_fkey "
+        "FOREIGN KEY (turn_id) REFERENCES conversation_turns (id) NOT VALID"
+    )
@@ -0,0 +1,34 @@
+"""Indexes for keyset pagination
+
+Revision ID: e5b8d3c1a764
+Revises: c4e7a1f95d23
+Create Date: 2026-10-17 12:00:00.000000
+
+The list endpoints page by (created_at, id); each listed table gets a
+matching composite index so every page is an index range scan. Built
+CONCURRENTLY on PostgreSQL.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b8d3c1a764'
+down_revision: Union[str, None] = 'c4e7a1f95d23'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('patients', 'conversation_sessions', 'lessons', 'lesson_versions')
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in TABLES:
+            op.create_index(f'ix_{table}_created_at_id', table, ['created_at', 'id'], postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in reversed(TABLES):
+            op.drop_index(f'ix_{table}_created_at_id', table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,128 @@
+"""Tests for the batched AI response log writer."""
+
+import asyncio
+import pytest
+from datetime import datetime
+from app.services.ai_log_writer import AIResponseLogWriter
+
+
+class _RecordingSession:
+    """Session stand-in that records bulk inserts."""
+    
+    def __init__(self, written: list, fail: bool = False):
+        self.written = written
+        self.fail = fail
+    
+    def bulk_insert_mappings(self, model, rows):
+        if self.fail:
+            raise RuntimeError("database unavailable")
+        self.written.append(list(rows))
+    
+    def commit(self):
+        pass
+    
+    def rollback(self):
+        pass
+    
+    def close(self):
+        pass
+
+
+def test_writer_batches_and_drains_on_shutdown():
+    """Test rows are written in size-bounded batches and none are lost on shutdown."""
+    batches = []
+    writer = AIResponseLogWriter(
+        session_factory=lambda: _RecordingSession(batches),
+        max_queue_size=100,
+        batch_size=2,
+        flush_interval_seconds=0.05
+    )
+    writer.start()
+    
+    for i in range(5):
+        writer.submit({"model_name": "gpt-4o", "prompt": f"prompt {i}", "response": "ok"})
+    writer.shutdown()
+    
+    assert sum(len(batch) for batch in batches) == 5
+    assert all(len(batch) <= 2 for batch in batches)
+    metrics = writer.get_metrics()
+    assert metrics["written"] == 5
+    assert metrics["queue_depth"] == 0
+
+
+def test_failed_batches_are_dead_lettered_and_replayed(tmp_path, monkeypatch):
+    """Test a batch that fails every attempt is kept on disk and written by the next writer."""
+    monkeypatch.setattr("app.services.ai_log_writer.time.sleep", lambda seconds: None)
+    dead_letter_path = tmp_path / "dead_letter.jsonl"
+    row = {"model_name": "gpt-4o", "prompt": "p", "response": "ok", "created_at": datetime(2026, 10, 17, 9, 30)}
+    
+    failing = AIResponseLogWriter(
+        session_factory=lambda: _RecordingSession([], fail=True),
+        batch_size=10,
+        flush_interval_seconds=0.05,
+        dead_letter_path=str(dead_letter_path)
+    )
+    failing.start()
+    failing.submit(row)
+    failing.shutdown()
+    
+    assert failing.get_metrics()["dead_lettered"] == 1
+    assert dead_letter_path.exists()
+    
+    batches = []
+    writer = AIResponseLogWriter(
+        session_factory=lambda: _RecordingSession(batches),
+        batch_size=10,
+        flush_interval_seconds=0.05,
+        dead_letter_path=str(dead_letter_path)
+    )
+    writer.start()
+    writer.submit({**row, "prompt": "new"})
+    writer.shutdown()
+    
+    written = [r for batch in batches for r in batch]
+    assert {r["prompt"] for r in written} == {"p", "new"}
+    assert row in written
+    assert writer.get_metrics()["replayed"] == 1
+    assert not dead_letter_path.exists()
+
+
+def test_submit_after_shutdown_writes_synchronously(tmp_path):
+    """Test a writer kept by a live AIService still persists rows once it has been shut down."""
+    batches = []
+    writer = AIResponseLogWriter(
+        session_factory=lambda: _RecordingSession(batches),
+        dead_letter_path=str(tmp_path / "dead_letter.jsonl")
+    )
+    writer.start()
+    writer.shutdown()
+    
+    writer.submit({"model_name": "gpt-4o", "prompt": "late", "response": "ok"})
+    
+    assert batches == [[{"model_name": "gpt-4o", "prompt": "late", "response": "ok"}]]
+    assert writer.get_metrics()["sync_writes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_submit_async_does_not_block_event_loop_when_full(tmp_path):
+    """Test backpressure from a full queue waits off the event loop."""
+    batches = []
+    writer = AIResponseLogWriter(
+        session_factory=lambda: _RecordingSession(batches),
+        max_queue_size=1,
+        batch_size=10,
+        flush_interval_seconds=0.05,
+        dead_letter_path=str(tmp_path / "dead_letter.jsonl")
+    )
+    await writer.submit_async({"prompt": "first"})
+    
+    blocked = asyncio.create_task(writer.submit_async({"prompt": "second"}))
+    await asyncio.sleep(0.05)
+    assert not blocked.done()  # waiting for room, while this coroutine still runs
+    
+    writer.start()
+    await asyncio.wait_for(blocked, timeout=5)
+    writer.shutdown()
+    
+    assert [r["prompt"] for batch in batches for r in batch] == ["first", "second"]
+    assert writer.get_metrics()["blocked_submits"] == 1
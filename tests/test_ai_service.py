@@ -0,0 +1,52 @@
+"""Tests for AI service streaming helpers."""
+
+import pytest
+from app.services.ai_service import iter_sentences
+
+
+async def _tokens(text: str):
+    """Yield text word by word like an LLM token stream."""
+    for word in text.split(" "):
+        yield word + " "
+
+
+@pytest.mark.asyncio
+async def test_iter_sentences_yields_each_complete_sentence():
+    """Test sentences are emitted as soon as they end, with the remainder flushed last."""
+    sentences = [s async for s in iter_sentences(_tokens("Hello there. How are you feeling? Please listen"))]
+    assert sentences == ["Hello there.", "How are you feeling?", "Please listen"]
+
+
+class _RecordingLogWriter:
+    """Log writer stand-in that keeps submitted rows."""
+    
+    def __init__(self):
+        self.rows = []
+    
+    async def submit_async(self, row):
+        self.rows.append(row)
+
+
+@pytest.mark.asyncio
+async def test_cached_response_only_for_identical_prompt_and_audited():
+    """Test lesson responses are reused only for the same prompt, and cache hits are still logged."""
+    from app.services.ai_service import AIService
+    from app.services.response_cache import InMemoryCacheBackend, ResponseCache
+    from app.workflows.conversation_fsm import ConversationState
+    
+    log_writer = _RecordingLogWriter()
+    service = AIService(
+        db=None,
+        log_writer=log_writer,
+        response_cache=ResponseCache(InMemoryCacheBackend(max_entries=10), ttl_seconds=60),
+        tts_cache=object()
+    )
+    state = ConversationState.DELIVER_LESSON_INTRO
+    
+    first = await service.generate_response("yes", state, {"lesson_id": 1}, [], "en")
+    repeat = await service.generate_response("yes", state, {"lesson_id": 1}, [], "en")
+    other = await service.generate_response("I am Ama", state, {"lesson_id": 1}, [], "en")
+    
+    assert repeat == first
+    assert "Ama" in other
+    assert [row["model_name"] for row in log_writer.rows] == ["gpt-4o", "cache:gpt-4o", "gpt-4o"]
@@ -75,3 +75,29 @@ def test_get_conditions(db: Session):
     response = client.get("/api/v1/content/conditions")
     assert response.status_code == 200
     # TODO: Assert response data
+
+
+def test_lesson_with_approved_version_single_query(db: Session, test_condition):
+    """Test the SMS lesson lookup fetches the approved version without loading every version."""
+    from app.db.query_counter import QueryCounter
+    from app.services.content_service import ContentService
+    
+    lesson = Lesson(condition_id=test_condition.id, title="Test Lesson", content="Initial content")
+    db.add(lesson)
+    db.flush()
+    db.add_all([
+        LessonVersion(lesson_id=lesson.id, version_number="1.0", content="Old", status=LessonVersionStatus.ARCHIVED),
+        LessonVersion(lesson_id=lesson.id, version_number="2.0", content="Current", status=LessonVersionStatus.APPROVED),
+        LessonVersion(lesson_id=lesson.id, version_number="3.0", content="Next", status=LessonVersionStatus.DRAFT),
+    ])
+    db.commit()
+    # Read before expiring: an expired lesson.id would refresh inside the counted block
+    lesson_id = lesson.id
+    db.expire_all()
+    
+    with QueryCounter(db, max_statements=1):
+        found, approved = ContentService.get_lesson_with_approved_version(db, lesson_id)
+        assert found.title == "Test Lesson"
+        assert approved.content == "Current"
+    
+    assert ContentService.get_lesson_with_approved_version(db, -1) == (None, None)
@@ -0,0 +1,36 @@
+"""Tests for conversation snapshots."""
+
+from app.services.response_cache import InMemoryCacheBackend
+from app.workflows.conversation_fsm import ConversationFSM, ConversationState
+from app.workflows.conversation_history import ConversationHistory
+from app.workflows.conversation_store import ConversationStore
+
+
+def test_snapshot_round_trip():
+    """Test a restored snapshot carries state, context, turn counter and history window."""
+    store = ConversationStore(InMemoryCacheBackend(max_entries=10), ttl_seconds=60)
+    fsm = ConversationFSM(ConversationState.ENGAGEMENT_CHECK, channel="whatsapp")
+    fsm.context.update({"consent_granted": True, "lesson_id": 12})
+    history = ConversationHistory(db=None, session_id=1, window=3)
+    history.restore(4, [{"role": "user", "content": "yes"}, {"role": "user", "content": "continue"}])
+    
+    store.save(1, fsm, 4, history)
+    snapshot = store.load(1)
+    
+    assert snapshot.fsm.current_state == ConversationState.ENGAGEMENT_CHECK
+    assert snapshot.fsm.channel == "whatsapp"
+    assert snapshot.fsm.is_valid_transition(ConversationState.ENGAGEMENT_CHECK, ConversationState.DELIVER_LESSON_INTRO)
+    assert snapshot.fsm.context["lesson_id"] == 12
+    assert snapshot.turn_counter == 4
+    assert snapshot.last_turn_number == 4
+    assert snapshot.messages[-1] == {"role": "user", "content": "continue"}
+
+
+def test_missing_or_stale_snapshot_is_ignored():
+    """Test unknown sessions and snapshots from another format version load as None."""
+    backend = InMemoryCacheBackend(max_entries=10)
+    store = ConversationStore(backend, ttl_seconds=60)
+    backend.set(store._key(2), '{"v":0}', 60)
+    
+    assert store.load(1) is None
+    assert store.load(2) is None
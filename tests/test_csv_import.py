@@ -72,3 +72,140 @@ def test_csv_import_new_patients(db: Session, test_hospital):
     assert result["imported"] == 2
     assert result["errors"] == 0
 
+
+
+def test_csv_bulk_import_updates_sync_log(db: Session, test_hospital):
+    """Test bulk import deduplicates per chunk and records progress on the sync log."""
+    from app.db.models.enrollment import EnrollmentSyncLog
+    
+    existing_patient = Patient(
+        hospital_id=test_hospital.id,
+        first_name="Existing",
+        last_name="Patient",
+        phone_number="+233241234567"
+    )
+    sync_log = EnrollmentSyncLog(hospital_id=test_hospital.id, filename="bulk.csv", total_rows=0)
+    db.add_all([existing_patient, sync_log])
+    db.commit()
+    
+    csv_data = [
+        {"first_name": "Dup", "last_name": "Existing", "phone_number": "+233241234567"},
+        {"first_name": "New", "last_name": "One", "phone_number": "+233241234571"},
+        {"first_name": "New", "last_name": "Two", "phone_number": "+233241234572"},
+        {"first_name": "Bad", "last_name": "Phone", "phone_number": "123"},
+    ]
+    
+    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv') as f:
+        writer = csv.DictWriter(f, fieldnames=["first_name", "last_name", "phone_number"])
+        writer.writeheader()
+        writer.writerows(csv_data)
+        csv_path = f.name
+    
+    result = CSVImporterService.import_patients_bulk(db, test_hospital.id, csv_path, sync_log=sync_log, chunk_size=2)
+    
+    assert result["imported"] == 2
+    assert result["skipped"] == 1
+    assert result["errors"] == 1
+    db.refresh(sync_log)
+    assert sync_log.total_rows == 4
+    assert sync_log.imported_count == 2
+    assert sync_log.skipped_count == 1
+    assert sync_log.error_count == 1
+    # The error came in the second chunk, after error_details was first assigned
+    assert sync_log.error_details == [{"row": 5, "error": "Invalid phone number format"}]
+
+
+def test_csv_import_skips_duplicates_within_file(db: Session, test_hospital):
+    """Test phones repeated inside one file are skipped across batch boundaries."""
+    csv_data = [
+        {"first_name": "First", "last_name": "Copy", "phone_number": "+233241234580"},
+        {"first_name": "Other", "last_name": "Patient", "phone_number": "+233241234581"},
+        {"first_name": "Second", "last_name": "Copy", "phone_number": "233 24 123 4580"},
+    ]
+    
+    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv') as f:
+        writer = csv.DictWriter(f, fieldnames=["first_name", "last_name", "phone_number"])
+        writer.writeheader()
+        writer.writerows(csv_data)
+        csv_path = f.name
+    
+    result = CSVImporterService.import_patients_from_csv(db, test_hospital.id, csv_path, batch_size=2)
+    
+    assert result["imported"] == 2
+    assert result["skipped"] == 1
+    assert db.query(Patient).filter(Patient.phone_number == "+233241234580").count() == 1
+
+
+def test_hospital_sync_marks_missing_csv_failed(db: Session, test_hospital):
+    """Test a hospital without a CSV file gets a FAILED sync log and no worker."""
+    from app.db.models.enrollment import EnrollmentSyncLog, SyncStatus
+    from app.services.hospital_sync_service import HospitalSyncService
+    
+    sync_dir = tempfile.mkdtemp()
+    results = HospitalSyncService(max_workers=2, sync_dir=sync_dir).run_weekly_sync(db)
+    
+    assert [r["status"] for r in results] == [SyncStatus.FAILED.value]
+    sync_log = db.query(EnrollmentSyncLog).filter(
+        EnrollmentSyncLog.hospital_id == test_hospital.id
+    ).one()
+    assert sync_log.status == SyncStatus.FAILED
+    assert sync_log.completed_at is not None
+
+
+def test_csv_import_reports_row_errors_and_continues(db: Session, test_hospital, monkeypatch):
+    """Test a row that raises during normalization is reported and the rest of the file still imports."""
+    from app.services import csv_importer
+    original_normalize = csv_importer.normalize_phone_number
+    
+    def normalize(phone):
+        if phone == "boom":
+            raise ValueError("unparseable phone")
+        return original_normalize(phone)
+    
+    monkeypatch.setattr(csv_importer, "normalize_phone_number", normalize)
+    
+    csv_data = [
+        {"first_name": "Bad", "last_name": "Row", "phone_number": "boom"},
+        {"first_name": "Good", "last_name": "Row", "phone_number": "+233241234590"},
+    ]
+    
+    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv') as f:
+        writer = csv.DictWriter(f, fieldnames=["first_name", "last_name", "phone_number"])
+        writer.writeheader()
+        writer.writerows(csv_data)
+        csv_path = f.name
+    
+    result = CSVImporterService.import_patients_from_csv(db, test_hospital.id, csv_path)
+    
+    assert result["imported"] == 1
+    assert result["errors"] == 1
+    assert result["error_details"] == [{"row": 2, "error": "unparseable phone"}]
+
+
+def test_csv_import_large_file_with_cross_chunk_duplicates(db: Session, test_hospital):
+    """Test a many-chunk import skips phones repeated in later chunks and keeps leading-zero variants apart."""
+    csv_data = [
+        {"first_name": "Patient", "last_name": str(n), "phone_number": f"+2332{n:08d}"}
+        for n in range(5000)
+    ]
+    # Every 10th phone again, in later chunks, in another format
+    csv_data += [
+        {"first_name": "Repeat", "last_name": str(n), "phone_number": f"233 2{n:08d}"}
+        for n in range(0, 5000, 10)
+    ]
+    # Differs from +233200000001 only by a leading zero: a different number
+    csv_data.append({"first_name": "Zero", "last_name": "Prefix", "phone_number": "+02332000000001"})
+    
+    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv') as f:
+        writer = csv.DictWriter(f, fieldnames=["first_name", "last_name", "phone_number"])
+        writer.writeheader()
+        writer.writerows(csv_data)
+        csv_path = f.name
+    
+    result = CSVImporterService.import_patients_bulk(db, test_hospital.id, csv_path, chunk_size=400)
+    
+    assert result["imported"] == 5001
+    assert result["skipped"] == 500
+    assert result["errors"] == 0
+    assert db.query(Patient).filter(Patient.hospital_id == test_hospital.id).count() == 5001
+    assert db.query(Patient).filter(Patient.first_name == "Repeat").count() == 0
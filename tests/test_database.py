@@ -0,0 +1,29 @@
+"""Tests for database engine configuration."""
+
+from app.core.config import settings
+from app.db.database import get_async_database_url, get_connect_args, get_pool_options
+
+
+def test_async_database_url_uses_async_drivers():
+    """Test sync URLs are mapped onto their asyncio drivers, keeping credentials and options."""
+    assert get_async_database_url("postgresql://app:s3cret@db:5432/carearena") == \
+        "postgresql+asyncpg://app:s3cret@db:5432/carearena"
+    assert get_async_database_url("postgresql+psycopg2://app@db/carearena") == "postgresql+asyncpg://app@db/carearena"
+    assert get_async_database_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+    assert get_async_database_url("postgresql+asyncpg://app@db/carearena") == "postgresql+asyncpg://app@db/carearena"
+
+
+def test_sqlite_skips_pool_sizing():
+    """Test pool options are only passed to server databases."""
+    assert get_pool_options("sqlite:///./test.db") == {}
+    assert set(get_pool_options("postgresql://app@db/carearena")) == {"pool_size", "max_overflow", "pool_recycle", "pool_timeout"}
+
+
+def test_statement_timeout_connect_args(monkeypatch):
+    """Test the statement timeout is passed in each PostgreSQL driver's own format."""
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 5000)
+    
+    assert get_connect_args("postgresql://app@db/carearena") == {"options": "-c statement_timeout=5000"}
+    assert get_connect_args("postgresql+asyncpg://app@db/carearena") == \
+        {"server_settings": {"statement_timeout": "5000"}}
+    assert get_connect_args("sqlite:///./test.db") == {}
@@ -0,0 +1,92 @@
+"""Tests for the concurrent outbound dialer."""
+
+import asyncio
+import time
+import pytest
+from sqlalchemy.orm import Session
+from app.db.models.conversation import CallHistory
+from app.db.models.hospital import Hospital
+from app.db.models.patient import Patient
+from app.db.models.scheduling import ScheduledCall, CallStatus
+from app.core.config import settings
+from app.services.dialer_service import CarrierRateLimiter, FakeTelephonyClient, OutboundDialer, TelephonyClient
+
+
+@pytest.fixture
+def test_patients(db: Session):
+    """Create test patients."""
+    hospital = Hospital(name="Test Hospital", code="TEST001")
+    db.add(hospital)
+    db.commit()
+    
+    patients = [
+        Patient(
+            hospital_id=hospital.id,
+            first_name="Test",
+            last_name=f"Patient {i}",
+            phone_number=f"+2332412345{i:02d}"
+        )
+        for i in range(20)
+    ]
+    db.add_all(patients)
+    db.commit()
+    return patients
+
+
+@pytest.mark.asyncio
+async def test_dialer_bounds_concurrency(db: Session, test_patients):
+    """Test the dialer never exceeds its concurrency limit and records every call."""
+    client = FakeTelephonyClient(latency_seconds=0.01)
+    dialer = OutboundDialer(db, client=client, max_concurrency=5, carrier_rate_limits={}, batch_size=8)
+    
+    results = await dialer.dial([(patient, None) for patient in test_patients])
+    
+    assert len(results) == 20
+    assert all(result["status"] == "initiated" for result in results)
+    assert client.max_in_flight <= 5
+    assert db.query(CallHistory).filter(CallHistory.call_sid.isnot(None)).count() == 20
+
+
+@pytest.mark.asyncio
+async def test_dialer_marks_failed_calls_for_retry(db: Session, test_patients):
+    """Test a failed placement marks the scheduled call FAILED with a next attempt time."""
+    patient = test_patients[0]
+    scheduled_call = ScheduledCall(patient_id=patient.id, scheduled_time=patient.created_at,
+                                   status=CallStatus.SCHEDULED)
+    db.add(scheduled_call)
+    db.commit()
+    
+    client = FakeTelephonyClient(failing_numbers=[patient.phone_number])
+    results = await OutboundDialer(db, client=client, carrier_rate_limits={}).dial([(patient, scheduled_call)])
+    
+    assert results[0]["status"] == "failed"
+    db.refresh(scheduled_call)
+    assert scheduled_call.status == CallStatus.FAILED
+    assert scheduled_call.next_attempt_at is not None
+
+
+def test_carrier_rate_limiter_spaces_calls():
+    """Test calls to one carrier are spaced by its rate limit."""
+    limiter = CarrierRateLimiter({"mtn": 100.0})
+    
+    async def acquire_five():
+        for _ in range(5):
+            await limiter.acquire("mtn")
+    
+    start = time.monotonic()
+    asyncio.run(acquire_five())
+    assert time.monotonic() - start >= 0.035
+
+
+def test_empty_carrier_rate_limits_disable_limiting(db: Session):
+    """Test an explicit empty mapping turns rate limiting off instead of falling back to the defaults."""
+    client = FakeTelephonyClient()
+    
+    assert OutboundDialer(db, client=client, carrier_rate_limits={}).rate_limiter.rates == {}
+    assert OutboundDialer(db, client=client).rate_limiter.rates == settings.DIALER_CARRIER_RATE_LIMITS
+
+
+def test_telephony_client_is_abstract():
+    """Test a client that does not implement place_call cannot be created."""
+    with pytest.raises(TypeError):
+        TelephonyClient()
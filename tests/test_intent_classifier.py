@@ -0,0 +1,28 @@
+"""Tests for the intent classifier."""
+
+from app.workflows.intent_classifier import Intent, classify
+
+
+def test_whole_word_matching():
+    """Test keywords inside longer words are not matched."""
+    assert classify("I took the book home") == frozenset()
+    assert classify("Stopwatch") == frozenset()
+    assert classify("OK, thank you!") == {Intent.CONSENT_YES, Intent.ACK}
+
+
+def test_multi_word_phrases():
+    """Test phrases spanning several tokens match only in order."""
+    assert Intent.CONTINUE in classify("Send the next lesson please")
+    assert Intent.CONTINUE not in classify("lesson next")
+    assert Intent.OPT_OUT in classify("I want to opt out")
+
+
+def test_whole_message_replies():
+    """Test "end" opts out as a reply on its own but not inside a sentence."""
+    assert Intent.OPT_OUT in classify("END")
+    assert Intent.OPT_OUT not in classify("I will come at the end of the week")
+
+
+def test_unknown_language_falls_back_to_english():
+    """Test languages without their own table use the English phrases."""
+    assert classify("remind me tomorrow", language="tw") == {Intent.SCHEDULE}
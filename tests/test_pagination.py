@@ -0,0 +1,35 @@
+"""Tests for keyset pagination cursors."""
+
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from app.db.pagination import InvalidCursorError, build_page, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    """Test a cursor decodes back to the (created_at, id) it was built from."""
+    created_at = datetime(2026, 10, 17, 9, 30, 15, 123456)
+    cursor = encode_cursor(created_at, 42)
+    
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", "WyJub3QgYSBkYXRlIiwxXQ", "W10"])
+def test_invalid_cursor_rejected(cursor):
+    """Test malformed or tampered cursors raise InvalidCursorError."""
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+def test_build_page_uses_look_ahead_row():
+    """Test the extra fetched row only signals a next page and is not returned."""
+    rows = [SimpleNamespace(id=n, created_at=datetime(2026, 10, 1, 0, 0, n)) for n in range(1, 4)]
+    
+    page = build_page(rows, limit=2)
+    assert [row.id for row in page.items] == [1, 2]
+    assert decode_cursor(page.next_cursor) == (rows[1].created_at, 2)
+    
+    last_page = build_page(rows[2:], limit=2, total=3)
+    assert last_page.next_cursor is None
+    assert last_page.total == 3
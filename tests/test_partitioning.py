@@ -0,0 +1,78 @@
+"""Tests for monthly partition management."""
+
+import pytest
+from datetime import datetime
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateTable
+from app.db.models.conversation import ConversationTurn
+from app.db.models.safety import AIResponseLog
+from app.db.partitioning import (
+    add_months,
+    create_partition_sql,
+    ensure_partitions,
+    list_partitions,
+    month_start,
+    partition_month,
+    partition_name,
+    retire_partitions,
+)
+
+
+def test_month_arithmetic():
+    """Test month starts and month shifts across year boundaries."""
+    assert month_start(datetime(2026, 10, 17, 13, 45)) == datetime(2026, 10, 1)
+    assert add_months(datetime(2026, 11, 1), 2) == datetime(2027, 1, 1)
+    assert add_months(datetime(2026, 1, 1), -1) == datetime(2025, 12, 1)
+
+
+def test_partition_names_round_trip():
+    """Test partition names encode their month and other tables' names are ignored."""
+    name = partition_name("conversation_turns", datetime(2026, 3, 1))
+    
+    assert name == "conversation_turns_p2026_03"
+    assert partition_month("conversation_turns", name) == datetime(2026, 3, 1)
+    assert partition_month("ai_response_logs", name) is None
+    assert partition_month("conversation_turns", "conversation_turns_default") is None
+
+
+def test_create_partition_sql_bounds():
+    """Test a partition covers exactly one month."""
+    sql = create_partition_sql("ai_response_logs", datetime(2026, 12, 1))
+    
+    assert "ai_response_logs_p2026_12 PARTITION OF ai_response_logs" in sql
+    assert "FROM ('2026-12-01') TO ('2027-01-01')" in sql
+
+
+@pytest.mark.parametrize("model", [ConversationTurn, AIResponseLog])
+def test_partitioned_primary_key_is_postgresql_only(model):
+    """Test PostgreSQL gets the (id, created_at) key while SQLite keeps an autoincrementing id."""
+    postgresql_ddl = str(CreateTable(model.__table__).compile(dialect=postgresql.dialect()))
+    sqlite_ddl = str(CreateTable(model.__table__).compile(dialect=sqlite.dialect()))
+    
+    assert "PRIMARY KEY (id, created_at)" in postgresql_ddl
+    assert "PARTITION BY RANGE (created_at)" in postgresql_ddl
+    assert "PRIMARY KEY (id)" in sqlite_ddl
+    assert "PARTITION" not in sqlite_ddl
+
+
+def test_ensure_and_retire_partitions(db: Session):
+    """Test future partitions are created and expired ones detached or dropped."""
+    connection = db.connection()
+    if connection.dialect.name != "postgresql":
+        pytest.skip("partitioning is PostgreSQL only")
+    
+    now = datetime.utcnow()
+    old_month = add_months(month_start(now), -30)
+    connection.execute(text(create_partition_sql("ai_response_logs", old_month)))
+    
+    names = ensure_partitions(connection, "ai_response_logs", now=now, months_ahead=2)
+    assert names == [partition_name("ai_response_logs", add_months(month_start(now), n)) for n in range(3)]
+    assert set(names) <= set(list_partitions(connection, "ai_response_logs"))
+    
+    retired = retire_partitions(connection, "ai_response_logs", add_months(month_start(now), -12), detach_only=True)
+    assert retired == [partition_name("ai_response_logs", old_month)]
+    assert retired[0] not in list_partitions(connection, "ai_response_logs")
+    assert "ai_response_logs_default" in list_partitions(connection, "ai_response_logs")
+    db.rollback()
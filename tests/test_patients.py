@@ -60,6 +60,34 @@ def test_list_patients(db: Session, test_hospital):
     # TODO: Assert response data
 
 
+def test_list_patients_keyset_pages(db: Session, test_hospital):
+    """Test walking every page with cursors returns each patient exactly once."""
+    from app.services.patient_service import PatientService
+    
+    db.add_all([
+        Patient(hospital_id=test_hospital.id, first_name="Page", last_name=str(n), phone_number=f"+23324100{n:04d}")
+        for n in range(5)
+    ])
+    db.commit()
+    
+    seen = []
+    cursor = None
+    while True:
+        page = PatientService.get_patients(db, cursor=cursor, limit=2)
+        seen.extend(patient.id for patient in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    
+    assert len(seen) == len(set(seen)) == db.query(Patient).count()
+
+
+def test_list_patients_invalid_cursor(db: Session, test_hospital):
+    """Test an invalid cursor is a client error."""
+    response = client.get("/api/v1/patients/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
 def test_update_patient(db: Session, test_hospital):
     """Test updating a patient."""
     # TODO: Implement test
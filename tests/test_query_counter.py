@@ -0,0 +1,47 @@
+"""Tests for the query counter used to catch N+1 regressions."""
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from app.db.query_counter import QueryCounter, TooManyQueriesError
+
+
+@pytest.fixture
+def engine():
+    """In-memory engine independent of the application database."""
+    engine = create_engine("sqlite://")
+    yield engine
+    engine.dispose()
+
+
+def test_counts_statements_for_session_and_engine(engine):
+    """Test statements are counted whether given a session or an engine."""
+    with Session(engine) as session:
+        with QueryCounter(session) as counter:
+            session.execute(text("SELECT 1"))
+            session.execute(text("SELECT 2"))
+        assert counter.count == 2
+        assert counter.statements == ["SELECT 1", "SELECT 2"]
+    
+    with QueryCounter(engine) as counter:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    assert counter.count == 1
+
+
+def test_budget_exceeded_raises(engine):
+    """Test exceeding max_statements fails with the offending statements listed."""
+    with pytest.raises(TooManyQueriesError, match="3 statements executed, budget is 2"):
+        with QueryCounter(engine, max_statements=2):
+            with engine.connect() as connection:
+                for n in range(3):
+                    connection.execute(text(f"SELECT {n}"))
+
+
+def test_listener_removed_after_block(engine):
+    """Test statements after the block are no longer counted."""
+    with QueryCounter(engine) as counter:
+        pass
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    assert counter.count == 0
@@ -0,0 +1,108 @@
+"""Query-plan regression tests for hot query paths (PostgreSQL only)."""
+
+import pytest
+from datetime import datetime, time, timedelta
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.db.partitioning import add_months, create_partition_sql, month_start, partition_name
+from app.db.models.conversation import ConversationSession, ConversationTurn, SessionStatus
+from app.db.models.hospital import Hospital
+from app.db.models.patient import Patient
+from app.db.models.schedule_preference import SchedulePreference
+from app.db.models.scheduling import CallStatus, ScheduledCall
+
+# Each hot path, as the services issue it, and the index it must use (partition
+# indexes on conversation_turns are named <partition>_<columns>_idx)
+HOT_PATHS = {
+    "history_window": (
+        "SELECT * FROM conversation_turns WHERE session_id = :session_id "
+        "AND created_at >= :since ORDER BY turn_number DESC LIMIT 3",
+        "session_id_turn_number_idx",
+    ),
+    "retry_claim": (
+        "SELECT id FROM scheduled_calls WHERE status = 'FAILED' AND retry_count < max_retries "
+        "AND next_attempt_at <= :now ORDER BY next_attempt_at LIMIT 500",
+        "ix_scheduled_calls_retry_due",
+    ),
+    "due_preferences": (
+        "SELECT * FROM schedule_preferences WHERE is_active = true "
+        "AND preferred_time >= :start AND preferred_time < :end",
+        "ix_schedule_preferences_due",
+    ),
+    "retention_cleanup": (
+        "SELECT id FROM conversation_turns WHERE created_at < :now",
+        "created_at_idx",
+    ),
+    "patient_sessions": (
+        "SELECT * FROM conversation_sessions WHERE patient_id = :patient_id",
+        "ix_conversation_sessions_patient_id",
+    ),
+}
+
+
+@pytest.fixture
+def seeded_db(db: Session):
+    """Seed one patient with a session, turns, a failed call and a schedule preference."""
+    if db.bind.dialect.name != "postgresql":
+        pytest.skip("query plans are only checked on PostgreSQL")
+    
+    hospital = Hospital(name="Plan Hospital", code="PLAN001")
+    db.add(hospital)
+    db.flush()
+    patient = Patient(hospital_id=hospital.id, first_name="Plan", last_name="Patient", phone_number="+233240000001")
+    db.add(patient)
+    db.flush()
+    
+    now = datetime.utcnow()
+    session = ConversationSession(patient_id=patient.id, channel="ivr", status=SessionStatus.ACTIVE, started_at=now)
+    db.add(session)
+    db.flush()
+    db.add_all([
+        ConversationTurn(session_id=session.id, turn_number=n, role="user", user_input=f"turn {n}")
+        for n in range(1, 11)
+    ])
+    db.add(ScheduledCall(
+        patient_id=patient.id, scheduled_time=now, status=CallStatus.FAILED,
+        retry_count=0, max_retries=3, next_attempt_at=now - timedelta(minutes=5)
+    ))
+    db.add(SchedulePreference(patient_id=patient.id, preferred_time=time(9, 0), is_active=True))
+    db.flush()
+    db.execute(text("ANALYZE"))
+    
+    yield db, {"session_id": session.id, "patient_id": patient.id, "since": now}
+    db.rollback()
+
+
+@pytest.mark.parametrize("path", sorted(HOT_PATHS))
+def test_hot_path_uses_index(seeded_db, path):
+    """Test each hot path is served by its index rather than a sequential scan."""
+    db, ids = seeded_db
+    sql, index_name = HOT_PATHS[path]
+    params = {
+        **ids,
+        "now": datetime.utcnow(),
+        "start": time(9, 0),
+        "end": time(9, 1),
+    }
+    
+    # Small seeded tables would otherwise always be cheaper to scan
+    db.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = "\n".join(row[0] for row in db.execute(text(f"EXPLAIN {sql}"), params))
+    
+    assert "Seq Scan" not in plan, plan
+    assert index_name in plan, plan
+
+
+def test_recent_window_prunes_older_partitions(seeded_db):
+    """Test a session-start bounded history load skips the partitions of earlier months."""
+    db, ids = seeded_db
+    now = datetime.utcnow()
+    previous = add_months(month_start(now), -1)
+    db.execute(text(create_partition_sql("conversation_turns", previous)))
+    
+    plan = "\n".join(row[0] for row in db.execute(text(
+        f"EXPLAIN {HOT_PATHS['history_window'][0]}"
+    ), {**ids, "since": now - timedelta(minutes=5)}))
+    
+    assert partition_name("conversation_turns", month_start(now)) in plan, plan
+    assert partition_name("conversation_turns", previous) not in plan, plan
@@ -0,0 +1,59 @@
+"""Tests for the lesson-delivery LLM response cache."""
+
+from app.services.response_cache import InMemoryCacheBackend, ResponseCache
+from app.workflows.conversation_fsm import ConversationState
+
+PROMPT = "Deliver a brief introduction to the lesson.\nCurrent lesson ID: 1\n\nUser input: yes"
+
+
+def test_cache_key_only_for_lesson_delivery_states():
+    """Test only lesson-delivery prompts with a lesson are cacheable."""
+    cache = ResponseCache(InMemoryCacheBackend(max_entries=10), ttl_seconds=60)
+    
+    assert cache.make_key(ConversationState.GREETING, {"lesson_id": 1}, "en", PROMPT) is None
+    assert cache.make_key(ConversationState.DELIVER_LESSON_INTRO, {"lesson_id": None}, "en", PROMPT) is None
+    
+    key = cache.make_key(ConversationState.DELIVER_LESSON_INTRO, {"lesson_id": 1}, "en", PROMPT)
+    assert key == cache.make_key(
+        ConversationState.DELIVER_LESSON_INTRO, {"lesson_id": 1, "consent_granted": True}, "EN", PROMPT
+    )
+    assert key != cache.make_key(ConversationState.DELIVER_LESSON_INTRO, {"lesson_id": 1}, "tw", PROMPT)
+
+
+def test_cache_key_differs_per_prompt():
+    """Test a response is never shared between prompts with different patient input or history."""
+    cache = ResponseCache(InMemoryCacheBackend(max_entries=10), ttl_seconds=60)
+    other_prompt = PROMPT.replace("User input: yes", "User input: my name is Ama, yes")
+    
+    key = cache.make_key(ConversationState.DELIVER_LESSON_INTRO, {"lesson_id": 1}, "en", PROMPT)
+    other_key = cache.make_key(ConversationState.DELIVER_LESSON_INTRO, {"lesson_id": 1}, "en", other_prompt)
+    assert key != other_key
+
+
+def test_invalidate_lesson_orphans_cached_responses():
+    """Test approving a new version (invalidation) changes the lesson's keys."""
+    cache = ResponseCache(InMemoryCacheBackend(max_entries=10), ttl_seconds=60)
+    key = cache.make_key(ConversationState.TOPIC_INTRO, {"lesson_id": 7}, "en", PROMPT)
+    cache.set(key, "Today we will talk about preeclampsia.")
+    assert cache.get(key) == "Today we will talk about preeclampsia."
+    
+    cache.invalidate_lesson(7)
+    
+    new_key = cache.make_key(ConversationState.TOPIC_INTRO, {"lesson_id": 7}, "en", PROMPT)
+    assert new_key != key
+    assert cache.get(new_key) is None
+
+
+def test_in_memory_backend_evicts_least_recently_used_and_expired():
+    """Test LRU eviction and TTL expiry."""
+    backend = InMemoryCacheBackend(max_entries=2)
+    backend.set("a", "1", ttl_seconds=60)
+    backend.set("b", "2", ttl_seconds=60)
+    backend.get("a")
+    backend.set("c", "3", ttl_seconds=60)
+    
+    assert backend.get("b") is None
+    assert backend.get("a") == "1"
+    
+    backend.set("d", "4", ttl_seconds=0)
+    assert backend.get("d") is None
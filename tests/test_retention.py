@@ -0,0 +1,126 @@
+"""Tests for retention cleanup."""
+
+import tempfile
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.db.models.conversation import ConversationSession, ConversationTurn, SessionStatus
+from app.db.models.hospital import Hospital
+from app.db.models.patient import Patient
+from app.db.partitioning import add_months, create_partition_sql, list_partitions, month_start, partition_name
+from app.services.retention_service import RetentionService
+from app.services.storage import LocalFileStorage
+
+
+@pytest.fixture
+def test_patient(db: Session):
+    """Create test patient."""
+    hospital = Hospital(name="Test Hospital", code="TEST001")
+    db.add(hospital)
+    db.commit()
+    
+    patient = Patient(
+        hospital_id=hospital.id,
+        first_name="Test",
+        last_name="Patient",
+        phone_number="+233241234567"
+    )
+    db.add(patient)
+    db.commit()
+    db.refresh(patient)
+    return patient
+
+
+def test_delete_many_counts_existing_keys():
+    """Test bulk delete removes every file and ignores missing keys."""
+    storage = LocalFileStorage(tempfile.mkdtemp())
+    for n in range(5):
+        storage.save(f"audio/{n}.mp3", b"x")
+    
+    assert storage.delete_many([f"audio/{n}.mp3" for n in range(6)], max_workers=2) == 5
+    assert not storage.exists("audio/0.mp3")
+
+
+def test_purge_audio_in_chunks(db: Session, test_patient):
+    """Test expired turn audio is deleted chunk by chunk while recent and shared audio is kept."""
+    storage = LocalFileStorage(tempfile.mkdtemp())
+    session = ConversationSession(patient_id=test_patient.id, channel="ivr", status=SessionStatus.COMPLETED,
+                                  started_at=datetime.utcnow())
+    db.add(session)
+    db.flush()
+    
+    now = datetime.utcnow()
+    old = now - timedelta(days=45)
+    turns = []
+    for n in range(5):
+        key = storage.save(f"audio/{n}.mp3", b"x")
+        turns.append(ConversationTurn(session_id=session.id, turn_number=n + 1, role="user",
+                                      audio_url=key, tts_audio_url="tts/ab/shared.mp3",
+                                      asr_transcript="hello", created_at=old if n < 4 else now))
+    storage.save("tts/ab/shared.mp3", b"x")
+    db.add_all(turns)
+    db.commit()
+    
+    service = RetentionService(db, storage=storage, audio_retention_days=30,
+                               transcript_retention_days=30, chunk_size=3)
+    result = service.run(now=now)
+    
+    assert result == {
+        "turn_partitions": 0, "ai_log_partitions": 0,
+        "audio_turns": 4, "files_deleted": 4, "transcript_turns": 4
+    }
+    assert storage.exists("audio/4.mp3")
+    assert storage.exists("tts/ab/shared.mp3")
+    
+    # A second run finds nothing left to clear
+    assert service.run(now=now) == {
+        "turn_partitions": 0, "ai_log_partitions": 0,
+        "audio_turns": 0, "files_deleted": 0, "transcript_turns": 0
+    }
+
+
+def test_run_passes_partition_cutoffs(db: Session, monkeypatch):
+    """Test run() retires each table's partitions at its own retention cutoff."""
+    calls = []
+    
+    def fake_retire(connection, table, cutoff, detach_only=False):
+        calls.append((table, cutoff, detach_only))
+        return [partition_name(table, add_months(cutoff, -1))]
+    
+    monkeypatch.setattr("app.services.retention_service.retire_partitions", fake_retire)
+    now = datetime(2026, 10, 17, 12, 0)
+    service = RetentionService(db, storage=LocalFileStorage(tempfile.mkdtemp()),
+                               turn_retention_months=24, ai_log_retention_months=12, detach_only=True)
+    
+    result = service.run(now=now)
+    
+    assert result["turn_partitions"] == 1
+    assert result["ai_log_partitions"] == 1
+    assert calls == [
+        ("conversation_turns", datetime(2024, 10, 1), True),
+        ("ai_response_logs", datetime(2025, 10, 1), True),
+    ]
+
+
+def test_run_drops_expired_partitions(db: Session):
+    """Test run() drops monthly partitions past retention and keeps current ones (PostgreSQL)."""
+    if db.connection().dialect.name != "postgresql":
+        pytest.skip("partitioning is PostgreSQL only")
+    
+    now = datetime.utcnow()
+    expired_month = add_months(month_start(now), -30)
+    for table in ("conversation_turns", "ai_response_logs"):
+        db.execute(text(create_partition_sql(table, expired_month)))
+    db.commit()
+    
+    service = RetentionService(db, storage=LocalFileStorage(tempfile.mkdtemp()),
+                               turn_retention_months=24, ai_log_retention_months=12, detach_only=False)
+    result = service.run(now=now)
+    
+    assert result["turn_partitions"] == 1
+    assert result["ai_log_partitions"] == 1
+    for table in ("conversation_turns", "ai_response_logs"):
+        partitions = list_partitions(db.connection(), table)
+        assert partition_name(table, expired_month) not in partitions
+        assert partition_name(table, month_start(now)) in partitions
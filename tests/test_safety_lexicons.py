@@ -0,0 +1,84 @@
+"""Tests for the safety lexicon store."""
+
+import json
+import os
+import pytest
+from app.services.safety_lexicon_store import SHIPPED_LEXICON_PATH, LexiconStore, load_lexicons
+
+
+def _write_lexicons(path, version, emergency, tw_emergency=()):
+    path.write_text(json.dumps({
+        "version": version,
+        "languages": {
+            "en": {"emergency": list(emergency), "symptoms": ["pain"]},
+            "tw": {"extends": "en", "emergency": list(tw_emergency)},
+        },
+    }))
+    # Make sure the mtime moves even on filesystems with coarse timestamps
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + version))
+
+
+def test_shipped_lexicons_cover_supported_languages():
+    """Test the bundled lexicon file loads and every language inherits the English terms."""
+    lexicons = load_lexicons(SHIPPED_LEXICON_PATH)
+    
+    assert set(lexicons["languages"]) == {"en", "tw", "ga", "ewe"}
+    for categories in lexicons["languages"].values():
+        assert "chest pain" in categories["emergency"]
+
+
+def test_shipped_lexicon_path_does_not_depend_on_working_directory(tmp_path, monkeypatch):
+    """Test the bundled lexicons are found when the process runs from another directory."""
+    monkeypatch.chdir(tmp_path)
+    
+    store = LexiconStore(SHIPPED_LEXICON_PATH)
+    
+    assert store.get_matcher("en").scan("I have chest pain")
+
+
+def test_language_selection_and_fallback(tmp_path):
+    """Test each language gets its own matcher and unknown languages fall back to English."""
+    path = tmp_path / "lexicons.json"
+    _write_lexicons(path, 1, ["emergency"], tw_emergency=["ayaresabea"])
+    store = LexiconStore(str(path), reload_seconds=0)
+    
+    assert store.get_matcher("tw").categories("ayaresabea") == {"emergency"}
+    assert store.get_matcher("tw").categories("emergency pain") == {"emergency", "symptoms"}
+    assert store.get_matcher("en").categories("ayaresabea") == set()
+    assert store.get_matcher("fr").categories("emergency") == {"emergency"}
+
+
+def test_reload_swaps_in_new_version(tmp_path):
+    """Test an edited file is picked up without recreating the store."""
+    path = tmp_path / "lexicons.json"
+    _write_lexicons(path, 1, ["emergency"])
+    store = LexiconStore(str(path), reload_seconds=0)
+    
+    _write_lexicons(path, 2, ["emergency", "stroke"])
+    
+    assert store.get_matcher("en").categories("stroke") == {"emergency"}
+    assert store.snapshot().version == 2
+
+
+def test_broken_reload_keeps_previous_snapshot(tmp_path):
+    """Test a malformed update is ignored and the last good version stays in use."""
+    path = tmp_path / "lexicons.json"
+    _write_lexicons(path, 1, ["emergency"])
+    store = LexiconStore(str(path), reload_seconds=0)
+    
+    path.write_text("{not json")
+    os.utime(path, (0, 10_000))
+    
+    assert store.reload_if_changed() is False
+    assert store.snapshot().version == 1
+    assert store.get_matcher("en").categories("emergency") == {"emergency"}
+
+
+def test_broken_file_at_startup_raises(tmp_path):
+    """Test the store refuses to start without a valid lexicon file."""
+    path = tmp_path / "lexicons.json"
+    path.write_text(json.dumps({"version": 1, "languages": {"tw": {}}}))
+    
+    with pytest.raises(ValueError):
+        LexiconStore(str(path))
@@ -0,0 +1,55 @@
+"""Tests for the compiled safety keyword matcher."""
+
+from app.services.safety_matcher import SafetyMatch, SafetyMatcher
+
+
+def test_scan_finds_every_category_in_one_pass():
+    """Test overlapping terms from different categories are all reported."""
+    matcher = SafetyMatcher({
+        "symptoms": ["pain", "chest pain"],
+        "emergency": ["chest pain", "can't breathe"],
+    })
+    
+    matches = matcher.scan("I have Chest Pain and can't breathe")
+    
+    assert SafetyMatch("symptoms", "chest pain", 7, 17) in matches
+    assert SafetyMatch("emergency", "chest pain", 7, 17) in matches
+    assert SafetyMatch("symptoms", "pain", 13, 17) in matches
+    assert SafetyMatch("emergency", "can't breathe", 22, 35) in matches
+
+
+def test_scan_respects_word_boundaries():
+    """Test a keyword inside a longer word is not a match."""
+    matcher = SafetyMatcher({"symptoms": ["pain", "ache"]})
+    
+    assert matcher.scan("I am painting the house, no headaches") == []
+    assert matcher.categories("the pain, again") == {"symptoms"}
+
+
+def test_scan_with_empty_lexicon():
+    """Test a matcher with no terms never matches."""
+    assert SafetyMatcher({"symptoms": []}).scan("pain") == []
+
+
+def test_scan_matches_inflected_forms():
+    """Test plural and other inflected forms of a keyword still match."""
+    matcher = SafetyMatcher({
+        "emergency": ["chest pain", "stroke"],
+        "symptoms": ["headache", "fever", "bleed"],
+    })
+    
+    assert matcher.scan("my chest pains") == [SafetyMatch("emergency", "chest pain", 3, 14)]
+    assert matcher.categories("I have bad headaches and fevers") == {"symptoms"}
+    assert matcher.categories("she had strokes") == {"emergency"}
+    assert matcher.categories("it is bleeding") == {"symptoms"}
+    assert matcher.scan("the painter bleeds-ish, feverish") == [SafetyMatch("symptoms", "bleed", 12, 18)]
+
+
+def test_scan_offsets_index_original_text():
+    """Test offsets stay correct when casefolding changes the text's length."""
+    matcher = SafetyMatcher({"symptoms": ["pain"]})
+    text = "Straße pain"
+    
+    [match] = matcher.scan(text)
+    assert (match.start, match.end) == (7, 11)
+    assert text[match.start:match.end] == "pain"
@@ -0,0 +1,94 @@
+"""Tests for safety service event batching and escalation tracking."""
+
+from types import SimpleNamespace
+from app.services.escalation_tracker import EscalationTracker
+from app.services.safety_lexicon_store import SHIPPED_LEXICON_PATH, LexiconStore
+from app.services.safety_service import SafetyService
+
+
+class _CountingSession:
+    """Session stand-in that counts added rows and commits."""
+    
+    def __init__(self):
+        self.added = []
+        self.commits = 0
+    
+    def add_all(self, rows):
+        self.added.extend(rows)
+    
+    def commit(self):
+        self.commits += 1
+
+
+def _service(db):
+    return SafetyService(db, lexicon_store=LexiconStore(SHIPPED_LEXICON_PATH))
+
+
+def test_validate_llm_response_writes_events_in_one_commit():
+    """Test a response with several violations commits its audit rows once."""
+    db = _CountingSession()
+    service = _service(db)
+    session = SimpleNamespace(id=7, metadata=None)
+    
+    result = service.validate_llm_response("You have malaria, you should take medication", session)
+    
+    assert not result["is_valid"]
+    assert len(db.added) == 2
+    assert db.commits == 1
+
+
+def test_one_response_counts_as_one_violation():
+    """Test breaking several rules in one response does not escalate until a second unsafe response."""
+    service = _service(_CountingSession())
+    session = SimpleNamespace(id=7, metadata=None)
+    
+    result = service.validate_llm_response("You have malaria, you should take medication", session)
+    
+    assert [violation["type"] for violation in result["violations"]] == ["diagnosis", "medical_advice"]
+    assert service.get_tracker(session).violation_count == 1
+    assert not service.should_escalate(session)
+    
+    service.validate_llm_response("This is a diagnosis", session)
+    assert service.get_tracker(session).violation_count == 2
+    assert service.should_escalate(session)
+
+
+def test_buffered_events_join_caller_transaction():
+    """Test flush=False leaves events for the caller to flush without committing."""
+    db = _CountingSession()
+    service = _service(db)
+    
+    service.validate_llm_response("This is a diagnosis", SimpleNamespace(id=7, metadata=None), flush=False)
+    assert db.added == []
+    
+    assert service.flush_events(commit=False) == 1
+    assert db.commits == 0
+
+
+def test_escalation_tracker_only_considers_recent_inputs():
+    """Test a symptom mention stops triggering escalation once it leaves the recent window."""
+    service = _service(_CountingSession())
+    session = SimpleNamespace(id=7, metadata=None)
+    
+    service.check_input("I have a headache", session=session)
+    assert service.should_escalate(session)
+    
+    for _ in range(EscalationTracker.RECENT_WINDOW):
+        service.check_input("Yes, please continue", session=session)
+    assert not service.should_escalate(session)
+
+
+def test_escalation_tracker_survives_checkpoint():
+    """Test a checkpointed tracker is restored by a fresh service, e.g. after a restart."""
+    session = SimpleNamespace(id=7, metadata={"lesson": "anc-1"})
+    service = _service(_CountingSession())
+    service.validate_llm_response("You must rest", session)
+    service.check_input("ok", session=session)
+    service.checkpoint(session)
+    
+    restored = _service(_CountingSession()).get_tracker(session)
+    
+    assert session.metadata["lesson"] == "anc-1"
+    assert restored.violation_count == 1
+    assert list(restored.recent_checks) == [False]
+    assert restored.turns_seen == 1
@@ -74,3 +74,30 @@ def test_get_patient_schedule_preference(db: Session, test_patient):
     assert found_preference is not None
     assert found_preference.channel_preference == "sms"
 
+
+
+def test_due_preferences_respect_timezone(db: Session, test_patient):
+    """Test due-window lookup converts the current minute per preference timezone."""
+    from datetime import datetime
+    import pytz
+    from app.services.scheduler_service import SchedulerService
+    
+    preference = SchedulePreference(
+        patient_id=test_patient.id,
+        preferred_time=time(10, 0),
+        channel_preference="sms",
+        timezone="Africa/Lagos"  # UTC+1, no DST
+    )
+    db.add(preference)
+    db.commit()
+    
+    due_now = SchedulerService._get_due_preferences(db, datetime(2024, 3, 4, 9, 0, tzinfo=pytz.utc))
+    assert [p.id for p in due_now] == [preference.id]
+    
+    # One minute later the preference is no longer in the window
+    due_later = SchedulerService._get_due_preferences(db, datetime(2024, 3, 4, 9, 1, tzinfo=pytz.utc))
+    assert due_later == []
+    
+    preference.is_active = False
+    db.commit()
+    assert SchedulerService._get_due_preferences(db, datetime(2024, 3, 4, 9, 0, tzinfo=pytz.utc)) == []
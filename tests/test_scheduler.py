@@ -2,6 +2,7 @@
 
 import pytest
 from datetime import datetime, timedelta
+from app.db.query_counter import QueryCounter
 from app.services.scheduler_service import SchedulerService
 
 
@@ -22,3 +23,93 @@ def test_update_schedule():
     # TODO: Implement test
     pass
 
+
+
+def test_claim_retry_batch_respects_backoff(db):
+    """Test only failed calls past their next attempt time are claimed."""
+    from app.db.models.hospital import Hospital
+    from app.db.models.patient import Patient
+    from app.db.models.scheduling import ScheduledCall, CallStatus
+    
+    hospital = Hospital(name="Test Hospital", code="TEST001")
+    db.add(hospital)
+    db.commit()
+    patient = Patient(
+        hospital_id=hospital.id,
+        first_name="Test",
+        last_name="Patient",
+        phone_number="+233241234567"
+    )
+    db.add(patient)
+    db.commit()
+    
+    now = datetime.utcnow()
+    due = ScheduledCall(patient_id=patient.id, scheduled_time=now, status=CallStatus.FAILED,
+                        retry_count=1, next_attempt_at=now - timedelta(minutes=5))
+    backing_off = ScheduledCall(patient_id=patient.id, scheduled_time=now, status=CallStatus.FAILED,
+                                retry_count=1, next_attempt_at=now + timedelta(hours=1))
+    exhausted = ScheduledCall(patient_id=patient.id, scheduled_time=now, status=CallStatus.FAILED,
+                              retry_count=3, max_retries=3, next_attempt_at=now - timedelta(hours=1))
+    db.add_all([due, backing_off, exhausted])
+    db.commit()
+    
+    claimed = SchedulerService._claim_retry_batch(db, batch_size=10)
+    
+    assert [call.id for call in claimed] == [due.id]
+    # Patients come with the claimed calls: the dialer must not lazy-load one per call
+    with QueryCounter(db, max_statements=0):
+        assert [call.patient.phone_number for call in claimed] == ["+233241234567"]
+    db.refresh(due)
+    assert due.status == CallStatus.SCHEDULED
+    assert due.retry_count == 2
+    assert due.next_attempt_at is None
+
+
+def test_send_daily_content_catches_up_skipped_tick(db, monkeypatch):
+    """Test a preference whose minute had no tick (skipped or coalesced) is still sent on the next run."""
+    from datetime import time
+    import pytz
+    from app.db.models.hospital import Hospital
+    from app.db.models.patient import Patient
+    from app.db.models.schedule_preference import SchedulePreference
+    
+    hospital = Hospital(name="Test Hospital", code="TEST001")
+    db.add(hospital)
+    db.commit()
+    patient = Patient(hospital_id=hospital.id, first_name="Test", last_name="Patient", phone_number="+233241234567")
+    db.add(patient)
+    db.commit()
+    db.add(SchedulePreference(
+        patient_id=patient.id,
+        preferred_time=time(10, 1),
+        channel_preference="sms",
+        timezone="Africa/Lagos"  # 09:01 UTC
+    ))
+    db.commit()
+    
+    class _KeepOpen:
+        """The test session, left open when the job closes its session."""
+        
+        def __getattr__(self, name):
+            return getattr(db, name)
+        
+        def close(self):
+            pass
+    
+    sent = []
+    monkeypatch.setattr("app.services.scheduler_service.SessionLocal", _KeepOpen)
+    service = SchedulerService.__new__(SchedulerService)
+    service.content_watermark = None
+    monkeypatch.setattr(service, "_send_sms_content", lambda db, patient_id: sent.append(patient_id))
+    
+    service.send_daily_content(now=datetime(2024, 3, 4, 9, 0, tzinfo=pytz.utc))
+    assert sent == []
+    
+    # The 09:01 tick never ran; the 09:02 run sends 09:01's patients
+    service.send_daily_content(now=datetime(2024, 3, 4, 9, 2, 30, tzinfo=pytz.utc))
+    assert sent == [patient.id]
+    assert service.content_watermark == datetime(2024, 3, 4, 9, 2, tzinfo=pytz.utc)
+    
+    # Re-running an already processed minute sends nothing twice
+    service.send_daily_content(now=datetime(2024, 3, 4, 9, 2, tzinfo=pytz.utc))
+    assert sent == [patient.id]
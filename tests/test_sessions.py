@@ -3,7 +3,7 @@
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import datetime, timedelta
 from app.main import app
 from app.db.models.conversation import ConversationSession, ConversationTurn, SessionStatus
 from app.db.models.patient import Patient
@@ -98,3 +98,51 @@ def test_get_session_turns(db: Session, test_patient):
     response = client.get(f"/api/v1/sessions/{session.id}")
     assert response.status_code == 200
     # TODO: Assert turns are included in response
+
+
+def test_conversation_history_window(db: Session, test_patient):
+    """Test the history buffer seeds the latest turns once and stays bounded."""
+    from app.workflows.conversation_history import ConversationHistory
+    
+    session = ConversationSession(
+        patient_id=test_patient.id,
+        channel="ivr",
+        status=SessionStatus.ACTIVE,
+        started_at=datetime.utcnow()
+    )
+    db.add(session)
+    db.commit()
+    
+    for i in range(5):
+        db.add(ConversationTurn(session_id=session.id, turn_number=i + 1, role="user", user_input=f"Input {i + 1}"))
+    db.commit()
+    
+    history = ConversationHistory(db, session.id, window=3)
+    assert [m["content"] for m in history.messages()] == ["Input 3", "Input 4", "Input 5"]
+    assert history.last_turn_number == 5
+    
+    history.append(6, "user", "Input 6", "Response 6")
+    assert [m["content"] for m in history.messages()] == ["Input 4", "Input 5", "Input 6"]
+
+
+def test_conversation_history_since_session_start(db: Session, test_patient):
+    """Test the history load only reads turns created since the given session start."""
+    from app.workflows.conversation_history import ConversationHistory
+    
+    started_at = datetime.utcnow()
+    session = ConversationSession(
+        patient_id=test_patient.id,
+        channel="ivr",
+        status=SessionStatus.ACTIVE,
+        started_at=started_at
+    )
+    db.add(session)
+    db.commit()
+    
+    db.add(ConversationTurn(session_id=session.id, turn_number=1, role="user", user_input="Stale",
+                            created_at=started_at - timedelta(seconds=1)))
+    db.add(ConversationTurn(session_id=session.id, turn_number=2, role="user", user_input="Fresh"))
+    db.commit()
+    
+    history = ConversationHistory(db, session.id, window=3, since=started_at)
+    assert [m["content"] for m in history.messages()] == ["Fresh"]
@@ -1,7 +1,9 @@
 """Tests for state machine transitions."""
 
 import pytest
-from app.workflows.conversation_fsm import ConversationFSM, ConversationState
+from app.workflows.conversation_fsm import (
+    IVR_TRANSITIONS, WHATSAPP_TRANSITIONS, ConversationFSM, ConversationState
+)
 
 
 def test_valid_state_transitions():
@@ -56,3 +58,25 @@ def test_emergency_fallback():
     assert fsm.is_valid_transition(ConversationState.EMERGENCY_FALLBACK, ConversationState.END_SESSION)
     assert not fsm.is_valid_transition(ConversationState.EMERGENCY_FALLBACK, ConversationState.GREETING)
 
+
+
+def test_whatsapp_channel_graph():
+    """Test WhatsApp allows jumping to the next lesson where IVR does not."""
+    whatsapp = ConversationFSM(ConversationState.ENGAGEMENT_CHECK, channel="whatsapp")
+    ivr = ConversationFSM(ConversationState.ENGAGEMENT_CHECK, channel="ivr")
+    
+    assert whatsapp.is_valid_transition(ConversationState.ENGAGEMENT_CHECK, ConversationState.DELIVER_LESSON_INTRO)
+    assert not ivr.is_valid_transition(ConversationState.ENGAGEMENT_CHECK, ConversationState.DELIVER_LESSON_INTRO)
+    
+    # Channel extras never bypass the emergency fallback's terminal edge
+    assert WHATSAPP_TRANSITIONS[ConversationState.EMERGENCY_FALLBACK] == frozenset({ConversationState.END_SESSION})
+
+
+def test_transition_graphs_are_read_only():
+    """Test the shared transition graphs and FSM instances can't grow new attributes."""
+    with pytest.raises(TypeError):
+        IVR_TRANSITIONS[ConversationState.END_SESSION] = frozenset({ConversationState.GREETING})
+    
+    fsm = ConversationFSM()
+    with pytest.raises(AttributeError):
+        fsm.extra = True
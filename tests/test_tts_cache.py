@@ -0,0 +1,74 @@
+"""Tests for the TTS audio cache."""
+
+import tempfile
+import pytest
+from sqlalchemy.orm import Session
+from app.db.models.content import ContentAsset
+from app.services.storage import LocalFileStorage
+from app.services.tts_cache import TTSAssetCache
+
+
+class _Renderer:
+    """Counts renders and returns fixed-size audio."""
+    
+    def __init__(self, size: int = 10):
+        self.size = size
+        self.calls = 0
+    
+    async def __call__(self, text: str, language: str) -> bytes:
+        self.calls += 1
+        return b"x" * self.size
+
+
+@pytest.mark.asyncio
+async def test_cached_audio_is_rendered_once(db: Session):
+    """Test identical text, voice, model and language reuse one stored file."""
+    cache = TTSAssetCache(db, storage=LocalFileStorage(tempfile.mkdtemp()), max_bytes=1000)
+    render = _Renderer()
+    
+    first = await cache.get_or_render("Please stay on the line.", "en", "alloy", "tts-1", render)
+    second = await cache.get_or_render("Please  stay on the line.", "en", "alloy", "tts-1", render)
+    other_language = await cache.get_or_render("Please stay on the line.", "tw", "alloy", "tts-1", render)
+    
+    assert first == second
+    assert other_language != first
+    assert render.calls == 2
+    assert db.query(ContentAsset).filter(ContentAsset.file_url == first).count() == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_evicts_when_over_budget(db: Session):
+    """Test the least recently used files are evicted once the byte budget is exceeded."""
+    storage = LocalFileStorage(tempfile.mkdtemp())
+    cache = TTSAssetCache(db, storage=storage, max_bytes=25)
+    render = _Renderer(size=10)
+    
+    keys = [await cache.get_or_render(f"Lesson {i}", "en", "alloy", "tts-1", render) for i in range(3)]
+    
+    remaining = {key for key, _, _ in storage.iter_files(TTSAssetCache.PREFIX)}
+    assert len(remaining) == 2
+    assert keys[-1] in remaining
+    assert db.query(ContentAsset).count() == 2
+
+
+@pytest.mark.asyncio
+async def test_prewarm_renders_only_fixed_prompts_as_synthesized(db: Session):
+    """Test prewarming covers the exact fixed-prompt text and language the call flow speaks."""
+    from types import SimpleNamespace
+    from app.workflows.call_flow import fixed_prompt, fixed_prompt_renderings
+    
+    cache = TTSAssetCache(db, storage=LocalFileStorage(tempfile.mkdtemp()), max_bytes=1000)
+    render = _Renderer()
+    ai_service = SimpleNamespace(tts_voice="alloy", tts_model="tts-1", render_speech=render)
+    
+    # Untranslated prompts are spoken in English, so every language shares one rendering
+    renderings = fixed_prompt_renderings(["en", "tw", "ga", "ewe"])
+    assert renderings == {fixed_prompt("emergency", "en")}
+    assert fixed_prompt("emergency", "tw") == fixed_prompt("emergency", "en")
+    
+    assert await cache.prewarm(ai_service, renderings) == 1
+    assert await cache.prewarm(ai_service, renderings) == 0
+    
+    text, language = fixed_prompt("emergency", "ga")
+    await cache.get_or_render(text, language, "alloy", "tts-1", render)
+    assert render.calls == 1
@@ -0,0 +1,41 @@
+"""Tests for WhatsApp flow state transitions."""
+
+from app.workflows.conversation_fsm import ConversationFSM, ConversationState
+from app.workflows.intent_classifier import classify
+from app.workflows.whatsapp_flow import WhatsAppFlow
+
+
+def _flow(state: ConversationState) -> WhatsAppFlow:
+    """Flow with only the FSM set up: enough for state and reply decisions."""
+    flow = WhatsAppFlow.__new__(WhatsAppFlow)
+    flow.fsm = ConversationFSM(state, channel="whatsapp")
+    flow.language = "en"
+    return flow
+
+
+def _offered_replies() -> set:
+    """Every quick reply and button title the flow offers in any state."""
+    replies = set()
+    for state in ConversationState:
+        flow = _flow(state)
+        replies.update(flow._generate_quick_replies())
+        replies.update(button["title"] for button in flow._generate_buttons())
+    return replies
+
+
+def test_every_quick_reply_from_every_state_is_a_valid_transition():
+    """Test no offered reply, sent from any state, asks the FSM for an edge it does not have."""
+    for state in ConversationState:
+        for reply in _offered_replies():
+            flow = _flow(state)
+            next_state = flow._determine_next_state(classify(reply, "en"))
+            if next_state is not None:
+                flow.fsm.transition(next_state)  # Raises ValueError on a missing edge
+
+
+def test_accepting_schedule_offer_confirms_it():
+    """Test the offer's own "Yes, schedule it" reply moves on to confirming the schedule."""
+    flow = _flow(ConversationState.SCHEDULE_OFFER)
+    
+    assert flow._determine_next_state(classify("Yes, schedule it", "en")) == ConversationState.CONFIRM_SCHEDULE
+    assert flow._determine_next_state(classify("Maybe later", "en")) is None